@@ -10,65 +10,83 @@ from strictyaml import (
     Enum,
     Any,
 )
-from yaml_linting import file_path
+from yaml_linting import add_paths_arguments, expand_paths, fast_any, fast_compose, fast_mapping, fast_scalar, fast_sequence, lint_files
 
 
 CONANDATA_YAML_URL = "https://github.com/conan-io/conan-center-index/blob/master/docs/adding_packages/conandata_yml_format.md"
 
+PATCH_TYPES = ["official", "conan", "portability", "bugfix", "vulnerability"]
+
+# Schemas are built once per process and reused for every file validated by it
+patch_fields = MapCombined(
+    {
+        "patch_file": Str(),
+        Optional("patch_description"): Str(),
+        Optional("patch_type"): Enum(PATCH_TYPES),
+        Optional("patch_source"): Str(),
+        # No longer required for v2 recipes with layouts
+        Optional("base_path"): Str(),
+    },
+    Str(),
+    Any()
+)
+schema = MapCombined(
+    {
+        "sources": MapPattern(Str(), Any(), minimum_keys=1),
+        Optional("patches"): MapPattern(Str(), Seq(Any()), minimum_keys=1),
+    },
+    Str(),
+    Any(),
+)
+
 
 def main():
     parser = argparse.ArgumentParser(
         description="Validate Conan's 'conandata.yaml' file to ConanCenterIndex's requirements."
     )
-    parser.add_argument(
-        "path",
-        nargs="?",
-        type=file_path,
-        help="file to validate.",
-    )
+    add_paths_arguments(parser)
     args = parser.parse_args()
 
-    patch_fields = MapCombined(
-        {
-            "patch_file": Str(),
-            Optional("patch_description"): Str(),
-            Optional("patch_type"): Enum(
-                ["official", "conan", "portability", "bugfix", "vulnerability"]
-            ),
-            Optional("patch_source"): Str(),
-            # No longer required for v2 recipes with layouts
-            Optional("base_path"): Str(),
-        },
-        Str(),
-        Any()
-    )
-    schema = MapCombined(
-        {
-            "sources": MapPattern(Str(), Any(), minimum_keys=1),
-            Optional("patches"): MapPattern(Str(), Seq(Any()), minimum_keys=1),
-        },
-        Str(),
-        Any(),
-    )
+    try:
+        paths = expand_paths(args.paths)
+    except argparse.ArgumentTypeError as error:
+        parser.error(str(error))
+
+    lint_files(lint_file, paths, jobs=args.jobs, cache_dir=args.cache_dir)
 
-    with open(args.path, encoding="utf-8") as f:
+
+def lint_file(path):
+    """Validate a single 'conandata.yml' and return the list of annotations to report"""
+    with open(path, encoding="utf-8") as f:
         content = f.read()
+    _, annotations = validate(path, content)
+    return annotations
+
+
+def validate(path, content):
+    """Validate the content of a 'conandata.yml'. Returns the set of versions listed in 'sources'
+    (None if it is not valid) and the list of annotations to report"""
+    sources = _fast_validate(content)
+    if sources is not None:
+        return sources, []
+
+    annotations = []
 
     try:
         parsed = dirty_load(content, schema, allow_flow_style=True)
     except YAMLValidationError as error:
-        pretty_print_yaml_validate_error(args, error) # Error when "source" is missing or when "patches" has no versions
-        return
+        annotations.append(pretty_print_yaml_validate_error(path, error)) # Error when "source" is missing or when "patches" has no versions
+        return None, annotations
     except BaseException as error:
-        pretty_print_yaml_validate_error(args, error) # YAML could not be parsed
-        return
+        annotations.append(pretty_print_yaml_validate_error(path, error)) # YAML could not be parsed
+        return None, annotations
 
     if "patches" in parsed:
         for version in parsed["patches"]:
             patches = parsed["patches"][version]
             if version not in parsed["sources"]:
-                print(
-                    f"::warning file={args.path},line={patches.start_line},endline={patches.end_line},"
+                annotations.append(
+                    f"::warning file={path},line={patches.start_line},endline={patches.end_line},"
                     f"title=conandata.yml inconsistency"
                     f"::Patch(es) are listed for version `{version}`, but there is source for this version."
                     f" You should either remove `{version}` from the `patches` section, or add it to the"
@@ -79,23 +97,58 @@ def main():
                 try:
                     parsed["patches"][version][i].revalidate(patch_fields)
                 except YAMLValidationError as error:
-                    pretty_print_yaml_validate_warning(args, error) # Warning when patch fields are not followed
+                    annotations.append(pretty_print_yaml_validate_warning(path, error)) # Warning when patch fields are not followed
                     continue
+    return {str(version) for version in parsed["sources"]}, annotations
 
 
+def _fast_validate(content):
+    """Quick check of 'content' with libyaml. Returns the set of versions listed in 'sources' when
+    the file surely follows the schema and has no inconsistency (strictyaml would not report anything),
+    None when it has to be validated by strictyaml to know it"""
+    root = fast_compose(content)
+    document = fast_mapping(root, allow_flow_style=True) if root is not None else None
+    if not document or "sources" not in document:
+        return None
+    if not all(fast_any(value, allow_flow_style=True) for value in document.values()):
+        return None
 
-def pretty_print_yaml_validate_error(args, error):
+    sources = fast_mapping(document["sources"], allow_flow_style=True)
+    if not sources:
+        return None
+
+    if "patches" in document:
+        patches = fast_mapping(document["patches"], allow_flow_style=True)
+        if not patches:
+            return None
+        for version, version_patches in patches.items():
+            version_patches = fast_sequence(version_patches, allow_flow_style=True)
+            if version not in sources or not version_patches:
+                return None
+            for patch in version_patches:
+                fields = fast_mapping(patch, allow_flow_style=True)
+                if not fields or "patch_file" not in fields:
+                    return None
+                for field in ("patch_file", "patch_description", "patch_type", "patch_source", "base_path"):
+                    if field in fields and not fast_scalar(fields[field]):
+                        return None
+                if "patch_type" in fields and fields["patch_type"].value not in PATCH_TYPES:
+                    return None
+    return set(sources)
+
+
+def pretty_print_yaml_validate_error(path, error):
     snippet = error.context_mark.get_snippet().replace("\n", "%0A")
-    print(
-        f"::error file={args.path},line={error.context_mark.line},endline={error.problem_mark.line+1},"
+    return (
+        f"::error file={path},line={error.context_mark.line},endline={error.problem_mark.line+1},"
         f"title=conandata.yml schema error"
         f"::Schema outlined in {CONANDATA_YAML_URL}#patches-fields is not followed.%0A%0A{error.problem} in %0A{snippet}%0A"
     )
-    
-def pretty_print_yaml_validate_warning(args, error):
+
+def pretty_print_yaml_validate_warning(path, error):
     snippet = error.context_mark.get_snippet().replace("\n", "%0A")
-    print(
-        f"::warning file={args.path},line={error.context_mark.line},endline={error.problem_mark.line+1},"
+    return (
+        f"::warning file={path},line={error.context_mark.line},endline={error.problem_mark.line+1},"
         f"title=conandata.yml schema warning"
         f"::Schema outlined in {CONANDATA_YAML_URL}#patches-fields is not followed.%0A%0A{error.problem} in %0A{snippet}%0A"
     )
@@ -1,36 +1,84 @@
 import argparse
-from strictyaml import load, Map, Str, YAMLValidationError, MapPattern
-from yaml_linting import file_path
+from strictyaml import load, Map, Str, StrictYAMLError, YAMLValidationError, MapPattern
+from strictyaml.ruamel.error import YAMLError
+from yaml_linting import add_paths_arguments, expand_paths, fast_compose, fast_mapping, fast_scalar, lint_files
+
+
+schema = Map(
+    {"versions": MapPattern(Str(), Map({"folder": Str()}), minimum_keys=1)}
+)
 
 
 def main():
     parser = argparse.ArgumentParser(
         description="Validate ConanCenterIndex's 'config.yaml' file."
     )
-    parser.add_argument(
-        "path",
-        nargs="?",
-        type=file_path,
-        help="file to validate.",
-    )
+    add_paths_arguments(parser)
     args = parser.parse_args()
 
-    schema = Map(
-        {"versions": MapPattern(Str(), Map({"folder": Str()}), minimum_keys=1)}
-    )
+    try:
+        paths = expand_paths(args.paths)
+    except argparse.ArgumentTypeError as error:
+        parser.error(str(error))
+
+    lint_files(lint_file, paths, jobs=args.jobs, cache_dir=args.cache_dir)
 
-    with open(args.path) as f:
+
+def lint_file(path):
+    """Validate a single 'config.yml' and return the list of annotations to report"""
+    with open(path) as f:
         content = f.read()
+    _, annotations = validate(path, content)
+    return annotations
+
+
+def validate(path, content):
+    """Validate the content of a 'config.yml'. Returns the versions it lists, as a dict
+    {version: (folder, line)} (None if it is not valid), and the list of annotations to report"""
+    versions = _fast_validate(content)
+    if versions is not None:
+        return versions, []
 
     try:
-        load(content, schema)
-    except YAMLValidationError as error:
+        parsed = load(content, schema)
+    except (YAMLValidationError, StrictYAMLError, YAMLError) as error:
+        # Schema errors, and the YAML strictyaml cannot parse (eg. flow style): reported for this
+        # file only, the other files of the batch are still linted
         e = error.__str__().replace("\n", "%0A")
-        print(
-            f"::error file={args.path},line={error.context_mark.line},endline={error.problem_mark.line},"
+        context_mark = getattr(error, "context_mark", None) or getattr(error, "problem_mark", None)
+        problem_mark = getattr(error, "problem_mark", None) or context_mark
+        line = context_mark.line if context_mark else 1
+        endline = problem_mark.line if problem_mark else 1
+        return None, [
+            f"::error file={path},line={line},endline={endline},"
             f"title=config.yml schema error"
             f"::{e}\n"
-        )
+        ]
+    versions = {}
+    for version in parsed["versions"]:
+        folder = parsed["versions"][version]["folder"]
+        versions[str(version)] = (folder.data, folder.start_line)
+    return versions, []
+
+
+def _fast_validate(content):
+    """Quick check of 'content' with libyaml. Returns the versions when the file surely follows
+    the schema, None when it has to be validated by strictyaml to know it"""
+    root = fast_compose(content)
+    document = fast_mapping(root) if root is not None else None
+    if not document or list(document) != ["versions"]:
+        return None
+    entries = fast_mapping(document["versions"])
+    if not entries:
+        return None
+
+    versions = {}
+    for version, entry in entries.items():
+        fields = fast_mapping(entry)
+        if not fields or list(fields) != ["folder"] or not fast_scalar(fields["folder"]):
+            return None
+        versions[version] = (fields["folder"].value, fields["folder"].start_mark.line + 1)
+    return versions
 
 
 if __name__ == "__main__":
@@ -0,0 +1,74 @@
+import argparse
+import glob
+import os
+
+import conandata_yaml_linter
+import config_yaml_linter
+from yaml_linting import add_paths_arguments, dir_path, expand_paths, lint_files
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Validate the 'config.yml' and 'conandata.yml' files of ConanCenterIndex's recipe folders,"
+                    " and their consistency with each other."
+    )
+    add_paths_arguments(parser)
+    args = parser.parse_args()
+
+    try:
+        paths = expand_paths(args.paths, check=dir_path)
+    except argparse.ArgumentTypeError as error:
+        parser.error(str(error))
+
+    lint_files(lint_recipe_folder, paths, jobs=args.jobs, cache_dir=args.cache_dir)
+
+
+def lint_recipe_folder(recipe_folder):
+    """Validate a 'recipes/<name>' folder and return the list of annotations to report"""
+    annotations = []
+
+    config_path = os.path.join(recipe_folder, "config.yml")
+    versions = None
+    if os.path.isfile(config_path):
+        with open(config_path) as f:
+            versions, config_annotations = config_yaml_linter.validate(config_path, f.read())
+        annotations.extend(config_annotations)
+
+    conandatas = {}
+    for conandata_path in sorted(glob.glob(os.path.join(recipe_folder, "*", "conandata.yml"))):
+        with open(conandata_path, encoding="utf-8") as f:
+            sources, conandata_annotations = conandata_yaml_linter.validate(conandata_path, f.read())
+        annotations.extend(conandata_annotations)
+        conandatas[os.path.basename(os.path.dirname(conandata_path))] = sources
+
+    if versions is not None:
+        annotations.extend(_check_consistency(config_path, versions, recipe_folder, conandatas))
+    return annotations
+
+
+def _check_consistency(config_path, versions, recipe_folder, conandatas):
+    """Cross-file checks: every version listed in 'config.yml' must point to an existing folder
+    whose 'conandata.yml' (if any) has sources for that version"""
+    annotations = []
+    for version, (folder, line) in versions.items():
+        if not os.path.isdir(os.path.join(recipe_folder, folder)):
+            annotations.append(
+                f"::error file={config_path},line={line},endline={line},"
+                f"title=config.yml inconsistency"
+                f"::Version `{version}` uses folder `{folder}`, but this folder does not exist."
+            )
+            continue
+
+        sources = conandatas.get(folder)
+        if sources is not None and version not in sources:
+            annotations.append(
+                f"::error file={config_path},line={line},endline={line},"
+                f"title=config.yml inconsistency"
+                f"::Version `{version}` uses folder `{folder}`, but there is no source for this version"
+                f" in `{folder}/conandata.yml`."
+            )
+    return annotations
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,14 @@
 import argparse
+import re
+
+try:
+    import yaml
+    from yaml import CSafeLoader as _FastLoader
+except ImportError:  # PyYAML not installed or built without libyaml
+    _FastLoader = None
+
+# Tags, anchors and aliases are rejected by strictyaml: leave them to it
+_UNSUPPORTED_SYNTAX = re.compile(r"(?:^|[\s\[{,])[!&*]\S", re.MULTILINE)
 
 
 def file_path(a_string):
@@ -7,3 +17,246 @@ def file_path(a_string):
     if not isfile(a_string):
         raise argparse.ArgumentTypeError(f"{a_string} does not point to a file")
     return a_string
+
+
+def dir_path(a_string):
+    from os.path import isdir
+
+    if not isdir(a_string):
+        raise argparse.ArgumentTypeError(f"{a_string} does not point to a directory")
+    return a_string
+
+
+def fast_compose(content):
+    """Compose 'content' with the libyaml (C) parser.
+
+    Returns the root node, or None when libyaml is not available, the content cannot be composed or
+    it uses syntax that strictyaml rejects. It is used to accept valid files cheaply, the linters
+    fall back to strictyaml whenever this quick check cannot tell a file is valid.
+    """
+    if _FastLoader is None or _UNSUPPORTED_SYNTAX.search(content):
+        return None
+    try:
+        return yaml.compose(content, Loader=_FastLoader)
+    except Exception:
+        return None
+
+
+def fast_mapping(node, allow_flow_style=False):
+    """Returns a dict {key: value node} if 'node' is a mapping node with unique, non-empty scalar
+    keys (as strictyaml requires), None otherwise"""
+    if not isinstance(node, yaml.MappingNode) or (node.flow_style and not allow_flow_style):
+        return None
+    mapping = {}
+    for key, value in node.value:
+        if not fast_scalar(key) or key.value in mapping:
+            return None
+        mapping[key.value] = value
+    return mapping
+
+
+def fast_sequence(node, allow_flow_style=False):
+    """Returns the list of item nodes if 'node' is a sequence node, None otherwise"""
+    if not isinstance(node, yaml.SequenceNode) or (node.flow_style and not allow_flow_style):
+        return None
+    return node.value
+
+
+def fast_scalar(node):
+    """Whether 'node' is a non-empty scalar, that strictyaml would accept as a 'Str()'"""
+    return isinstance(node, yaml.ScalarNode) and node.value != ""
+
+
+def fast_any(node, allow_flow_style=False):
+    """Whether 'node' would be accepted by strictyaml's 'Any()'"""
+    if isinstance(node, yaml.ScalarNode):
+        return node.value != ""
+    if node.flow_style and not allow_flow_style:
+        return False
+    if isinstance(node, yaml.SequenceNode):
+        return bool(node.value) and all(fast_any(item, allow_flow_style) for item in node.value)
+    mapping = fast_mapping(node, allow_flow_style)
+    return bool(mapping) and all(fast_any(value, allow_flow_style) for value in mapping.values())
+
+
+def add_paths_arguments(parser):
+    """Register the arguments shared by the linters to receive the files to validate"""
+    parser.add_argument(
+        "paths",
+        nargs="*",
+        help="files or glob patterns to validate. If none is given (or '-'), the list of files is read from stdin.",
+    )
+    parser.add_argument(
+        "-j", "--jobs",
+        type=int,
+        default=None,
+        help="number of processes used to validate files (defaults to the number of CPUs).",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=None,
+        help="directory to store the results, so unchanged files are not validated again in later runs.",
+    )
+
+
+def expand_paths(patterns, check=file_path):
+    """Expand the given arguments (files, glob patterns or '-' for stdin) into a list of files.
+    Arguments which are not glob patterns are validated with 'check'"""
+    import glob
+    import sys
+
+    if not patterns or patterns == ["-"]:
+        patterns = [line.strip() for line in sys.stdin if line.strip()]
+
+    paths = []
+    seen = set()
+    for pattern in patterns:
+        if any(char in pattern for char in "*?["):
+            matches = sorted(glob.glob(pattern, recursive=True))
+        else:
+            matches = [check(pattern)]
+        for match in matches:
+            if match not in seen:
+                seen.add(match)
+                paths.append(match)
+    return paths
+
+
+class LintCache:
+    """On-disk store of the annotations produced for each file.
+
+    Entries are keyed by the path and the SHA-256 of the file content. The whole
+    cache is discarded when the sources of the linter (which define the schemas)
+    or the strictyaml version change.
+    """
+
+    def __init__(self, cache_dir, lint_function):
+        import os
+
+        module_name = lint_function.__module__
+        if module_name in ("__main__", "__mp_main__"):
+            import sys
+            module_name = os.path.splitext(os.path.basename(sys.modules[module_name].__file__))[0]
+        self._filename = os.path.join(cache_dir, f"{module_name}.json")
+        self._fingerprint = self._linter_fingerprint(lint_function)
+        self._entries = {}
+        self._dirty = False
+
+        try:
+            import json
+            with open(self._filename, encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("fingerprint") == self._fingerprint:
+                self._entries = data.get("files", {})
+        except (OSError, ValueError):
+            pass
+
+    @staticmethod
+    def _linter_fingerprint(lint_function):
+        import hashlib
+        import os
+        import sys
+
+        # Sources of every linter module loaded (the schemas are defined in them)
+        linter_dir = os.path.dirname(os.path.abspath(__file__))
+        sources = {os.path.abspath(sys.modules[lint_function.__module__].__file__)}
+        for module in list(sys.modules.values()):
+            filename = getattr(module, "__file__", None)
+            if filename and os.path.dirname(os.path.abspath(filename)) == linter_dir:
+                sources.add(os.path.abspath(filename))
+
+        digest = hashlib.sha256()
+        for filename in sorted(sources):
+            with open(filename, "rb") as f:
+                digest.update(f.read())
+        try:
+            from importlib.metadata import version
+            digest.update(version("strictyaml").encode())
+        except Exception:
+            pass
+        return digest.hexdigest()
+
+    @staticmethod
+    def content_hash(path):
+        """SHA-256 of a file, or of the YAML files (up to one level deep) and the names of the
+        subdirectories when 'path' is a directory (adding or removing a version folder changes the
+        result of the folder checks)"""
+        import glob
+        import hashlib
+        import os
+
+        digest = hashlib.sha256()
+        if os.path.isdir(path):
+            for name in sorted(it.name for it in os.scandir(path) if it.is_dir()):
+                digest.update(f"{name}/\0".encode())
+            files = sorted(glob.glob(os.path.join(path, "*.yml")) + glob.glob(os.path.join(path, "*", "*.yml")))
+            for filename in files:
+                digest.update(os.path.relpath(filename, path).encode())
+                with open(filename, "rb") as f:
+                    digest.update(hashlib.sha256(f.read()).digest())
+        else:
+            with open(path, "rb") as f:
+                digest.update(f.read())
+        return digest.hexdigest()
+
+    def get(self, path, content_hash):
+        entry = self._entries.get(path)
+        if entry and entry["sha256"] == content_hash:
+            return entry["annotations"]
+        return None
+
+    def set(self, path, content_hash, annotations):
+        self._entries[path] = {"sha256": content_hash, "annotations": annotations}
+        self._dirty = True
+
+    def save(self):
+        import json
+        import os
+
+        if not self._dirty:
+            return
+        os.makedirs(os.path.dirname(self._filename) or ".", exist_ok=True)
+        tmp_filename = f"{self._filename}.{os.getpid()}.tmp"
+        with open(tmp_filename, "w", encoding="utf-8") as f:
+            json.dump({"fingerprint": self._fingerprint, "files": self._entries}, f)
+        os.replace(tmp_filename, self._filename)
+
+
+def _run_lint_function(lint_function, paths, jobs=None):
+    if jobs == 1 or len(paths) <= 1:
+        return list(map(lint_function, paths))
+
+    import os
+    from concurrent.futures import ProcessPoolExecutor
+
+    workers = jobs or os.cpu_count() or 1
+    chunksize = max(1, len(paths) // (4 * workers))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(lint_function, paths, chunksize=chunksize))
+
+
+def lint_files(lint_function, paths, jobs=None, cache_dir=None):
+    """Run 'lint_function' over every path and print the annotations it returns, in the order of 'paths'"""
+    results = {}
+    pending = paths
+    if cache_dir:
+        cache = LintCache(cache_dir, lint_function)
+        hashes = {path: cache.content_hash(path) for path in paths}
+        pending = []
+        for path in paths:
+            annotations = cache.get(path, hashes[path])
+            if annotations is None:
+                pending.append(path)
+            else:
+                results[path] = annotations
+
+    results.update(zip(pending, _run_lint_function(lint_function, pending, jobs)))
+
+    if cache_dir:
+        for path in pending:
+            cache.set(path, hashes[path], results[path])
+        cache.save()
+
+    for path in paths:
+        for annotation in results[path]:
+            print(annotation)
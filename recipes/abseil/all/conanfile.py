@@ -6,9 +6,7 @@ from conan.tools.cmake import CMake, CMakeToolchain, cmake_layout
 from conan.tools.files import export_conandata_patches, apply_conandata_patches, copy, get, load, replace_in_file, rmdir, save
 from conan.tools.microsoft import is_msvc
 from conan.tools.scm import Version
-import json
 import os
-import re
 import textwrap
 
 required_conan_version = ">=1.53.0"
@@ -22,6 +20,7 @@ class AbseilConan(ConanFile):
     license = "Apache-2.0"
 
     package_type = "library"
+    python_requires = "cmake-components/1.0"
     settings = "os", "arch", "compiler", "build_type"
     options = {
         "shared": [True, False],
@@ -139,73 +138,48 @@ class AbseilConan(ConanFile):
         rmdir(self, cmake_folder)
 
         # Create a json helper file in order to populate package_info() at consume time
-        self._create_components_file(self._components_helper_filepath, components)
+        self._cmake_components.save_manifest(self._components_helper_filepath, components)
 
         # Create a build-module that will propagate the required cxx_std to consumers of this recipe's targets
         # TODO: Revisit with feedback from https://github.com/conan-io/conan/issues/10281
         self._create_cxx_std_module_file(self._cxx_std_module_filepath, components)
 
+    @property
+    def _cmake_components(self):
+        return self.python_requires["cmake-components"].module
+
     def _load_components_from_cmake_target_file(self, absl_target_file_path):
-        components = {}
-
-        abs_target_content = load(self, absl_target_file_path)
-
-        # Replace the line endings to support building with MSys2 on Windows
-        abs_target_content = abs_target_content.replace("\r\n", "\n")
-
-        cmake_functions = re.findall(r"(?P<func>add_library|set_target_properties)[\n|\s]*\([\n|\s]*(?P<args>[^)]*)\)", abs_target_content)
-        for (cmake_function_name, cmake_function_args) in cmake_functions:
-            cmake_function_args = re.split(r"[\s|\n]+", cmake_function_args, maxsplit=2)
-
-            cmake_imported_target_name = cmake_function_args[0]
-            cmake_target_nonamespace = cmake_imported_target_name.replace("absl::", "")
-            potential_lib_name = "absl_" + cmake_target_nonamespace
-
-            components.setdefault(potential_lib_name, {"cmake_target": cmake_target_nonamespace})
-
-            if cmake_function_name == "add_library":
-                cmake_imported_target_type = cmake_function_args[1]
-                if cmake_imported_target_type in ["STATIC", "SHARED"]:
-                    components[potential_lib_name]["libs"] = [potential_lib_name] if cmake_target_nonamespace != "abseil_dll" else ['abseil_dll']
-            elif cmake_function_name == "set_target_properties":
-                target_properties = re.findall(r"(?P<property>INTERFACE_COMPILE_DEFINITIONS|INTERFACE_INCLUDE_DIRECTORIES|INTERFACE_LINK_LIBRARIES)[\n|\s]+(?P<values>.+)", cmake_function_args[2])
-                for target_property in target_properties:
-                    property_type = target_property[0]
-                    if property_type == "INTERFACE_LINK_LIBRARIES":
-                        values_list = target_property[1].replace('"', "").split(";")
-                        for dependency in values_list:
-                            if dependency.startswith("absl::"): # abseil targets
-                                components[potential_lib_name].setdefault("requires", []).append(dependency.replace("absl::", "absl_"))
-                            else: # system libs or frameworks
-                                if self.settings.os in ["Linux", "FreeBSD"]:
-                                    if dependency == "Threads::Threads":
-                                        components[potential_lib_name].setdefault("system_libs", []).append("pthread")
-                                    elif "-lm" in dependency:
-                                        components[potential_lib_name].setdefault("system_libs", []).append("m")
-                                    elif "-lrt" in dependency:
-                                        components[potential_lib_name].setdefault("system_libs", []).append("rt")
-                                elif self.settings.os == "Windows":
-                                    for system_lib in ["bcrypt", "advapi32", "dbghelp"]:
-                                        if system_lib in dependency:
-                                            components[potential_lib_name].setdefault("system_libs", []).append(system_lib)
-                                elif is_apple_os(self):
-                                    for framework in ["CoreFoundation"]:
-                                        if framework in dependency:
-                                            components[potential_lib_name].setdefault("frameworks", []).append(framework)
-                    elif property_type == "INTERFACE_COMPILE_DEFINITIONS":
-                        values_list = target_property[1].replace('"', "").split(";")
-                        for definition in values_list:
-                            if definition == r"\$<\$<PLATFORM_ID:AIX>:_LINUX_SOURCE_COMPAT>":
-                                if self.settings.os == "AIX":
-                                    components[potential_lib_name].setdefault("defines", []).append("_LINUX_SOURCE_COMPAT")
-                            else:
-                                components[potential_lib_name].setdefault("defines", []).append(definition)
-
-        return components
-
-    def _create_components_file(self, output_file, components):
-        content = json.dumps(components, indent=4)
-        save(self, output_file, content)
+        targets = self._cmake_components.parse_targets_file(absl_target_file_path)
+        return self._cmake_components.build_manifest(
+            targets,
+            namespace="absl::",
+            component_name=lambda target: "absl_" + target,
+            library_name=lambda target: "abseil_dll" if target == "abseil_dll" else "absl_" + target,
+            link_item=self._component_link_item,
+            define=self._component_define,
+        )
+
+    def _component_link_item(self, dependency):
+        if dependency.startswith("absl::"): # abseil targets
+            return [("requires", dependency.replace("absl::", "absl_"))]
+        # system libs or frameworks
+        if self.settings.os in ["Linux", "FreeBSD"]:
+            if dependency == "Threads::Threads":
+                return [("system_libs", "pthread")]
+            elif "-lm" in dependency:
+                return [("system_libs", "m")]
+            elif "-lrt" in dependency:
+                return [("system_libs", "rt")]
+        elif self.settings.os == "Windows":
+            return [("system_libs", system_lib) for system_lib in ["bcrypt", "advapi32", "dbghelp"] if system_lib in dependency]
+        elif is_apple_os(self):
+            return [("frameworks", framework) for framework in ["CoreFoundation"] if framework in dependency]
+        return []
+
+    def _component_define(self, definition):
+        if definition == "$<$<PLATFORM_ID:AIX>:_LINUX_SOURCE_COMPAT>":
+            return ["_LINUX_SOURCE_COMPAT"] if self.settings.os == "AIX" else []
+        return [definition]
 
     @property
     def _components_helper_filepath(self):
@@ -214,9 +188,8 @@ class AbseilConan(ConanFile):
     def _create_cxx_std_module_file(self, output_file, components):
         content = ""
         cxx_std_required = _ABIFile(self, os.path.join(self.build_folder, "abi.h")).cxx_std()
-        for _, values in components.items():
-            cmake_target = values["cmake_target"]
-            content += f"target_compile_features(absl::{cmake_target} INTERFACE cxx_std_{cxx_std_required})\n"
+        for values in components.values():
+            content += f"target_compile_features({values['cmake_target']} INTERFACE cxx_std_{cxx_std_required})\n"
         save(self, output_file, content)
 
     @property
@@ -226,17 +199,11 @@ class AbseilConan(ConanFile):
     def package_info(self):
         self.cpp_info.set_property("cmake_file_name", "absl")
 
-        components_json_file = load(self, self._components_helper_filepath)
-        abseil_components = json.loads(components_json_file)
+        abseil_components = self._cmake_components.load_manifest(self._components_helper_filepath)
         for pkgconfig_name, values in abseil_components.items():
-            cmake_target = values["cmake_target"]
-            self.cpp_info.components[pkgconfig_name].set_property("cmake_target_name", "absl::{}".format(cmake_target))
+            cmake_target = values["cmake_target"].replace("absl::", "")
+            self._cmake_components.fill_component(self.cpp_info.components[pkgconfig_name], values)
             self.cpp_info.components[pkgconfig_name].set_property("pkg_config_name", pkgconfig_name)
-            self.cpp_info.components[pkgconfig_name].libs = values.get("libs", [])
-            self.cpp_info.components[pkgconfig_name].defines = values.get("defines", [])
-            self.cpp_info.components[pkgconfig_name].system_libs = values.get("system_libs", [])
-            self.cpp_info.components[pkgconfig_name].frameworks = values.get("frameworks", [])
-            self.cpp_info.components[pkgconfig_name].requires = values.get("requires", [])
 
             self.cpp_info.components[pkgconfig_name].names["cmake_find_package"] = cmake_target
             self.cpp_info.components[pkgconfig_name].names["cmake_find_package_multi"] = cmake_target
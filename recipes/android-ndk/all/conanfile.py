@@ -2,12 +2,38 @@ from conan import ConanFile, conan_version
 from conan.errors import ConanInvalidConfiguration
 from conan.tools.files import get, download, unzip, load, copy, rm
 from conan.tools.layout import basic_layout
+from concurrent.futures import ThreadPoolExecutor
 import os
 import re
 import shutil
+import stat
 
 required_conan_version = ">=1.52.0"
 
+# Signatures of the binaries which must be executable: ELF, and Mach-O (fat and thin, 32 and 64 bits, both endianness)
+_EXECUTABLE_SIGNATURES = frozenset((
+    b"\x7fELF",
+    b"\xca\xfe\xba\xbe",
+    b"\xbe\xba\xfe\xca",
+    b"\xfe\xed\xfa\xcf",
+    b"\xcf\xfa\xed\xfe",
+    b"\xfe\xef\xfa\xce",
+    b"\xce\xfa\xed\xfe",
+))
+
+
+def _non_executable_mode(filename):
+    """Returns (filename, mode) if 'filename' is a script or a binary which is not executable yet, None otherwise"""
+    st = os.lstat(filename)
+    # links are handled with their target, files already executable don't have to be read
+    if not stat.S_ISREG(st.st_mode) or st.st_mode & 0o111 == 0o111:
+        return None
+    with open(filename, "rb") as f:
+        sig = f.read(4)
+    if (len(sig) > 2 and sig.startswith(b"#!")) or sig in _EXECUTABLE_SIGNATURES:
+        return filename, st.st_mode
+    return None
+
 
 class AndroidNDKConan(ConanFile):
     name = "android-ndk"
@@ -146,31 +172,14 @@ class AndroidNDKConan(ConanFile):
     def _fix_permissions(self):
         if os.name != "posix":
             return
-        for root, _, files in os.walk(os.path.join(self.package_folder, "bin")):
-            for filename in files:
-                filename = os.path.join(root, filename)
-                with open(filename, "rb") as f:
-                    sig = f.read(4)
-                    if isinstance(sig, str):
-                        sig = [ord(s) for s in sig]
-                    else:
-                        sig = list(sig)
-                    if len(sig) > 2 and sig[0] == 0x23 and sig[1] == 0x21:
-                        self.output.info(f"chmod on script file: '{filename}'")
-                        self._chmod_plus_x(filename)
-                    elif sig == [0x7F, 0x45, 0x4C, 0x46]:
-                        self.output.info(f"chmod on ELF file: '{filename}'")
-                        self._chmod_plus_x(filename)
-                    elif sig in (
-                        [0xCA, 0xFE, 0xBA, 0xBE],
-                        [0xBE, 0xBA, 0xFE, 0xCA],
-                        [0xFE, 0xED, 0xFA, 0xCF],
-                        [0xCF, 0xFA, 0xED, 0xFE],
-                        [0xFE, 0xEF, 0xFA, 0xCE],
-                        [0xCE, 0xFA, 0xED, 0xFE]
-                    ):
-                        self.output.info(f"chmod on Mach-O file: '{filename}'")
-                        self._chmod_plus_x(filename)
+        bin_folder = os.path.join(self.package_folder, "bin")
+        files = [os.path.join(root, filename) for root, _, filenames in os.walk(bin_folder) for filename in filenames]
+        # Reading the first bytes of tens of thousands of files is I/O bound: use threads
+        with ThreadPoolExecutor() as executor:
+            executables = [it for it in executor.map(_non_executable_mode, files) if it is not None]
+        for filename, mode in executables:
+            os.chmod(filename, mode | 0o111)
+        self.output.info(f"chmod +x on {len(executables)} scripts, ELF and Mach-O files (out of {len(files)} files)")
 
     def _fix_broken_links(self):
         # https://github.com/android/ndk/issues/1671
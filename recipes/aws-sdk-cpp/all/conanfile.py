@@ -1,6 +1,7 @@
+import json
 import os
 
-from conan import ConanFile
+from conan import ConanFile, conan_version
 from conan.errors import ConanInvalidConfiguration
 from conan.tools.build import cross_building, stdcpp_library
 from conan.tools.cmake import CMake, CMakeDeps, CMakeToolchain, cmake_layout
@@ -11,6 +12,11 @@ from conan.tools.scm import Version
 required_conan_version = ">=1.54.0"
 
 
+def _load_sdks_catalogue():
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), "sdks.json"), encoding="utf-8") as f:
+        return json.load(f)
+
+
 class AwsSdkCppConan(ConanFile):
     name = "aws-sdk-cpp"
     license = "Apache-2.0"
@@ -20,275 +26,11 @@ class AwsSdkCppConan(ConanFile):
     topics = ("aws", "cpp", "cross-platform", "amazon", "cloud")
     package_type = "library"
     settings = "os", "arch", "compiler", "build_type"
-    _sdks = (
-        "access-management",
-        "accessanalyzer",
-        "acm",
-        "acm-pca",
-        "alexaforbusiness",
-        "amp",
-        "amplify",
-        "amplifybackend",
-        "apigateway",
-        "apigatewaymanagementapi",
-        "apigatewayv2",
-        "appconfig",
-        "appflow",
-        "appintegrations",
-        "application-autoscaling",
-        "application-insights",
-        "appmesh",
-        "appstream",
-        "appsync",
-        "athena",
-        "auditmanager",
-        "autoscaling",
-        "autoscaling-plans",
-        "awstransfer",
-        "backup",
-        "batch",
-        "braket",
-        "budgets",
-        "ce",
-        "chime",
-        "cloud9",
-        "clouddirectory",
-        "cloudformation",
-        "cloudfront",
-        "cloudhsm",
-        "cloudhsmv2",
-        "cloudsearch",
-        "cloudsearchdomain",
-        "cloudtrail",
-        "codeartifact",
-        "codebuild",
-        "codecommit",
-        "codedeploy",
-        "codeguru-reviewer",
-        "codeguruprofiler",
-        "codepipeline",
-        "codestar",
-        "codestar-connections",
-        "codestar-notifications",
-        "cognito-identity",
-        "cognito-idp",
-        "cognito-sync",
-        "comprehend",
-        "comprehendmedical",
-        "compute-optimizer",
-        "config",
-        "connect",
-        "connect-contact-lens",
-        "connectparticipant",
-        "cur",
-        "customer-profiles",
-        "databrew",
-        "dataexchange",
-        "datapipeline",
-        "datasync",
-        "dax",
-        "detective",
-        "devicefarm",
-        "devops-guru",
-        "directconnect",
-        "discovery",
-        "dlm",
-        "dms",
-        "docdb",
-        "ds",
-        "dynamodb",
-        "dynamodbstreams",
-        "ebs",
-        "ec2",
-        "ec2-instance-connect",
-        "ecr",
-        "ecr-public",
-        "ecs",
-        "eks",
-        "elastic-inference",
-        "elasticache",
-        "elasticbeanstalk",
-        "elasticfilesystem",
-        "elasticloadbalancing",
-        "elasticloadbalancingv2",
-        "elasticmapreduce",
-        "elastictranscoder",
-        "email",
-        "emr-containers",
-        "es",
-        "eventbridge",
-        "events",
-        "firehose",
-        "fms",
-        "forecast",
-        "forecastquery",
-        "frauddetector",
-        "fsx",
-        "gamelift",
-        "glacier",
-        "globalaccelerator",
-        "glue",
-        "greengrass",
-        "greengrassv2",
-        "groundstation",
-        "guardduty",
-        "health",
-        "healthlake",
-        "honeycode",
-        "iam",
-        "identity-management",
-        "identitystore",
-        "imagebuilder",
-        "importexport",
-        "inspector",
-        "iot",
-        "iot-data",
-        "iot-jobs-data",
-        "iot1click-devices",
-        "iot1click-projects",
-        "iotanalytics",
-        "iotdeviceadvisor",
-        "iotevents",
-        "iotevents-data",
-        "iotfleethub",
-        "iotsecuretunneling",
-        "iotsitewise",
-        "iotthingsgraph",
-        "iotwireless",
-        "ivs",
-        "kafka",
-        "kendra",
-        "kinesis",
-        "kinesis-video-archived-media",
-        "kinesis-video-media",
-        "kinesis-video-signaling",
-        "kinesisanalytics",
-        "kinesisanalyticsv2",
-        "kinesisvideo",
-        "kms",
-        "lakeformation",
-        "lambda",
-        "lex",
-        "lex-models",
-        "lexv2-models",
-        "lexv2-runtime",
-        "license-manager",
-        "lightsail",
-        "location",
-        "logs",
-        "lookoutvision",
-        "machinelearning",
-        "macie",
-        "macie2",
-        "managedblockchain",
-        "marketplace-catalog",
-        "marketplace-entitlement",
-        "marketplacecommerceanalytics",
-        "mediaconnect",
-        "mediaconvert",
-        "medialive",
-        "mediapackage",
-        "mediapackage-vod",
-        "mediastore",
-        "mediastore-data",
-        "mediatailor",
-        "meteringmarketplace",
-        "migrationhub-config",
-        "mobile",
-        "mobileanalytics",
-        "monitoring",
-        "mq",
-        "mturk-requester",
-        "mwaa",
-        "neptune",
-        "network-firewall",
-        "networkmanager",
-        "opsworks",
-        "opsworkscm",
-        "organizations",
-        "outposts",
-        "personalize",
-        "personalize-events",
-        "personalize-runtime",
-        "pi",
-        "pinpoint",
-        "pinpoint-email",
-        "polly",
-        "polly-sample",
-        "pricing",
-        "qldb",
-        "qldb-session",
-        "queues",
-        "quicksight",
-        "ram",
-        "rds",
-        "rds-data",
-        "redshift",
-        "redshift-data",
-        "rekognition",
-        "resource-groups",
-        "resourcegroupstaggingapi",
-        "robomaker",
-        "route53",
-        "route53domains",
-        "route53resolver",
-        "s3",
-        "s3-crt",
-        "s3-encryption",
-        "s3control",
-        "s3outposts",
-        "sagemaker",
-        "sagemaker-a2i-runtime",
-        "sagemaker-edge",
-        "sagemaker-featurestore-runtime",
-        "sagemaker-runtime",
-        "savingsplans",
-        "schemas",
-        "sdb",
-        "secretsmanager",
-        "securityhub",
-        "serverlessrepo",
-        "service-quotas",
-        "servicecatalog",
-        "servicecatalog-appregistry",
-        "servicediscovery",
-        "sesv2",
-        "shield",
-        "signer",
-        "sms",
-        "sms-voice",
-        "snowball",
-        "sns",
-        "sqs",
-        "ssm",
-        "sso",
-        "sso-admin",
-        "sso-oidc",
-        "states",
-        "storagegateway",
-        "sts",
-        "support",
-        "swf",
-        "synthetics",
-        "text-to-speech",
-        "textract",
-        "timestream-query",
-        "timestream-write",
-        "transcribe",
-        "transcribestreaming",
-        "transfer",
-        "translate",
-        "waf",
-        "waf-regional",
-        "wafv2",
-        "wellarchitected",
-        "workdocs",
-        "worklink",
-        "workmail",
-        "workmailmessageflow",
-        "workspaces",
-        "xray",
-    )
+    exports = "sdks.json"
+    # SDKs available in each version and their internal requirements, maintained with update-sdks.py
+    _sdks_catalogue = _load_sdks_catalogue()
+    # One option per SDK of any version, the SDKs not available in a version are removed in config_options()
+    _sdks = tuple(sorted(set().union(*_sdks_catalogue["versions"].values())))
     options = {
         **{
             "shared": [True, False],
@@ -311,14 +53,11 @@ class AwsSdkCppConan(ConanFile):
 
     @property
     def _internal_requirements(self):
-        return {
-            "access-management": ["iam", "cognito-identity"],
-            "identity-management": ["cognito-identity", "sts"],
-            "queues": ["sqs"],
-            "s3-encryption": ["s3", "kms"],
-            "text-to-speech": ["polly"],
-            "transfer": ["s3"],
-        }
+        return self._sdks_catalogue["internal_requirements"]
+
+    @property
+    def _internal_requirements_closure(self):
+        return self._sdks_catalogue["internal_requirements_closure"]
 
     def export_sources(self):
         export_conandata_patches(self)
@@ -326,6 +65,12 @@ class AwsSdkCppConan(ConanFile):
     def config_options(self):
         if self.settings.os == "Windows":
             del self.options.fPIC
+        available_sdks = self._sdks_catalogue["versions"].get(str(self.version))
+        if available_sdks is not None:
+            available_sdks = set(available_sdks)
+            for sdk in self._sdks:
+                if sdk not in available_sdks:
+                    self.options.rm_safe(sdk)
 
     def configure(self):
         if self.options.shared:
@@ -380,9 +125,9 @@ class AwsSdkCppConan(ConanFile):
                 )
 
     def package_id(self):
-        for hl_comp in self._internal_requirements.keys():
-            if getattr(self.info.options, hl_comp):
-                for internal_requirement in self._internal_requirements[hl_comp]:
+        for hl_comp, internal_requirements in self._internal_requirements_closure.items():
+            if self.info.options.get_safe(hl_comp):
+                for internal_requirement in internal_requirements:
                     setattr(self.info.options, internal_requirement, True)
 
     def source(self):
@@ -504,14 +249,11 @@ class AwsSdkCppConan(ConanFile):
         ])
 
         # other components
-        enabled_sdks = [sdk for sdk in self._sdks if self.options.get_safe(sdk)]
-        for hl_comp in self._internal_requirements.keys():
-            if getattr(self.options, hl_comp):
-                for internal_requirement in self._internal_requirements[hl_comp]:
-                    if internal_requirement not in enabled_sdks:
-                        enabled_sdks.append(internal_requirement)
-
-        for sdk in enabled_sdks:
+        enabled_sdks = {sdk for sdk in self._sdks if self.options.get_safe(sdk)}
+        for hl_comp in enabled_sdks & self._internal_requirements_closure.keys():
+            enabled_sdks.update(self._internal_requirements_closure[hl_comp])
+
+        for sdk in sorted(enabled_sdks):
             # TODO: there is no way to properly emulate COMPONENTS names for
             #       find_package(AWSSDK COMPONENTS <sdk>) in set_property()
             #       right now: see https://github.com/conan-io/conan/issues/10258
@@ -523,6 +265,8 @@ class AwsSdkCppConan(ConanFile):
             self.cpp_info.components[sdk].libs = ["aws-cpp-sdk-" + sdk]
 
             # TODO: to remove in conan v2 once cmake_find_package_* generators removed
+            if conan_version.major >= 2:
+                continue
             self.cpp_info.components[sdk].names["cmake_find_package"] = "aws-sdk-cpp-" + sdk
             self.cpp_info.components[sdk].names["cmake_find_package_multi"] = "aws-sdk-cpp-" + sdk
             component_alias = f"aws-sdk-cpp-{sdk}_alias" # to emulate COMPONENTS names for find_package()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+
+"""
+Update the sdks.json catalogue loaded by conanfile.py.
+
+sdks.json lists the SDKs available in each version of aws-sdk-cpp (each one is an option of the
+recipe), the internal requirements of the high-level SDKs (eg. transfer requires s3) and the
+transitive closure of these requirements, used by the recipe to know which SDKs are built.
+
+Re-run this script with the sources of a new version to add it to the catalogue, or without
+argument after editing the internal requirements.
+"""
+
+import argparse
+import json
+from pathlib import Path
+from typing import Dict, List
+
+CATALOGUE = Path(__file__).parent / "sdks.json"
+
+
+def scan_sdks(source_folder: Path) -> List[str]:
+    """SDKs found in a source tree: aws-cpp-sdk-<sdk> folders at the root (1.9.x) or in src/ and generated/src/ (1.11.x)"""
+    sdks = set()
+    for folder in (source_folder, source_folder / "src", source_folder / "generated" / "src"):
+        sdks.update(it.name[len("aws-cpp-sdk-"):] for it in folder.glob("aws-cpp-sdk-*") if it.is_dir())
+    sdks.discard("core")
+    sdks.difference_update(it for it in list(sdks) if it.endswith("-tests") or it.endswith("-integration-tests"))
+    return sorted(sdks)
+
+
+def transitive_closure(graph: Dict[str, List[str]]) -> Dict[str, List[str]]:
+    closure = {}
+    for sdk in graph:
+        visited = set()
+        pending = list(graph[sdk])
+        while pending:
+            requirement = pending.pop()
+            if requirement not in visited:
+                visited.add(requirement)
+                pending.extend(graph.get(requirement, []))
+        visited.discard(sdk)
+        closure[sdk] = sorted(visited)
+    return closure
+
+
+def main(args=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-v", "--version", help="version of aws-sdk-cpp whose SDKs are (re)scanned")
+    parser.add_argument("-s", "--source-folder", type=Path, help="sources of this version")
+    ns = parser.parse_args(args)
+    if bool(ns.version) != bool(ns.source_folder):
+        parser.error("--version and --source-folder go together")
+
+    with CATALOGUE.open() as f:
+        catalogue = json.load(f)
+    if ns.version:
+        catalogue["versions"][ns.version] = scan_sdks(ns.source_folder)
+    catalogue["internal_requirements_closure"] = transitive_closure(catalogue["internal_requirements"])
+
+    with CATALOGUE.open("w") as f:
+        json.dump(catalogue, f, indent=1, sort_keys=True)
+        f.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    import sys
+    sys.exit(main())
@@ -0,0 +1,240 @@
+"""
+Graph of the proto libraries declared in the BUILD.bazel files of a source tree, to build them with
+CMake (protobuf_generate). Shared by the googleapis and grpc-proto recipes.
+
+Usage, in a recipe:
+
+    python_requires = "bazel-proto-graph/1.0"
+
+    def build(self):
+        proto_graph = self.python_requires["bazel-proto-graph"].module
+        graph = proto_graph.ProtoGraph.load(build_files, self.source_folder,
+                                            repositories={"com_google_protobuf": proto_graph.PROTOBUF_TARGET},
+                                            error=self.output.error, target_name=...)
+        graph.activate(it.label for it in graph.libraries if it.is_cc)
+        for it in graph.used_libraries:
+            ... graph.cmake_content(it, import_dirs) ...
+"""
+
+import json
+import os
+import re
+import sys
+import textwrap
+from concurrent.futures import ThreadPoolExecutor
+
+from conan import ConanFile
+
+required_conan_version = ">=1.53.0"
+
+PROTOBUF_TARGET = "protobuf::libprotobuf"
+
+_RULE = re.compile(r'^[ \t]*(proto_library|cc_proto_library)\([ \t]*\n(.*?)^[ \t]*\)', re.MULTILINE | re.DOTALL)
+_VARIABLE = re.compile(r'^(\w+) = \[(.*?)\]', re.MULTILINE | re.DOTALL)
+_NAME = re.compile(r'^[ \t]*name = "([^"]*)"', re.MULTILINE)
+_LIST = re.compile(r'^[ \t]*(srcs|deps) = \[(.*?)\](?:[ \t]*\+[ \t]*(\w+))?', re.MULTILINE | re.DOTALL)
+_STRING = re.compile(r'"([^"]*)"')
+_COMMENT = re.compile(r'#[^\n]*')
+
+
+class BazelProtoGraphConan(ConanFile):
+    name = "bazel-proto-graph"
+    description = "Helpers for recipes building the proto libraries declared in the BUILD.bazel files of a project"
+    license = "MIT"
+    url = "https://github.com/conan-io/conan-center-index"
+    homepage = "https://github.com/conan-io/conan-center-index"
+    topics = ("bazel", "protobuf", "python-requires")
+    package_type = "python-require"
+
+
+class ProtoLibrary:
+    __slots__ = ("label", "name", "srcs", "deps", "is_cc", "is_used")
+
+    def __init__(self, label, name, srcs, deps, is_cc):
+        self.label = label
+        self.name = name
+        self.srcs = srcs
+        self.deps = deps
+        self.is_cc = is_cc
+        self.is_used = False
+
+    def dumps(self):
+        return json.dumps({
+            "label": self.label,
+            "srcs": self.srcs,
+            "deps": list(self.deps),
+            "is_cc": self.is_cc,
+        }, indent=4)
+
+
+def _strings(text):
+    return _STRING.findall(_COMMENT.sub("", text))
+
+
+def _resolve_label(label, package, repositories):
+    """Returns the canonical label ('//package:name') of a dependency, the name of the external
+    target it maps to (eg. 'protobuf::libprotobuf') or None if it cannot be resolved"""
+    if label.startswith("@"):
+        repository, separator, target = label[1:].partition("//")
+        if not separator or repository not in repositories:
+            return None
+        if repositories[repository] is not None:
+            return repositories[repository]
+        label = "//" + target
+    elif label.startswith(":"):
+        return sys.intern(f"//{package}{label}")
+    if not label.startswith("//"):
+        return None
+    if ":" not in label:
+        label = f"{label}:{label.rsplit('/', 1)[-1]}"
+    return sys.intern(label)
+
+
+def _scan_build_file(filename, source_folder, repositories, rules):
+    """Single pass over a BUILD.bazel file. Returns the list of proto libraries it declares
+    and the list of dependencies that could not be resolved"""
+    with open(filename, "r", encoding="utf-8") as f:
+        content = f.read()
+
+    basedir = os.path.dirname(filename)
+    # We need forward slashes because of Windows
+    package = os.path.relpath(basedir, source_folder).replace("\\", "/")
+    if package == ".":
+        package = ""
+    variables = {name: _strings(items) for name, items in _VARIABLE.findall(content)}
+
+    libraries = []
+    unresolved = []
+    for rule, body in _RULE.findall(content):
+        if rule not in rules:
+            continue
+        name = _NAME.search(body).group(1)
+        srcs = []
+        deps = {PROTOBUF_TARGET}  # Add to all libraries even if not explicitly set
+        for attribute, items, variable in _LIST.findall(body):
+            values = _strings(items) + (variables[variable] if variable else [])
+            if attribute == "srcs":
+                srcs.extend(os.path.relpath(os.path.join(basedir, it), source_folder).replace("\\", "/") for it in values)
+                continue
+            for it in values:
+                dep = _resolve_label(it, package, repositories)
+                if dep is None:
+                    unresolved.append(f"{it} -- {os.path.relpath(filename, source_folder)}")
+                else:
+                    deps.add(dep)
+        label = sys.intern(f"//{package}:{name}")
+        libraries.append(ProtoLibrary(label, name, srcs, tuple(sorted(deps)), rule == "cc_proto_library"))
+    return libraries, unresolved
+
+
+class ProtoGraph:
+    """Proto libraries of a source tree, indexed by label.
+
+    'target_name' gives the name of the CMake target (and the package component) of a library
+    from its label, 'alias' the (shorter) name of the CMake target created in the build tree.
+    """
+
+    def __init__(self, libraries, target_name, alias=None):
+        self.libraries = libraries
+        self._by_label = {it.label: it for it in libraries}
+        self._adjacency = {it.label: tuple(dep for dep in it.deps if dep in self._by_label) for it in libraries}
+        self._target_name = target_name
+        self._alias = alias or (lambda target: target)
+        self._cmake_targets = {}
+
+    @classmethod
+    def load(cls, build_files, source_folder, repositories, error, target_name, alias=None,
+             rules=("proto_library", "cc_proto_library"), jobs=None):
+        """Scan the given BUILD.bazel files (concurrently, they are thousands in googleapis).
+
+        'repositories' maps the names of the bazel repositories the labels can refer to ('@name//...')
+        to the external target they provide, or to None for the repository being scanned.
+        """
+        build_files = sorted(build_files)
+        with ThreadPoolExecutor(max_workers=jobs or min(32, (os.cpu_count() or 1) + 4)) as executor:
+            results = list(executor.map(lambda it: _scan_build_file(it, source_folder, repositories, rules), build_files))
+
+        libraries = []
+        for file_libraries, unresolved in results:
+            libraries.extend(file_libraries)
+            for it in unresolved:
+                error(f"Unrecognized dep: {it}")
+        return cls(libraries, target_name, alias)
+
+    def validate(self, source_folder):
+        for it in self.libraries:
+            # Check all files exists
+            for src in it.srcs:
+                assert os.path.exists(os.path.join(source_folder, src)), f"{it.label} - file '{src}' doesn't exist"
+            # Check all deps exists
+            for dep in it.deps:
+                assert dep in self._by_label or not dep.startswith("//"), f"{it.label} - dep '{dep}' not found"
+
+    def activate(self, labels):
+        """Mark the given libraries, and all the libraries they depend on, as used"""
+        pending = list(labels)
+        visited = set()
+        while pending:
+            label = pending.pop()
+            if label in visited:
+                continue
+            visited.add(label)
+            self._by_label[label].is_used = True
+            pending.extend(self._adjacency[label])
+
+    def deactivate(self, label):
+        if label in self._by_label:
+            self._by_label[label].is_used = False
+
+    @property
+    def used_libraries(self):
+        return [it for it in self.libraries if it.is_used]
+
+    def cmake_target(self, label):
+        if not label.startswith("//"):
+            return label
+        target = self._cmake_targets.get(label)
+        if target is None:
+            target = self._cmake_targets[label] = self._target_name(label)
+        return target
+
+    def cmake_deps(self, library):
+        return [self.cmake_target(it) for it in library.deps]
+
+    def cmake_content(self, library, import_dirs):
+        cmake_target = self.cmake_target(library.label)
+        cmake_alias = self._alias(cmake_target)
+        content = f"\n\n# {cmake_target}" + (f" ({cmake_alias})\n" if cmake_alias != cmake_target else "\n")
+        content += "\n".join([f"#{it}" for it in library.dumps().split('\n')])
+        content += "\n"
+        if not library.srcs:
+            content += textwrap.dedent(f"""\
+                add_library({cmake_alias} INTERFACE)
+            """)
+        else:
+            content += textwrap.dedent(f"""\
+                set({cmake_alias}_PROTOS {" ".join(["${CMAKE_SOURCE_DIR}/"+it for it in library.srcs])})
+                add_library({cmake_alias} ${{{cmake_alias}_PROTOS}})
+                target_include_directories({cmake_alias} PUBLIC ${{CMAKE_BINARY_DIR}})
+                target_compile_features({cmake_alias} PUBLIC cxx_std_11)
+            """)
+            if cmake_alias != cmake_target:
+                content += textwrap.dedent(f"""\
+                    # set project_label to shorten the name of the vcxproj file and cause shorter paths
+                    set_property(TARGET {cmake_alias} PROPERTY OUTPUT_NAME "{cmake_target}")
+                """)
+            content += textwrap.dedent(f"""\
+                protobuf_generate(LANGUAGE cpp
+                                TARGET {cmake_alias}
+                                PROTOS ${{{cmake_alias}_PROTOS}}
+                                IMPORT_DIRS {import_dirs}
+                                )
+            """)
+
+        if library.deps:
+            cmake_deps = [self._alias(self.cmake_target(it)) if it.startswith("//") else it for it in library.deps]
+            content += textwrap.dedent(f"""\
+                target_link_libraries({cmake_alias} {"PUBLIC" if library.srcs else "INTERFACE"} {" ".join(cmake_deps)})
+            """)
+
+        return content
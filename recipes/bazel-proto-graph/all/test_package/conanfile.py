@@ -0,0 +1,46 @@
+from conan import ConanFile
+import os
+import textwrap
+
+
+class TestPackageConan(ConanFile):
+    python_requires = "tested_reference_str"
+    test_type = "explicit"
+
+    def test(self):
+        proto_graph = self.python_requires["bazel-proto-graph"].module
+        source_folder = os.path.join(self.build_folder, "src")
+        os.makedirs(os.path.join(source_folder, "foo"), exist_ok=True)
+        with open(os.path.join(source_folder, "foo", "BUILD.bazel"), "w") as f:
+            f.write(textwrap.dedent("""\
+                proto_library(
+                    name = "base_proto",
+                    srcs = ["base.proto"],
+                    deps = ["@com_google_protobuf//:any_proto"],
+                )
+
+                proto_library(
+                    name = "foo_proto",
+                    srcs = ["foo.proto"],
+                    deps = [":base_proto"],
+                )
+
+                cc_proto_library(
+                    name = "foo_cc_proto",
+                    deps = [":foo_proto"],
+                )
+            """))
+        for proto in ("base.proto", "foo.proto"):
+            open(os.path.join(source_folder, "foo", proto), "w").close()
+
+        graph = proto_graph.ProtoGraph.load([os.path.join(source_folder, "foo", "BUILD.bazel")], source_folder,
+                                            repositories={"com_google_protobuf": proto_graph.PROTOBUF_TARGET},
+                                            error=self.output.error,
+                                            target_name=lambda label: label[2:].replace("/", "_").replace(":", "_"))
+        graph.validate(source_folder)
+        graph.activate(it.label for it in graph.libraries if it.is_cc)
+        assert sorted(it.label for it in graph.used_libraries) == \
+            ["//foo:base_proto", "//foo:foo_cc_proto", "//foo:foo_proto"], graph.used_libraries
+        foo = next(it for it in graph.libraries if it.label == "//foo:foo_proto")
+        assert graph.cmake_deps(foo) == ["foo_base_proto", proto_graph.PROTOBUF_TARGET], graph.cmake_deps(foo)
+        assert "protobuf_generate(" in graph.cmake_content(foo, "${CMAKE_SOURCE_DIR}")
@@ -14,12 +14,12 @@ from conan.tools.scm import Version
 
 import glob
 from io import StringIO
+import json
 import os
 import re
 import shlex
 import shutil
 import sys
-import yaml
 
 required_conan_version = ">=1.53.0"
 
@@ -154,9 +154,12 @@ class BoostConan(ConanFile):
     short_paths = True
     no_copy_source = True
     _cached_dependencies = None
+    _cached_dependency_closures = None
+    _cached_python_probes = None
 
     def export(self):
         copy(self, f"dependencies/{self._dependency_filename}", src=self.recipe_folder, dst=self.export_folder)
+        copy(self, f"dependencies/{self._dependency_json_filename}", src=self.recipe_folder, dst=self.export_folder)
 
     def export_sources(self):
         export_conandata_patches(self)
@@ -331,41 +334,60 @@ class BoostConan(ConanFile):
     def _dependency_filename(self):
         return f"dependencies-{self.version}.yml"
 
+    @property
+    def _dependency_json_filename(self):
+        # Same content as the yml file, generated by rebuild-dependencies.py: much faster to load
+        return f"dependencies-{self.version}.json"
+
     @property
     def _dependencies(self):
         if self._cached_dependencies is None:
+            json_filepath = os.path.join(self.recipe_folder, "dependencies", self._dependency_json_filename)
+            if os.path.isfile(json_filepath):
+                with open(json_filepath, encoding='utf-8') as f:
+                    self._cached_dependencies = json.load(f)
+                return self._cached_dependencies
+
             dependencies_filepath = os.path.join(self.recipe_folder, "dependencies", self._dependency_filename)
             if not os.path.isfile(dependencies_filepath):
                 raise ConanException(f"Cannot find {dependencies_filepath}")
+            import yaml
             with open(dependencies_filepath, encoding='utf-8') as f:
                 self._cached_dependencies = yaml.safe_load(f)
         return self._cached_dependencies
 
+    @property
+    def _dependency_closures(self):
+        """
+        Transitive closure of the dependencies between boost modules, and its reverse, computed once
+        :return: tuple of dicts {module: frozenset of module and all modules it depends on} and
+                 {module: frozenset of module and all modules depending on it}
+        """
+        if self._cached_dependency_closures is None:
+            graph = self._dependencies["dependencies"]
+            closure = {}
+            for module in graph:
+                visited = {module}
+                pending = [module]
+                while pending:
+                    for dependency in graph.get(pending.pop(), ()):
+                        if dependency not in visited:
+                            visited.add(dependency)
+                            pending.append(dependency)
+                closure[module] = frozenset(visited)
+            reverse_closure = {}
+            for module, dependencies in closure.items():
+                for dependency in dependencies:
+                    reverse_closure.setdefault(dependency, set()).add(module)
+            reverse_closure = {module: frozenset(modules) for module, modules in reverse_closure.items()}
+            self._cached_dependency_closures = closure, reverse_closure
+        return self._cached_dependency_closures
+
     def _all_dependent_modules(self, name):
-        dependencies = {name}
-        while True:
-            new_dependencies = set()
-            for dependency in dependencies:
-                new_dependencies.update(set(self._dependencies["dependencies"][dependency]))
-                new_dependencies.update(dependencies)
-            if len(new_dependencies) > len(dependencies):
-                dependencies = new_dependencies
-            else:
-                break
-        return dependencies
+        return self._dependency_closures[0].get(name, frozenset((name,)))
 
     def _all_super_modules(self, name):
-        dependencies = {name}
-        while True:
-            new_dependencies = set(dependencies)
-            for module in self._dependencies["dependencies"]:
-                if dependencies.intersection(set(self._dependencies["dependencies"][module])):
-                    new_dependencies.add(module)
-            if len(new_dependencies) > len(dependencies):
-                dependencies = new_dependencies
-            else:
-                break
-        return dependencies
+        return self._dependency_closures[1].get(name, frozenset((name,)))
 
     @property
     def _bcp_dir(self):
@@ -864,6 +886,50 @@ class BoostConan(ConanFile):
         output = output.strip()
         return output if output != "None" else None
 
+    # sysconfig paths and variables gathered by _python_probe
+    _python_probe_paths = ("include", "platinclude")
+    _python_probe_vars = ("INCLUDEPY", "INCLUDEDIR", "LIBRARY", "LDLIBRARY", "LIBDIR", "MULTIARCH",
+                          "multiarchsubdir", "WITH_DYLD", "LIBDEST")
+
+    @property
+    def _python_probe(self):
+        """
+        obtain, with a single run of the python interpreter, all the values needed from its sysconfig and distutils
+        :return: dict with the python version, abiflags, sysconfig paths and variables, memoized per python executable
+        """
+        if self._cached_python_probes is None:
+            self._cached_python_probes = {}
+        python_executable = self._python_executable
+        if python_executable not in self._cached_python_probes:
+            # distutils is deprecated and breaks the recipe since Python 3.10: only query it for older versions
+            output = self._run_python_script("from __future__ import print_function; "
+                                             "import json, sys, sysconfig; "
+                                             "du = None; "
+                                             "exec('if sys.version_info < (3, 10):\\n try:\\n  import distutils.sysconfig as du\\n except Exception:\\n  pass'); "
+                                             "s = lambda v: None if v is None else str(v); "
+                                             "print(json.dumps({"
+                                             "'version': '{}.{}'.format(sys.version_info[0], sys.version_info[1]), "
+                                             "'abiflags': getattr(sys, 'abiflags', ''), "
+                                             "'python_inc': s(getattr(sysconfig, 'get_python_inc', lambda: None)()), "
+                                             f"'paths': dict((n, s(sysconfig.get_path(n))) for n in {list(self._python_probe_paths)}), "
+                                             f"'sc_vars': dict((n, s(sysconfig.get_config_var(n))) for n in {list(self._python_probe_vars)}), "
+                                             f"'du_vars': dict((n, s(du.get_config_var(n))) for n in {list(self._python_probe_vars)}) if du else {{}}"
+                                             "}))")
+            try:
+                probe = json.loads(output) if output else {}
+            except ValueError:
+                probe = {}
+            self._cached_python_probes[python_executable] = probe
+        return self._cached_python_probes[python_executable]
+
+    def _python_probe_value(self, section, name):
+        value = self._python_probe.get(section, {}).get(name)
+        if value is None:
+            return None
+        # same normalization as _run_python_script
+        value = value.strip()
+        return value if value != "None" else None
+
     def _get_python_path(self, name):
         """
         obtain path entry for the python installation
@@ -872,6 +938,8 @@ class BoostConan(ConanFile):
         """
         # https://docs.python.org/3/library/sysconfig.html
         # https://docs.python.org/2.7/library/sysconfig.html
+        if name in self._python_probe_paths:
+            return self._python_probe_value("paths", name)
         return self._run_python_script("from __future__ import print_function; "
                                        "import sysconfig; "
                                        f"print(sysconfig.get_path('{name}'))")
@@ -882,6 +950,8 @@ class BoostConan(ConanFile):
         :param name: name of variable to be queried (such as LIBRARY or LDLIBRARY)
         :return: value of python sysconfig variable
         """
+        if name in self._python_probe_vars:
+            return self._python_probe_value("sc_vars", name)
         return self._run_python_script("from __future__ import print_function; "
                                        "import sysconfig; "
                                        f"print(sysconfig.get_config_var('{name}'))")
@@ -893,6 +963,8 @@ class BoostConan(ConanFile):
         :param name: name of variable to be queried (such as LIBRARY or LDLIBRARY)
         :return: value of python sysconfig variable
         """
+        if name in self._python_probe_vars:
+            return self._python_probe_value("du_vars", name)
         return self._run_python_script("from __future__ import print_function; "
                                        "import distutils.sysconfig as du_sysconfig; "
                                        f"print(du_sysconfig.get_config_var('{name}'))")
@@ -918,9 +990,7 @@ class BoostConan(ConanFile):
         obtain version of python interpreter
         :return: python interpreter version, in format major.minor
         """
-        return self._run_python_script("from __future__ import print_function; "
-                                       "import sys; "
-                                       "print('{}.{}'.format(sys.version_info[0], sys.version_info[1]))")
+        return self._python_probe.get("version")
 
     @property
     def _python_version(self):
@@ -935,9 +1005,7 @@ class BoostConan(ConanFile):
         obtain the result of the "sysconfig.get_python_inc()" call
         :return: result of the "sysconfig.get_python_inc()" execution
         """
-        return self._run_python_script("from __future__ import print_function; "
-                                       "import sysconfig; "
-                                       "print(sysconfig.get_python_inc())")
+        return self._python_probe.get("python_inc")
 
     @property
     def _python_abiflags(self):
@@ -945,9 +1013,7 @@ class BoostConan(ConanFile):
         obtain python ABI flags, see https://www.python.org/dev/peps/pep-3149/ for the details
         :return: the value of python ABI flags
         """
-        return self._run_python_script("from __future__ import print_function; "
-                                       "import sys; "
-                                       "print(getattr(sys, 'abiflags', ''))")
+        return self._python_probe.get("abiflags")
 
     @property
     def _python_includes(self):
@@ -2,6 +2,7 @@
 
 import argparse
 import dataclasses
+import hashlib
 import json
 import logging
 import pprint
@@ -105,31 +106,39 @@ class BoostDependencies(object):
 
 
 class BoostDependencyBuilder(object):
-    def __init__(self, boost_version: str, boostdep_version: str, tmppath: Path, git_url: str, outputdir: Path, unsafe: bool):
+    def __init__(self, boost_version: str, boostdep_version: str, tmppath: Path, git_url: str, outputdir: Path, unsafe: bool,
+                 worktree: bool = False):
         self.boost_version = boost_version
         self.boostdep_version = boostdep_version
         self.git_url = git_url
         self.tmppath = tmppath
         self.outputdir = outputdir
         self.unsafe = unsafe
+        self.worktree = worktree
         self._boostdep = None
 
     @property
-    def boost_path(self) -> Path:
+    def shared_path(self) -> Path:
         return self.tmppath / "boost"
 
+    @property
+    def boost_path(self) -> Path:
+        if self.worktree:
+            return self.tmppath / "boost-worktrees" / self.boost_version
+        return self.shared_path
+
     def do_git_update(self) -> None:
-        if not self.boost_path.exists():
+        if not self.shared_path.exists():
             with chdir(self, self.tmppath):
                 print("Cloning boost git")
                 subprocess.check_call(["git", "clone", "--", self.git_url, "boost"])
-            with chdir(self, self.boost_path):
+            with chdir(self, self.shared_path):
                 print("Checking out current master")
                 subprocess.check_call(["git", "checkout", "origin/master"])
                 print("Removing master branch")
                 subprocess.check_call(["git", "branch", "-D", "master"])
         else:
-            with chdir(self, self.boost_path):
+            with chdir(self, self.shared_path):
                 print("Updating git repo")
                 subprocess.check_call(["git", "fetch", "origin"])
                 print("Removing all local changes to git repo")
@@ -157,6 +166,43 @@ class BoostDependencyBuilder(object):
             print("Removing unknown files/directories")
             subprocess.check_call(["git", "clean", "-d", "-f"])
 
+    def do_git_fetch_submodules(self) -> None:
+        """Clone all submodules in the shared clone and fetch their tags, so worktrees of any version can be created offline"""
+        with chdir(self, self.shared_path):
+            print("Fetching tags")
+            subprocess.check_call(["git", "fetch", "--tags", "origin"])
+            print("Init git submodules")
+            subprocess.check_call(["git", "submodule", "update", "--init"])
+            print("Fetching tags of git submodules")
+            subprocess.check_call(["git", "submodule", "foreach", "--quiet", "git fetch --quiet --tags origin"])
+
+    def do_git_worktree(self) -> None:
+        """Create a worktree of the shared clone (and of its submodules) for this boost version"""
+        tag = f"boost-{self.boost_version}"
+        print(f"Creating worktree for version {self.boost_version}")
+        with chdir(self, self.shared_path):
+            subprocess.check_call(["git", "worktree", "prune"])
+            if self.boost_path.exists():
+                subprocess.check_call(["git", "worktree", "remove", "--force", str(self.boost_path)])
+            subprocess.check_call(["git", "worktree", "add", "--force", "--detach", str(self.boost_path), tag])
+
+        with chdir(self, self.boost_path):
+            tree = subprocess.check_output(["git", "ls-tree", "-r", "HEAD"], text=True)
+        for line in tree.splitlines():
+            info, path = line.split("\t", 1)
+            mode, _, commit = info.split()
+            if mode != "160000":
+                continue
+            shared_submodule = self.shared_path / path
+            if (shared_submodule / ".git").exists():
+                with chdir(self, shared_submodule):
+                    subprocess.check_call(["git", "worktree", "prune"])
+                    subprocess.check_call(["git", "worktree", "add", "--force", "--detach", "--quiet", str(self.boost_path / path), commit])
+            else:
+                # Submodule not available in the shared clone (e.g. removed library): clone it
+                with chdir(self, self.boost_path):
+                    subprocess.check_call(["git", "submodule", "update", "--init", "--", path])
+
     def do_install_boostdep(self):
         with chdir(self, self.boost_path):
             print(f"Installing boostdep/{self.boostdep_version}")
@@ -391,6 +437,10 @@ class BoostDependencyBuilder(object):
     def _outputpath(self) -> Path:
         return self.outputdir / f"dependencies-{self.boost_version}.yml"
 
+    @property
+    def _json_outputpath(self) -> Path:
+        return self.outputdir / f"dependencies-{self.boost_version}.json"
+
     @classmethod
     def _sort_item(cls, item):
         if isinstance(item, dict):
@@ -421,6 +471,126 @@ class BoostDependencyBuilder(object):
         print(f"Creating {self.outputdir}")
         with self._outputpath.open("w") as fout:
             yaml.dump(data, fout)
+        write_json_dependency_file(data, self._json_outputpath)
+
+
+class DependencyStamps(object):
+    """Record of the inputs used to generate every dependency file, to skip the versions which are up to date.
+
+    A version is up to date when its yml and json files are unchanged since they were generated, with the
+    same boostdep version and the same sources of this script.
+    """
+
+    def __init__(self, path: Path, boostdep_version: str, unsafe: bool):
+        self.path = path
+        self.inputs_hash = hashlib.sha256(Path(__file__).read_bytes() + f"{boostdep_version}:{unsafe}".encode()).hexdigest()
+        try:
+            self.stamps = json.loads(path.read_text())
+        except (OSError, ValueError):
+            self.stamps = {}
+
+    @staticmethod
+    def _outputs_hash(builder: BoostDependencyBuilder) -> str:
+        digest = hashlib.sha256()
+        for output in (builder._outputpath, builder._json_outputpath):
+            if not output.is_file():
+                return ""
+            digest.update(output.read_bytes())
+        return digest.hexdigest()
+
+    def is_up_to_date(self, builder: BoostDependencyBuilder) -> bool:
+        stamp = self.stamps.get(builder.boost_version)
+        return stamp == {"inputs": self.inputs_hash, "outputs": self._outputs_hash(builder)}
+
+    def update(self, builder: BoostDependencyBuilder) -> None:
+        self.stamps[builder.boost_version] = {"inputs": self.inputs_hash, "outputs": self._outputs_hash(builder)}
+        self.path.write_text(json.dumps(self.stamps, indent=2, sort_keys=True))
+
+
+def _create_dependency_file(builder: BoostDependencyBuilder) -> str:
+    builder.do_create_dependency_file()
+    return builder.boost_version
+
+
+def rebuild_in_parallel(builders: List[BoostDependencyBuilder], jobs: int, force: bool) -> int:
+    """Regenerate the dependency files of many boost versions at once.
+
+    Every version is checked out in its own worktree of the shared clone, then boostdep and the Jamfile scans
+    run for all versions in a process pool. Versions whose files are up to date are skipped, unless 'force'.
+    """
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    stamps = DependencyStamps(builders[0].tmppath / "boost-dependencies-stamps.json",
+                              builders[0].boostdep_version, builders[0].unsafe)
+    if not force:
+        for builder in builders:
+            if stamps.is_up_to_date(builder):
+                print(f"Skipping {builder.boost_version}: dependency files are up to date")
+        builders = [builder for builder in builders if not stamps.is_up_to_date(builder)]
+    if not builders:
+        return 0
+
+    builders[0].do_git_fetch_submodules()
+    for builder in builders:
+        builder.do_git_worktree()
+
+    builders[0].do_install_boostdep()
+    for builder in builders[1:]:
+        builder._boostdep = builders[0]._boostdep
+
+    result = 0
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = {executor.submit(_create_dependency_file, builder): builder for builder in builders}
+        for future in as_completed(futures):
+            builder = futures[future]
+            try:
+                future.result()
+            except Exception as e:
+                log.error("Failed to create the dependency file of %s: %s", builder.boost_version, e)
+                result = 1
+                continue
+            print(f"Finished {builder.boost_version}")
+            stamps.update(builder)
+    return result
+
+
+def write_json_dependency_file(data: Dict, path: Path) -> None:
+    """Write the compact json twin of a dependencies yml file, which is loaded by the recipe"""
+    with path.open("w") as fout:
+        json.dump(data, fout, sort_keys=True, separators=(",", ":"))
+        fout.write("\n")
+
+
+def convert_dependency_files(outputdir: Path) -> None:
+    """(Re)generate the json file of every dependencies yml file in outputdir"""
+    for yml_path in sorted(outputdir.glob("dependencies-*.yml")):
+        with yml_path.open() as fin:
+            data = yaml.safe_load(fin)
+        print(f"Converting {yml_path}")
+        write_json_dependency_file(data, yml_path.with_suffix(".json"))
+
+
+def check_dependency_files(outputdir: Path) -> int:
+    """Check that every dependencies yml file in outputdir has a json file holding the same data (the
+    recipe loads the json file: a hand edit of the yml file alone would be ignored)"""
+    result = 0
+    yml_paths = sorted(outputdir.glob("dependencies-*.yml"))
+    for yml_path in yml_paths:
+        json_path = yml_path.with_suffix(".json")
+        with yml_path.open() as fin:
+            data = yaml.safe_load(fin)
+        if not json_path.is_file():
+            log.error(f"{json_path} is missing: run this script with -J")
+            result = 1
+            continue
+        with json_path.open() as fin:
+            if json.load(fin) != data:
+                log.error(f"{json_path} does not hold the data of {yml_path}: run this script with -J")
+                result = 1
+    for json_path in sorted(set(outputdir.glob("dependencies-*.json")) - {it.with_suffix(".json") for it in yml_paths}):
+        log.error(f"{json_path} has no yml file")
+        result = 1
+    return result
 
 
 def main(args=None) -> int:
@@ -436,6 +606,12 @@ def main(args=None) -> int:
     version_group = parser.add_mutually_exclusive_group(required=True)
     version_group.add_argument("-v", dest="boost_version", help="boost version")
     version_group.add_argument("-A", dest="boost_version", action="store_const", const=None, help="All boost versions")
+    version_group.add_argument("-J", dest="convert_only", action="store_true", help="only regenerate the json files from the existing yml files")
+    version_group.add_argument("-C", dest="check_only", action="store_true", help="only check that the json files hold the data of the yml files")
+    parser.add_argument("-j", dest="jobs", default=None, type=int,
+                        help="process the boost versions in parallel, in worktrees of the boost git clone, with this number of processes. "
+                             "Versions whose dependency files are up to date are skipped")
+    parser.add_argument("-f", dest="force", action="store_true", help="with -j, also process the versions which are up to date")
     ns = parser.parse_args(args)
 
     logging.basicConfig(format="[%(levelname)s] %(message)s")
@@ -451,6 +627,12 @@ def main(args=None) -> int:
 
     ns.outputdir.mkdir(exist_ok=True)
 
+    if ns.convert_only:
+        convert_dependency_files(ns.outputdir)
+        return 0
+    if ns.check_only:
+        return check_dependency_files(ns.outputdir)
+
     git_update_done = False
 
     if ns.boost_version is None:
@@ -459,6 +641,23 @@ def main(args=None) -> int:
     else:
         boost_versions = [ns.boost_version]
 
+    if ns.jobs:
+        builders = [BoostDependencyBuilder(
+            boost_version=boost_version,
+            boostdep_version=ns.boostdep_version,
+            git_url=ns.git_url,
+            outputdir=ns.outputdir,
+            tmppath=ns.tmppath,
+            unsafe=ns.unsafe,
+            worktree=True,
+        ) for boost_version in boost_versions]
+        if ns.git_update:
+            builders[0].do_git_update()
+        elif not builders[0].shared_path.exists():
+            log.error("Boost directory does not exist. Re-execute this script with -U to run 'git update'.")
+            return 1
+        return rebuild_in_parallel(builders, jobs=ns.jobs, force=ns.force)
+
     for boost_version in boost_versions:
         print(f"Starting {boost_version}")
         boost_collector = BoostDependencyBuilder(
@@ -0,0 +1,272 @@
+"""
+Model the components of a package from the CMake export files (<Name>Targets.cmake) installed by
+the project, instead of maintaining them by hand in the recipe.
+
+Usage, in a recipe:
+
+    python_requires = "cmake-components/1.0"
+
+    def package(self):
+        ...
+        cmake_components = self.python_requires["cmake-components"].module
+        targets = cmake_components.parse_targets_file(os.path.join(cmake_folder, "fooTargets.cmake"))
+        manifest = cmake_components.build_manifest(targets, namespace="foo::")
+        cmake_components.save_manifest(os.path.join(self.package_folder, "lib", "components.json"), manifest)
+
+    def package_info(self):
+        cmake_components = self.python_requires["cmake-components"].module
+        manifest = cmake_components.load_manifest(os.path.join(self.package_folder, "lib", "components.json"))
+        for name, entry in manifest.items():
+            cmake_components.fill_component(self.cpp_info.components[name], entry)
+
+The export files are read once, at package() time: package_info() only loads the manifest, which
+is cached per process (it is loaded for each node of a graph depending on the package).
+"""
+
+import json
+import os
+import re
+
+from conan import ConanFile
+
+required_conan_version = ">=1.53.0"
+
+MANIFEST_FIELDS = ("libs", "requires", "system_libs", "frameworks", "defines")
+
+_TOKEN = re.compile(r"""
+      (?P<space>\s+)
+    | (?P<bracket_comment>\#\[(?P<comment_level>=*)\[.*?\](?P=comment_level)\])
+    | (?P<comment>\#[^\n]*)
+    | (?P<bracket>\[(?P<bracket_level>=*)\[.*?\](?P=bracket_level)\])
+    | (?P<quoted>"(?:[^"\\]|\\.)*")
+    | (?P<open>\()
+    | (?P<close>\))
+    | (?P<unquoted>(?:[^\s()\#"\\]|\\.)+)
+""", re.VERBOSE | re.DOTALL)
+_IDENTIFIER = re.compile(r"[A-Za-z_][A-Za-z0-9_]*$")
+_ESCAPE = re.compile(r"\\(?:\n|(.))", re.DOTALL)
+_ESCAPES = {"t": "\t", "n": "\n", "r": "\r", ";": "\\;"}
+_LIBRARY_TYPES = ("STATIC", "SHARED", "MODULE")
+
+_manifests = {}
+
+
+class CMakeComponentsConan(ConanFile):
+    name = "cmake-components"
+    description = "Helpers for recipes modelling their components from the CMake export files of the project"
+    license = "MIT"
+    url = "https://github.com/conan-io/conan-center-index"
+    homepage = "https://github.com/conan-io/conan-center-index"
+    topics = ("cmake", "components", "python-requires")
+    package_type = "python-require"
+
+
+def _unescape(text):
+    return _ESCAPE.sub(lambda match: _ESCAPES.get(match.group(1), match.group(1) or ""), text)
+
+
+def tokenize(content):
+    """Returns the command invocations of a CMake script as a list of (command, arguments).
+
+    Commands are lower-cased, quoted and bracket arguments are unquoted and the escape sequences of
+    quoted and unquoted arguments are evaluated. Variable references and generator expressions are
+    kept as they are, and parentheses nested in the arguments are kept as arguments.
+    """
+    commands = []
+    command = None
+    arguments = None
+    depth = 0
+    position = 0
+    while position < len(content):
+        token = _TOKEN.match(content, position)
+        if token is None:
+            line = content.count("\n", 0, position) + 1
+            raise ValueError(f"Unexpected character {content[position]!r} at line {line}")
+        position = token.end()
+        kind = token.lastgroup
+        value = token.group(kind)
+        if kind in ("space", "bracket_comment", "comment"):
+            continue
+        if arguments is None:
+            if command is None and kind == "unquoted" and _IDENTIFIER.match(value):
+                command = value.lower()
+            elif command is not None and kind == "open":
+                arguments = []
+            else:
+                line = content.count("\n", 0, token.start()) + 1
+                raise ValueError(f"Unexpected {value!r} at line {line}")
+        elif kind == "close" and depth == 0:
+            commands.append((command, arguments))
+            command = arguments = None
+        else:
+            if kind == "open":
+                depth += 1
+            elif kind == "close":
+                depth -= 1
+            elif kind == "bracket":
+                level = len(token.group("bracket_level"))
+                value = value[level + 2:-level - 2]
+                if value.startswith("\n"):
+                    value = value[1:]
+            elif kind == "quoted":
+                value = _unescape(value[1:-1])
+            else:
+                value = _unescape(value)
+            arguments.append(value)
+    if command is not None:
+        raise ValueError(f"Unterminated call to {command}()")
+    return commands
+
+
+def split_list(value):
+    """Splits a CMake list, keeping the generator expressions (and escaped ';') in one item"""
+    items = []
+    start = 0
+    depth = 0
+    index = 0
+    while index < len(value):
+        if value.startswith("$<", index):
+            depth += 1
+            index += 2
+            continue
+        char = value[index]
+        if char == ">" and depth:
+            depth -= 1
+        elif char == ";" and not depth and (index == 0 or value[index - 1] != "\\"):
+            items.append(value[start:index])
+            start = index + 1
+        index += 1
+    items.append(value[start:])
+    return [it.replace("\\;", ";") for it in items if it]
+
+
+class CMakeTarget:
+    __slots__ = ("name", "type", "properties")
+
+    def __init__(self, name, type):
+        self.name = name
+        self.type = type
+        self.properties = {}
+
+    @property
+    def is_library(self):
+        return self.type in _LIBRARY_TYPES
+
+
+def parse_targets(content):
+    """Returns the imported targets declared in a CMake export file, indexed by name, with the
+    properties it sets on them"""
+    targets = {}
+    for command, arguments in tokenize(content):
+        if command == "add_library" and "IMPORTED" in arguments[1:]:
+            targets[arguments[0]] = CMakeTarget(arguments[0], arguments[1])
+        elif command == "add_executable" and "IMPORTED" in arguments[1:]:
+            targets[arguments[0]] = CMakeTarget(arguments[0], "EXECUTABLE")
+        elif command == "set_target_properties" and "PROPERTIES" in arguments:
+            index = arguments.index("PROPERTIES")
+            properties = dict(zip(arguments[index + 1::2], arguments[index + 2::2]))
+            for name in arguments[:index]:
+                if name in targets:
+                    targets[name].properties.update(properties)
+        elif command == "set_property" and arguments[:1] == ["TARGET"] and "PROPERTY" in arguments:
+            index = arguments.index("PROPERTY")
+            append = "APPEND" in arguments[1:index] or "APPEND_STRING" in arguments[1:index]
+            separator = ";" if "APPEND" in arguments[1:index] else ""
+            name, values = arguments[index + 1], ";".join(arguments[index + 2:])
+            for target in (it for it in arguments[1:index] if it in targets):
+                previous = targets[target].properties.get(name) if append else None
+                targets[target].properties[name] = separator.join([previous, values]) if previous else values
+    return targets
+
+
+def parse_targets_file(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return parse_targets(f.read())
+
+
+def strip_link_only(item):
+    """'$<LINK_ONLY:foo>' -> 'foo'"""
+    while item.startswith("$<LINK_ONLY:") and item.endswith(">"):
+        item = item[len("$<LINK_ONLY:"):-1]
+    return item
+
+
+def default_link_item(item, namespace, component_name):
+    """Classifies an item of INTERFACE_LINK_LIBRARIES: targets of the package, '-l<lib>' and
+    '-framework <framework>' flags. Anything else (other imported targets, generator expressions,
+    paths) is dropped"""
+    item = strip_link_only(item)
+    if namespace and item.startswith(namespace):
+        return [("requires", component_name(item[len(namespace):]))]
+    if item.startswith("-l"):
+        return [("system_libs", item[2:])]
+    if item.startswith("-framework "):
+        return [("frameworks", item[len("-framework "):].strip())]
+    return []
+
+
+def default_define(definition):
+    return [] if definition.startswith("$<") else [definition]
+
+
+def build_manifest(targets, namespace="", component_name=None, library_name=None, link_item=None, define=None):
+    """Normalized components of the package, from the targets returned by parse_targets().
+
+    component_name(target) gives the name of the component of a target (without namespace), and
+    library_name(target) the name of its library (the component name by default).
+    link_item(item) returns the (field, value) pairs of a component for an item of its
+    INTERFACE_LINK_LIBRARIES and define(definition) the defines for an item of its
+    INTERFACE_COMPILE_DEFINITIONS.
+    """
+    component_name = component_name or (lambda target: target)
+    library_name = library_name or component_name
+    link_item = link_item or (lambda item: default_link_item(item, namespace, component_name))
+    define = define or default_define
+
+    manifest = {}
+    for target in targets.values():
+        if namespace and not target.name.startswith(namespace):
+            continue
+        short_name = target.name[len(namespace):]
+        fields = {field: [] for field in MANIFEST_FIELDS}
+        if target.is_library:
+            fields["libs"].append(library_name(short_name))
+        for item in split_list(target.properties.get("INTERFACE_LINK_LIBRARIES", "")):
+            for field, value in link_item(item):
+                if value not in fields[field]:
+                    fields[field].append(value)
+        for item in split_list(target.properties.get("INTERFACE_COMPILE_DEFINITIONS", "")):
+            for value in define(item):
+                if value not in fields["defines"]:
+                    fields["defines"].append(value)
+        manifest[component_name(short_name)] = dict(cmake_target=target.name, **fields)
+    return manifest
+
+
+def save_manifest(path, manifest):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1)
+        f.write("\n")
+
+
+def load_manifest(path):
+    """Manifest written by save_manifest(), cached by path (and size and modification time, in case
+    the package is rebuilt in the same process). The returned manifest must not be modified"""
+    stat = os.stat(path)
+    key = (stat.st_size, stat.st_mtime_ns)
+    cached = _manifests.get(path)
+    if cached is None or cached[0] != key:
+        with open(path, "r", encoding="utf-8") as f:
+            cached = _manifests[path] = (key, json.load(f))
+    return cached[1]
+
+
+def fill_component(component, entry):
+    """Set the fields of a component of cpp_info from an entry of the manifest"""
+    component.set_property("cmake_target_name", entry["cmake_target"])
+    component.libs = list(entry["libs"])
+    component.requires = list(entry["requires"])
+    component.system_libs = list(entry["system_libs"])
+    component.frameworks = list(entry["frameworks"])
+    component.defines = list(entry["defines"])
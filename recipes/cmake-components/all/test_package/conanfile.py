@@ -0,0 +1,36 @@
+from conan import ConanFile
+import os
+import textwrap
+
+
+class TestPackageConan(ConanFile):
+    python_requires = "tested_reference_str"
+    test_type = "explicit"
+
+    def test(self):
+        cmake_components = self.python_requires["cmake-components"].module
+        targets = cmake_components.parse_targets(textwrap.dedent("""\
+            # Create imported target foo::base
+            add_library(foo::base STATIC IMPORTED)
+
+            set_target_properties(foo::base PROPERTIES
+              INTERFACE_COMPILE_DEFINITIONS "FOO_STATIC;\\$<\\$<PLATFORM_ID:AIX>:_LINUX_SOURCE_COMPAT>"
+              INTERFACE_INCLUDE_DIRECTORIES "${_IMPORT_PREFIX}/include"
+              INTERFACE_LINK_LIBRARIES "Threads::Threads;\\$<LINK_ONLY:-lm>;-framework CoreFoundation"
+            )
+
+            add_library(foo::strings INTERFACE IMPORTED)
+            set_property(TARGET foo::strings APPEND PROPERTY INTERFACE_LINK_LIBRARIES [[foo::base]])
+        """))
+        manifest = cmake_components.build_manifest(targets, namespace="foo::",
+                                                   component_name=lambda target: f"foo_{target}")
+        assert manifest["foo_base"]["libs"] == ["foo_base"], manifest
+        assert manifest["foo_base"]["defines"] == ["FOO_STATIC"], manifest
+        assert manifest["foo_base"]["system_libs"] == ["m"], manifest
+        assert manifest["foo_base"]["frameworks"] == ["CoreFoundation"], manifest
+        assert manifest["foo_strings"]["libs"] == [], manifest
+        assert manifest["foo_strings"]["requires"] == ["foo_base"], manifest
+
+        manifest_path = os.path.join(self.build_folder, "components.json")
+        cmake_components.save_manifest(manifest_path, manifest)
+        assert cmake_components.load_manifest(manifest_path) == manifest
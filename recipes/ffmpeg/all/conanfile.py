@@ -13,6 +13,7 @@ from conan.tools.microsoft import check_min_vs, is_msvc, unix_path
 from conan.tools.scm import Version
 import os
 import glob
+import json
 import shutil
 import re
 
@@ -747,27 +748,43 @@ class FFMpegConan(ConanFile):
                 with chdir(self, os.path.join(self.package_folder, "lib")):
                     for lib in glob.glob("*.a"):
                         rename(self, lib, lib[3:-2] + ".lib")
+        save(self, os.path.join(self.package_folder, self._COMPONENT_VERSIONS_FILE),
+             json.dumps(self._scan_component_versions(), indent=2, sort_keys=True))
 
-    def _read_component_version(self, component_name):
+    _COMPONENT_VERSIONS_FILE = os.path.join("res", "conan-component-versions.json")
+    _COMPONENT_VERSION_PATTERN = re.compile(r"define LIB(\w+?)_VERSION_(MAJOR|MINOR|MICRO)[ \t]+(\d+)")
+
+    def _scan_component_versions(self):
         # since 5.1, major version may be defined in version_major.h instead of version.h
-        component_folder = os.path.join(self.package_folder, "include", f"lib{component_name}")
-        version_file_name = os.path.join(component_folder, "version.h")
-        version_major_file_name = os.path.join(component_folder, "version_major.h")
-        pattern = f"define LIB{component_name.upper()}_VERSION_(MAJOR|MINOR|MICRO)[ \t]+(\\d+)"
-        version = dict()
-        for file in (version_file_name, version_major_file_name):
-            if os.path.isfile(file):
-                with open(file, "r", encoding="utf-8") as f:
-                    for line in f:
-                        match = re.search(pattern, line)
-                        if match:
-                            version[match[1]] = match[2]
-        if "MAJOR" in version and "MINOR" in version and "MICRO" in version:
-            return f"{version['MAJOR']}.{version['MINOR']}.{version['MICRO']}"
-        return None
+        versions = dict()
+        for component_folder in glob.glob(os.path.join(self.package_folder, "include", "lib*")):
+            component_name = os.path.basename(component_folder)[3:]
+            version = dict()
+            for file_name in ("version.h", "version_major.h"):
+                file = os.path.join(component_folder, file_name)
+                if os.path.isfile(file):
+                    for name, part, value in self._COMPONENT_VERSION_PATTERN.findall(load(self, file)):
+                        if name == component_name.upper():
+                            version[part] = value
+            if "MAJOR" in version and "MINOR" in version and "MICRO" in version:
+                versions[component_name] = f"{version['MAJOR']}.{version['MINOR']}.{version['MICRO']}"
+        return versions
+
+    _cached_component_versions = None
+
+    @property
+    def _component_versions(self):
+        # Written by package(), packages created by former revisions of the recipe don't have it
+        if self._cached_component_versions is None:
+            manifest = os.path.join(self.package_folder, self._COMPONENT_VERSIONS_FILE)
+            if os.path.isfile(manifest):
+                self._cached_component_versions = json.loads(load(self, manifest))
+            else:
+                self._cached_component_versions = self._scan_component_versions()
+        return self._cached_component_versions
 
     def _set_component_version(self, component_name):
-        version = self._read_component_version(component_name)
+        version = self._component_versions.get(component_name)
         if version is not None:
             self.cpp_info.components[component_name].set_property("component_version", version)
             # TODO: to remove once support of conan v1 dropped
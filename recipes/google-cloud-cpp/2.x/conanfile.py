@@ -1,3 +1,4 @@
+import json
 import os
 
 from conan import ConanFile
@@ -19,9 +20,10 @@ from conan.errors import ConanInvalidConfiguration
 # script will be used to generate a new file with the component dependency
 # information. The expectation is that maintaining this script will be easier
 # than writing long lists of dependencies by hand.
-import components_2_15_1
-import components_2_19_0
-import components_2_28_0
+#
+# Each `components_<version>.json` file only records the changes from the
+# tables of a previous version (its `base`), and only the files needed for the
+# version being evaluated are loaded.
 
 required_conan_version = ">=1.56.0"
 
@@ -45,28 +47,48 @@ class GoogleCloudCppConan(ConanFile):
     settings = "os", "arch", "compiler", "build_type"
     options = {"shared": [True, False], "fPIC": [True, False]}
     default_options = {"shared": False, "fPIC": True}
-    exports = ["components_2_15_1.py",
-               "components_2_19_0.py",
-               "components_2_28_0.py",
-               ]
+    exports = ["components_*.json"]
 
     short_paths = True
 
-    _GA_COMPONENTS = {
-        '2.15.1': components_2_15_1.COMPONENTS,
-        '2.19.0': components_2_19_0.COMPONENTS,
-        '2.28.0': components_2_28_0.COMPONENTS,
-    }
-    _PROTO_COMPONENTS = {
-        '2.15.1': components_2_15_1.PROTO_COMPONENTS,
-        '2.19.0': components_2_19_0.PROTO_COMPONENTS,
-        '2.28.0': components_2_28_0.PROTO_COMPONENTS,
-    }
-    _PROTO_COMPONENT_DEPENDENCIES = {
-        "2.15.1": components_2_15_1.DEPENDENCIES,
-        "2.19.0": components_2_19_0.DEPENDENCIES,
-        "2.28.0": components_2_28_0.DEPENDENCIES,
-    }
+    # Cache of the tables loaded from components_<version>.json files, shared by all instances
+    _cached_component_tables = {}
+
+    def _component_tables_filename(self, version):
+        return os.path.join(self.recipe_folder, f"components_{str(version).replace('.', '_')}.json")
+
+    def _load_component_tables(self, version):
+        filename = self._component_tables_filename(version)
+        tables = self._cached_component_tables.get(filename)
+        if tables is None:
+            with open(filename, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("base"):
+                base = self._load_component_tables(data["base"])
+                dependencies = dict(base["dependencies"])
+                proto_components = set(base["proto_components"])
+                components = set(base["components"])
+            else:
+                dependencies, proto_components, components = {}, set(), set()
+            for component in data["dependencies"]["removed"]:
+                del dependencies[component]
+            dependencies.update(data["dependencies"]["changed"])
+            proto_components.difference_update(data["proto_components"]["removed"])
+            proto_components.update(data["proto_components"]["added"])
+            components.difference_update(data["components"]["removed"])
+            components.update(data["components"]["added"])
+            tables = {
+                "dependencies": dependencies,
+                "proto_components": frozenset(proto_components),
+                "components": frozenset(components),
+            }
+            self._cached_component_tables[filename] = tables
+        return tables
+
+    @property
+    def _component_tables(self):
+        return self._load_component_tables(self.version)
+
     # Some components require custom dependency definitions.
     _REQUIRES_CUSTOM_DEPENDENCIES = {
         "bigquery", "bigtable", "iam", "oauth2", "pubsub", "spanner", "storage",
@@ -103,20 +125,9 @@ class GoogleCloudCppConan(ConanFile):
                 "Recipe not prepared for cross-building (yet)"
             )
 
-        if str(self.version) not in self._GA_COMPONENTS:
-            print(f"{type(self.version)} {self.version}")
-            raise ConanInvalidConfiguration(
-                f"The components are unknown for version {self.version}. Expected one of {self._GA_COMPONENTS.keys()}"
-            )
-
-        if str(self.version) not in self._PROTO_COMPONENTS:
-            raise ConanInvalidConfiguration(
-                f"The proto components are unknown for version {self.version}. Expected one of {self._PROTO_COMPONENTS.keys()}"
-            )
-
-        if str(self.version) not in self._PROTO_COMPONENT_DEPENDENCIES:
+        if not os.path.isfile(self._component_tables_filename(self.version)):
             raise ConanInvalidConfiguration(
-                f"The inter-component components are unknown for version {self.version}. Expected one of {self._PROTO_COMPONENT_DEPENDENCIES.keys()}"
+                f"The components are unknown for version {self.version}. Expected a {os.path.basename(self._component_tables_filename(self.version))} file"
             )
 
         if (
@@ -198,8 +209,7 @@ class GoogleCloudCppConan(ConanFile):
         cmake.build()
 
     def _generate_proto_requires(self, component):
-        deps = self._PROTO_COMPONENT_DEPENDENCIES.get(self.version, dict())
-        return deps.get(component, [])
+        return self._component_tables["dependencies"].get(component, [])
 
     _SKIPPED_COMPONENTS = {
         # Some protos do not compile due to inconvenient system macros clashing
@@ -213,7 +223,7 @@ class GoogleCloudCppConan(ConanFile):
     }
 
     def _components(self):
-        result = self._GA_COMPONENTS.get(str(self.version), []).copy()
+        result = set(self._component_tables["components"])
         for c in self._SKIPPED_COMPONENTS:
             result.remove(c)
         # TODO - these do not build on Android due to conflicts between OS
@@ -226,7 +236,7 @@ class GoogleCloudCppConan(ConanFile):
         return result
 
     def _proto_components(self):
-        result = self._PROTO_COMPONENTS.get(self.version, []).copy()
+        result = set(self._component_tables["proto_components"])
         for c in self._SKIPPED_COMPONENTS:
             result.remove(c + '_protos')
         # TODO - these do not build on Android due to conflicts between OS
@@ -237,7 +247,7 @@ class GoogleCloudCppConan(ConanFile):
         if Version(self.version) <= '2.19.0':
             # Handling of these proto libraries was simplified in the 2.28.0
             # `conanfile.py`. We prefer not to regenerate the old
-            # `components_*.py` files, so we manually skip the protos in here.
+            # `components_*.json` files, so we manually skip the protos in here.
             result.remove('logging_type_type_protos')
             result.remove('devtools_source_v1_source_context_protos')
         if self.settings.os == "Windows" and Version(self.version) >= '2.28.0':
@@ -2,7 +2,9 @@
 
 import argparse
 import glob
+import json
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 """Extract google-cloud-cpp's component dependency info for use in Conan.
 
@@ -229,24 +231,12 @@ def _generate_proto_requires(depfile):
     return list(_PROTO_DEPS_COMMON_REQUIRES) + requires
 
 
-def main():
-    """Generate a python file representing the google-cloud-cpp proto deps."""
-    parser = argparse.ArgumentParser(description=(__doc__))
-    parser.add_argument(
-        "-s",
-        "--source-folder",
-        help="a directory where `google-cloud-cpp` source has been extracted",
-    )
-    args = parser.parse_args()
-    source_folder = vars(args)["source_folder"]
+def _proto_tables(source_folder, jobs=None):
+    """Compute the proto components and their dependencies from the *.deps files."""
     deps_folder = os.path.join(source_folder, "external", "googleapis", "protodeps")
-    print("# Automatically generated by %s DO NOT EDIT" % __file__)
-    print("DEPENDENCIES = {")
-    proto_components = _PROTO_BASE_COMPONENTS.copy()
-    files = sorted(glob.glob(os.path.join(deps_folder, "*.deps")))
     experimental = set(_experimental_components(source_folder))
-    components = set(_components(source_folder))
-    for filename in files:
+    selected = []
+    for filename in sorted(glob.glob(os.path.join(deps_folder, "*.deps"))):
         component = os.path.basename(filename).replace(".deps", "")
         component = _PROTO_DEPS_REPLACED_NAMES.get(component, component)
         if component in experimental or component in _PROTO_DEPS_UNUSED:
@@ -257,28 +247,97 @@ def main():
         if component == "compute":
             # `compute` does not use gRPC or the `*.deps` files.
             continue
-        component = component + "_protos"
-        deps = _generate_proto_requires(filename)
-        proto_components.add(component)
-        proto_components.update(deps)
-        print(f'    "{component}": {sorted(deps)},')
+        selected.append((component + "_protos", filename))
+
+    # There are hundreds of *.deps files, read them concurrently
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        requires = executor.map(_generate_proto_requires, [filename for _, filename in selected])
+        dependencies = {component: sorted(deps) for (component, _), deps in zip(selected, requires)}
     for component in sorted(_HARD_CODED_DEPENDENCIES.keys()):
-        deps = _HARD_CODED_DEPENDENCIES[component]
+        dependencies[component] = sorted(_HARD_CODED_DEPENDENCIES[component])
+    dependencies["cloud_extended_operations_protos"] = ["protobuf::libprotobuf"]
+    dependencies["compute_protos"] = ["cloud_extended_operations_protos", "protobuf::libprotobuf"]
+
+    proto_components = _PROTO_BASE_COMPONENTS.copy()
+    for component, deps in dependencies.items():
         proto_components.add(component)
         proto_components.update(deps)
-        print(f'    "{component}": {sorted(deps)},')
-    print(f'    "cloud_extended_operations_protos": ["protobuf::libprotobuf"],')
-    print(f'    "compute_protos": ["cloud_extended_operations_protos", "protobuf::libprotobuf"],')
-    proto_components.add("cloud_extended_operations_protos")
-    proto_components.add("compute_protos")
-    print("}")
-    proto_components = proto_components - _PROTO_DEPS_COMMON_REQUIRES
-    names = ['"%s"' % c for c in proto_components]
-    joined = ",\n    ".join(sorted(names))
-    print(f"\nPROTO_COMPONENTS = {{\n    {joined}\n}}")
-    names = ['"%s"' % c for c in components]
-    joined = ",\n    ".join(sorted(names))
-    print(f"\nCOMPONENTS = {{\n    {joined}\n}}")
+    return dependencies, proto_components - _PROTO_DEPS_COMMON_REQUIRES
+
+
+def tables_filename(version):
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), f"components_{version.replace('.', '_')}.json")
+
+
+def load_tables(version):
+    """Load the tables of a version, applying the changes recorded in its file to the tables of its base version."""
+    with open(tables_filename(version), "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if data.get("base"):
+        dependencies, proto_components, components = load_tables(data["base"])
+    else:
+        dependencies, proto_components, components = {}, set(), set()
+    for component in data["dependencies"]["removed"]:
+        del dependencies[component]
+    dependencies.update(data["dependencies"]["changed"])
+    proto_components = (proto_components - set(data["proto_components"]["removed"])) | set(data["proto_components"]["added"])
+    components = (components - set(data["components"]["removed"])) | set(data["components"]["added"])
+    return dependencies, proto_components, components
+
+
+def _set_delta(base, current):
+    return {"added": sorted(current - base), "removed": sorted(base - current)}
+
+
+def tables_delta(tables, base_tables=None, base=None):
+    """The data file of a version: its tables, as changes from the tables of the `base` version."""
+    dependencies, proto_components, components = tables
+    base_dependencies, base_proto_components, base_components = base_tables or ({}, set(), set())
+    return {
+        "base": base,
+        "dependencies": {
+            "changed": {k: v for k, v in dependencies.items() if base_dependencies.get(k) != v},
+            "removed": sorted(set(base_dependencies) - set(dependencies)),
+        },
+        "proto_components": _set_delta(base_proto_components, proto_components),
+        "components": _set_delta(base_components, components),
+    }
+
+
+def main():
+    """Generate the data file representing the google-cloud-cpp proto deps of a version."""
+    parser = argparse.ArgumentParser(description=(__doc__))
+    parser.add_argument(
+        "-s",
+        "--source-folder",
+        help="a directory where `google-cloud-cpp` source has been extracted",
+    )
+    parser.add_argument(
+        "-v",
+        "--version",
+        required=True,
+        help="the `google-cloud-cpp` version of the sources, the tables are written to components_<version>.json",
+    )
+    parser.add_argument(
+        "-b",
+        "--base",
+        help="a version with an existing components_<version>.json file, only the changes from its tables are written",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=None,
+        help="number of threads used to read the *.deps files",
+    )
+    args = parser.parse_args()
+    dependencies, proto_components = _proto_tables(args.source_folder, args.jobs)
+    components = set(_components(args.source_folder))
+    base_tables = load_tables(args.base) if args.base else None
+    data = tables_delta((dependencies, proto_components, components), base_tables, args.base)
+    with open(tables_filename(args.version), "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=1, sort_keys=True)
+        f.write("\n")
 
 
 if __name__ == "__main__":
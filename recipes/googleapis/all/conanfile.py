@@ -1,5 +1,6 @@
 import functools
 import glob
+import json
 import os
 
 from conan import ConanFile
@@ -11,8 +12,6 @@ from conan.tools.files import apply_conandata_patches, copy, export_conandata_pa
 from conan.tools.microsoft import is_msvc
 from conan.tools.scm import Version
 
-from helpers import parse_proto_libraries
-
 required_conan_version = ">=1.60.0 <2 || >=2.0.5"
 
 
@@ -33,13 +32,17 @@ class GoogleAPIS(ConanFile):
         "shared": False,
         "fPIC": True,
     }
-    exports = "helpers.py"
+    python_requires = "bazel-proto-graph/1.0"
     short_paths = True
 
     @property
     def _is_legacy_one_profile(self):
         return not hasattr(self, "settings_build")
 
+    @property
+    def _proto_graph(self):
+        return self.python_requires["bazel-proto-graph"].module
+
     def export_sources(self):
         copy(self, "CMakeLists.txt", src=self.recipe_folder, dst=os.path.join(self.export_sources_folder, "src"))
         export_conandata_patches(self)
@@ -90,96 +93,117 @@ class GoogleAPIS(ConanFile):
         deps = CMakeDeps(self)
         deps.generate()
 
+    @staticmethod
+    def _cmake_target(label):
+        return label[2:].replace("/", "_").replace(":", "_")
+
+    @staticmethod
+    def _cmake_alias(cmake_target):
+        short_name = cmake_target
+        prefix = "google_"
+        suffix = "_proto"
+        if cmake_target.startswith(prefix):
+            short_name = short_name[len(prefix):]
+        if short_name.endswith(suffix):
+            short_name = short_name[:-len(suffix)]
+        return short_name
+
     @functools.lru_cache(1)
     def _parse_proto_libraries(self):
         # Generate the libraries to build dynamically
-        proto_libraries = []
-        for filename in glob.iglob(os.path.join(self.source_folder, 'google', '**', 'BUILD.bazel'), recursive=True):
-            proto_libraries += parse_proto_libraries(filename, self.source_folder, self.output.error)
-
-        for filename in glob.iglob(os.path.join(self.source_folder, 'grafeas', '**', 'BUILD.bazel'), recursive=True):
-            proto_libraries += parse_proto_libraries(filename, self.source_folder, self.output.error)
+        build_files = []
+        for root in ("google", "grafeas"):
+            build_files += glob.glob(os.path.join(self.source_folder, root, "**", "BUILD.bazel"), recursive=True)
+        proto_graph = self._proto_graph
+        graph = proto_graph.ProtoGraph.load(build_files, self.source_folder,
+                                            repositories={"com_google_protobuf": proto_graph.PROTOBUF_TARGET, "com_google_googleapis": None},
+                                            error=self.output.error, target_name=self._cmake_target, alias=self._cmake_alias)
 
         # Validate that all files exist and all dependencies are found
-        all_deps = [f"{it.qname}:{it.name}" for it in proto_libraries]
-        all_deps += ["protobuf::libprotobuf"]
-        for it in proto_libraries:
-            it.validate(self.source_folder, all_deps)
+        graph.validate(self.source_folder)
 
         # Mark the libraries we need recursively (C++ context)
-        all_dict = {f"{it.qname}:{it.name}": it for it in proto_libraries}
-
-        def activate_library(proto_library):
-            proto_library.is_used = True
-            for it_dep in proto_library.deps:
-                if it_dep == "protobuf::libprotobuf":
-                    continue
-                activate_library(all_dict[it_dep])
-
-        for it in filter(lambda u: u.is_used, proto_libraries):
-            activate_library(it)
+        graph.activate(it.label for it in graph.libraries if it.is_cc)
 
         # Tweaks
-        def deactivate_library(key):
-            if key in all_dict:
-                all_dict[key].is_used = False
         #  - Inconvenient macro names from usr/include/sys/syslimits.h in some macOS SDKs: GID_MAX
         #    Patched here: https://github.com/protocolbuffers/protobuf/commit/f138d5de2535eb7dd7c8d0ad5eb16d128ab221fd
         #    https://github.com/conan-io/conan-center-index/pull/16034/files#r1159042324
         #    This was fixed in the v22 release which starts at 4.22 for the C++ library
         if Version(self.dependencies["protobuf"].ref.version) <= "3.21.9" and self.settings.os == "Macos" or \
             self.settings.os == "Android":
-            deactivate_library("//google/storagetransfer/v1:storagetransfer_proto")
-            deactivate_library("//google/storagetransfer/v1:storagetransfer_cc_proto")
+            graph.deactivate("//google/storagetransfer/v1:storagetransfer_proto")
+            graph.deactivate("//google/storagetransfer/v1:storagetransfer_cc_proto")
         #  - Inconvenient macro names from /usr/include/math.h : DOMAIN
         if (self.settings.os == "Linux" and self.settings.compiler == "clang" and self.settings.compiler.libcxx == "libc++") or \
             is_msvc(self):
-            deactivate_library("//google/cloud/channel/v1:channel_proto")
-            deactivate_library("//google/cloud/channel/v1:channel_cc_proto")
+            graph.deactivate("//google/cloud/channel/v1:channel_proto")
+            graph.deactivate("//google/cloud/channel/v1:channel_cc_proto")
         #  - Inconvenient names for android
         if self.settings.os == "Android":
-            deactivate_library("//google/identity/accesscontextmanager/type:type_proto")
-            deactivate_library("//google/identity/accesscontextmanager/type:type_cc_proto")
-            deactivate_library("//google/identity/accesscontextmanager/v1:accesscontextmanager_proto")
-            deactivate_library("//google/identity/accesscontextmanager/v1:accesscontextmanager_cc_proto")
-            deactivate_library("//google/devtools/testing/v1:testing_proto")
-            deactivate_library("//google/devtools/testing/v1:testing_cc_proto")
-            deactivate_library("//google/devtools/resultstore/v2:resultstore_proto")
-            deactivate_library("//google/devtools/resultstore/v2:resultstore_cc_proto")
-            deactivate_library("//google/cloud/talent/v4beta1:talent_proto")
-            deactivate_library("//google/cloud/talent/v4beta1:talent_cc_proto")
-            deactivate_library("//google/cloud/talent/v4:talent_proto")
-            deactivate_library("//google/cloud/talent/v4:talent_cc_proto")
-            deactivate_library("//google/cloud/asset/v1:asset_proto")
-            deactivate_library("//google/cloud/asset/v1:asset_cc_proto")
+            graph.deactivate("//google/identity/accesscontextmanager/type:type_proto")
+            graph.deactivate("//google/identity/accesscontextmanager/type:type_cc_proto")
+            graph.deactivate("//google/identity/accesscontextmanager/v1:accesscontextmanager_proto")
+            graph.deactivate("//google/identity/accesscontextmanager/v1:accesscontextmanager_cc_proto")
+            graph.deactivate("//google/devtools/testing/v1:testing_proto")
+            graph.deactivate("//google/devtools/testing/v1:testing_cc_proto")
+            graph.deactivate("//google/devtools/resultstore/v2:resultstore_proto")
+            graph.deactivate("//google/devtools/resultstore/v2:resultstore_cc_proto")
+            graph.deactivate("//google/cloud/talent/v4beta1:talent_proto")
+            graph.deactivate("//google/cloud/talent/v4beta1:talent_cc_proto")
+            graph.deactivate("//google/cloud/talent/v4:talent_proto")
+            graph.deactivate("//google/cloud/talent/v4:talent_cc_proto")
+            graph.deactivate("//google/cloud/asset/v1:asset_proto")
+            graph.deactivate("//google/cloud/asset/v1:asset_cc_proto")
         # This fails to build on Windows. It is arguably a missing feature of
         # Protobuf.
         #     https://github.com/protocolbuffers/protobuf/issues/12774
         # Fortunately this library is not used by any downstream packages
         # (grpc-protos, or google-cloud-cpp), and it is only "beta" at the
         # moment. Simply disable it for now.
-        deactivate_library("//google/cloud/lifesciences/v2beta:lifesciences_proto")
-        deactivate_library("//google/cloud/lifesciences/v2beta:lifesciences_cc_proto")
+        graph.deactivate("//google/cloud/lifesciences/v2beta:lifesciences_proto")
+        graph.deactivate("//google/cloud/lifesciences/v2beta:lifesciences_cc_proto")
+
+        return graph
+
+    _COMPONENTS_FILE = "generated_targets.json"
 
-        return proto_libraries
+    def _write_components_table(self, graph):
+        # Resolved (and filtered) graph of the libraries built, consumed by package() and package_info().
+        # Components are stored as [name, has_lib, [requires]] rows, where names and requires are indices in
+        # the list of targets, so package_info() doesn't have to parse BUILD.bazel files again
+        targets = []
+        indices = {}
+
+        def index(target):
+            if target not in indices:
+                indices[target] = len(targets)
+                targets.append(target)
+            return indices[target]
+
+        components = [
+            [index(graph.cmake_target(it.label)), bool(it.srcs), [index(dep) for dep in graph.cmake_deps(it)]]
+            for it in graph.used_libraries
+        ]
+        with open(os.path.join(self.build_folder, self._COMPONENTS_FILE), "w", encoding="utf-8") as f:
+            json.dump({"targets": targets, "components": components}, f, separators=(",", ":"))
 
     def build(self):
         apply_conandata_patches(self)
-        proto_libraries = self._parse_proto_libraries()
+        graph = self._parse_proto_libraries()
+        self._write_components_table(graph)
         # Use a separate file to host the generated code, which is generated in full each time.
         # This is safe to call multiple times, for example, if you need to invoke `conan build` more than
         # once.
         with open(os.path.join(self.source_folder, "generated_targets.cmake"), "w", encoding="utf-8") as f:
             f.write("# Generated C++ library targets for googleapis\n")
             f.write("# DO NOT EDIT - change the generation code in conanfile.py instead\n")
-            for it in filter(lambda u: u.is_used, proto_libraries):
-                f.write(it.cmake_content)
+            for it in graph.used_libraries:
+                f.write(graph.cmake_content(it, import_dirs="${CMAKE_SOURCE_DIR}"))
         cmake = CMake(self)
         cmake.configure()
         cmake.build()
 
-    _DEPS_FILE = "res/generated_targets.deps"
-
     def package(self):
         copy(self, pattern="LICENSE", src=self.source_folder, dst=os.path.join(self.package_folder, "licenses"))
         copy(self, pattern="*.proto", src=self.source_folder, dst=os.path.join(self.package_folder, "res"))
@@ -191,19 +215,19 @@ class GoogleAPIS(ConanFile):
         copy(self, pattern="*.dylib", src=self.build_folder, dst=os.path.join(self.package_folder, "lib"), keep_path=False)
         copy(self, pattern="*.a", src=self.build_folder, dst=os.path.join(self.package_folder, "lib"), keep_path=False)
 
-        with open(os.path.join(self.package_folder, self._DEPS_FILE), "w", encoding="utf-8") as f:
-            for lib in filter(lambda u: u.is_used, self._parse_proto_libraries()):
-                interface = 'LIB' if lib.srcs else 'INTERFACE'
-                f.write(f"{lib.cmake_target} {interface} {','.join(lib.cmake_deps)}\n")
+        copy(self, self._COMPONENTS_FILE, src=self.build_folder, dst=os.path.join(self.package_folder, "res"))
 
     def package_info(self):
-        with open(os.path.join(self.package_folder, self._DEPS_FILE), "r", encoding="utf-8") as f:
-            for line in f.read().splitlines():
-                (name, libtype, deps) = line.rstrip('\n').split(' ')
-                self.cpp_info.components[name].requires = deps.split(',')
-                self.cpp_info.components[name].resdirs = ["res"]
-                if libtype == 'LIB':
-                    self.cpp_info.components[name].libs = [name]
-                self.cpp_info.components[name].set_property("pkg_config_name", name)
-                if self.settings.os in ["Linux", "FreeBSD"]:
-                    self.cpp_info.components[name].system_libs.extend(["m"])
+        with open(os.path.join(self.package_folder, "res", self._COMPONENTS_FILE), "r", encoding="utf-8") as f:
+            table = json.load(f)
+        targets = table["targets"]
+        system_libs = ["m"] if self.settings.os in ["Linux", "FreeBSD"] else []
+        for name_index, has_lib, requires in table["components"]:
+            name = targets[name_index]
+            component = self.cpp_info.components[name]
+            component.requires = [targets[it] for it in requires]
+            component.resdirs = ["res"]
+            if has_lib:
+                component.libs = [name]
+            component.set_property("pkg_config_name", name)
+            component.system_libs.extend(system_libs)
@@ -9,8 +9,6 @@ from conan.tools.env import VirtualBuildEnv, VirtualRunEnv
 from conan.tools.files import get, collect_libs, copy
 from conan.tools.scm import Version
 
-from helpers import parse_proto_libraries
-
 required_conan_version = ">=1.60.0 <2.0 || >=2.0.5"
 
 
@@ -31,12 +29,16 @@ class GRPCProto(ConanFile):
         "shared": False,
         "fPIC": True,
     }
-    exports = "helpers.py"
+    python_requires = "bazel-proto-graph/1.0"
 
     @property
     def _is_legacy_one_profile(self):
         return not hasattr(self, "settings_build")
 
+    @property
+    def _proto_graph(self):
+        return self.python_requires["bazel-proto-graph"].module
+
     def export_sources(self):
         copy(self, "CMakeLists.txt", src=self.recipe_folder, dst=self.export_sources_folder)
 
@@ -94,37 +96,32 @@ class GRPCProto(ConanFile):
         deps = CMakeDeps(self)
         deps.generate()
 
+    @staticmethod
+    def _cmake_target(label):
+        return f"grpc_{label.rsplit(':', 1)[-1]}"
+
     @functools.lru_cache(1)
     def _parse_proto_libraries(self):
         # Generate the libraries to build dynamically
-        proto_libraries = parse_proto_libraries(os.path.join(self.source_folder, 'BUILD.bazel'), self.source_folder, self.output.error)
+        proto_graph = self._proto_graph
+        graph = proto_graph.ProtoGraph.load([os.path.join(self.source_folder, 'BUILD.bazel')], self.source_folder,
+                                            repositories={"com_google_protobuf": proto_graph.PROTOBUF_TARGET, "com_google_googleapis": "googleapis::googleapis"},
+                                            error=self.output.error, target_name=self._cmake_target, rules=("proto_library",))
 
         # Validate that all files exist and all dependencies are found
-        all_deps = [it.cmake_target for it in proto_libraries]
-        all_deps += ["googleapis::googleapis", "protobuf::libprotobuf"]
-        for it in proto_libraries:
-            it.validate(self.source_folder, all_deps)
+        graph.validate(self.source_folder)
 
         # Mark the libraries we need recursively (C++ context)
-        all_dict = {it.cmake_target: it for it in proto_libraries}
-        def activate_library(proto_library):
-            proto_library.is_used = True
-            for it_dep in proto_library.deps:
-                if it_dep in ["googleapis::googleapis", "protobuf::libprotobuf"]:
-                    continue
-                activate_library(all_dict[it_dep])
-
-        for it in filter(lambda u: u.is_used, proto_libraries):
-            activate_library(it)
+        graph.activate(it.label for it in graph.libraries)
 
-        return proto_libraries
+        return graph
 
     def build(self):
         copy(self, "CMakeLists.txt", src=os.path.join(self.source_folder, os.pardir), dst=self.source_folder)
-        proto_libraries = self._parse_proto_libraries()
+        graph = self._parse_proto_libraries()
         with open(os.path.join(self.source_folder, "CMakeLists.txt"), "a", encoding="utf-8") as f:
-            for it in filter(lambda u: u.is_used, proto_libraries):
-                f.write(it.cmake_content)
+            for it in graph.used_libraries:
+                f.write(graph.cmake_content(it, import_dirs="${IMPORT_DIRS}"))
         cmake = CMake(self)
         cmake.configure()
         cmake.build()
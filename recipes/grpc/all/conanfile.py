@@ -1,7 +1,7 @@
 import os
 import yaml
 
-from conan import ConanFile
+from conan import ConanFile, conan_version
 from conan.errors import ConanInvalidConfiguration
 from conan.tools.apple import is_apple_os
 from conan.tools.build import cross_building, valid_min_cppstd, check_min_cppstd
@@ -38,7 +38,8 @@ class GrpcConan(ConanFile):
         "python_plugin": [True, False],
         "ruby_plugin": [True, False],
         "secure": [True, False],
-        "with_libsystemd": [True, False]
+        "with_libsystemd": [True, False],
+        "plugins_only": [True, False],
     }
     default_options = {
         "shared": False,
@@ -53,7 +54,8 @@ class GrpcConan(ConanFile):
         "python_plugin": True,
         "ruby_plugin": True,
         "secure": False,
-        "with_libsystemd": True
+        "with_libsystemd": True,
+        "plugins_only": False,
     }
 
     short_paths = True
@@ -90,6 +92,12 @@ class GrpcConan(ConanFile):
             del self.options.with_libsystemd
 
     def configure(self):
+        if self.options.plugins_only:
+            # Only the grpc plugins (executables), eg. to generate code when cross-building. They are
+            # linked statically to grpc_plugin_support, which is not packaged
+            self.package_type = "application"
+            self.options.shared = False
+
         if self.options.shared:
             self.options.rm_safe("fPIC")
             self.options["protobuf"].shared = True
@@ -110,6 +118,9 @@ class GrpcConan(ConanFile):
         else:
             self.requires("abseil/[>=20230125.3 <=20230802.1]", transitive_headers=True, transitive_libs=True)
             self.requires("protobuf/3.21.12", transitive_headers=True)
+        if self.options.plugins_only:
+            # The plugins only depend on protobuf (libprotoc)
+            return
         self.requires("c-ares/[>=1.19.1 <2]")
         self.requires("openssl/[>=1.1 <4]")
         self.requires("re2/20230301")
@@ -119,6 +130,9 @@ class GrpcConan(ConanFile):
 
     def package_id(self):
         del self.info.options.secure
+        if self.info.options.plugins_only:
+            for option in ["shared", "fPIC", "codegen", "csharp_ext", "with_libsystemd"]:
+                self.info.options.rm_safe(option)
 
     def validate(self):
         check_min_vs(self, "190")
@@ -142,7 +156,12 @@ class GrpcConan(ConanFile):
             self.tool_requires("protobuf/<host_version>")
         if cross_building(self):
             # when cross compiling we need pre compiled grpc plugins for protoc
-            self.tool_requires(f"grpc/{self.version}")
+            if conan_version.major >= 2:
+                # The grpc of the build context only provides the plugins (options set on a dependency
+                # in configure() do not reach the tool requirements)
+                self.tool_requires(f"grpc/{self.version}", options={"plugins_only": True})
+            else:
+                self.tool_requires(f"grpc/{self.version}")
 
     def source(self):
         get(self, **self.conan_data["sources"][self.version], strip_root=True)
@@ -153,8 +172,9 @@ class GrpcConan(ConanFile):
         if self._is_legacy_one_profile:
             VirtualRunEnv(self).generate(scope="build")
 
-        # This doesn't work yet as one would expect, because the install target builds everything
-        # and we need the install target because of the generated CMake files
+        # The install target builds everything, and we need it because of the generated CMake files:
+        # build() can build only the installed targets (see _cmake_build_targets) with
+        # the user.grpc:build_targets_only conf, and plugins_only=True only builds the plugins
         #
         #   enable_mobile=False # Enables iOS and Android support
         #
@@ -163,7 +183,7 @@ class GrpcConan(ConanFile):
 
         tc.cache_variables["CMAKE_PROJECT_grpc_INCLUDE"] = os.path.join(self.source_folder, "conan_cmake_project_include.cmake")
 
-        tc.cache_variables["gRPC_BUILD_CODEGEN"] = self.options.codegen
+        tc.cache_variables["gRPC_BUILD_CODEGEN"] = self.options.codegen or self.options.plugins_only
         tc.cache_variables["gRPC_BUILD_CSHARP_EXT"] = self.options.csharp_ext
         tc.cache_variables["gRPC_BUILD_TESTS"] = "OFF"
 
@@ -178,6 +198,10 @@ class GrpcConan(ConanFile):
         tc.cache_variables["gRPC_SSL_PROVIDER"] = "package"
         tc.cache_variables["gRPC_PROTOBUF_PROVIDER"] = "package"
         tc.cache_variables["gRPC_ABSL_PROVIDER"] = "package"
+        if self.options.plugins_only:
+            # Not required: the libraries using them are not built
+            for provider in ["ZLIB", "CARES", "RE2", "SSL"]:
+                tc.cache_variables[f"gRPC_{provider}_PROVIDER"] = "none"
 
         tc.cache_variables["gRPC_BUILD_GRPC_CPP_PLUGIN"] = self.options.cpp_plugin
         tc.cache_variables["gRPC_BUILD_GRPC_CSHARP_PLUGIN"] = self.options.csharp_plugin
@@ -196,7 +220,7 @@ class GrpcConan(ConanFile):
             tc.cache_variables["CMAKE_MACOSX_BUNDLE"] = False
 
         if self._supports_libsystemd:
-            tc.cache_variables["gRPC_USE_SYSTEMD"] = self.options.with_libsystemd
+            tc.cache_variables["gRPC_USE_SYSTEMD"] = self.options.with_libsystemd and not self.options.plugins_only
         
         if Version(self.version) >= "1.62.0":
             tc.cache_variables["gRPC_DOWNLOAD_ARCHIVES"] = False
@@ -236,11 +260,39 @@ class GrpcConan(ConanFile):
             target_link_options(upb_json_lib PRIVATE -Wl,-undefined,dynamic_lookup)
             """)
 
+    @property
+    def _build_targets_only(self):
+        return self.options.plugins_only or self.conf.get("user.grpc:build_targets_only", default=False, check_type=bool)
+
+    @property
+    def _enabled_plugins(self):
+        """grpc_plugins of target_info enabled by the options"""
+        return [it for it in self.target_info["grpc_plugins"] if self.options.get_safe(it["executable"].replace("grpc_", ""))]
+
+    @property
+    def _cmake_build_targets(self):
+        """CMake targets to build: the installed libraries and the enabled plugins"""
+        targets = []
+        if not self.options.plugins_only:
+            for target in self.target_info["grpc_targets"]:
+                if not self.options.codegen and target["name"] in ["grpc++_reflection", "grpcpp_channelz"]:
+                    continue
+                targets.append(target["lib"])
+            if self.options.csharp_ext:
+                targets.append("grpc_csharp_ext")
+        if self.options.codegen or self.options.plugins_only:
+            targets.extend(it["executable"] for it in self._enabled_plugins)
+        return targets
+
     def build(self):
         self._patch_sources()
         cmake = CMake(self)
         cmake.configure()
-        cmake.build()
+        if self._build_targets_only:
+            for target in self._cmake_build_targets:
+                cmake.build(target=target)
+        else:
+            cmake.build()
 
     @property
     def target_info(self):
@@ -253,20 +305,23 @@ class GrpcConan(ConanFile):
 
     def package(self):
         copy(self, "LICENSE", src=self.source_folder, dst=os.path.join(self.package_folder, "licenses"))
-        cmake = CMake(self)
-        cmake.install()
+        if self.options.plugins_only:
+            # The libraries are not built: the install target cannot be used
+            for plugin_info in self._enabled_plugins:
+                # In the build folder, or in its <build_type> subfolder with multi-config generators
+                for pattern in [f"*{plugin_info['executable']}", f"*{plugin_info['executable']}.exe"]:
+                    copy(self, pattern, src=self.build_folder, dst=os.path.join(self.package_folder, "bin"), keep_path=False)
+        else:
+            cmake = CMake(self)
+            cmake.install()
 
         rmdir(self, os.path.join(self.package_folder, "lib", "cmake"))
         rmdir(self, os.path.join(self.package_folder, "lib", "pkgconfig"))
 
         # Create one custom module file per executable in order to emulate
         # CMake executables imported targets of grpc plugins.
-        for plugin_info in self.target_info["grpc_plugins"]:
-            target = plugin_info["target"]
-            executable = plugin_info["executable"]
-            option_name = executable.replace("grpc_", "")
-            if self.options.get_safe(option_name):
-                self._create_executable_module_file(target, executable)
+        for plugin_info in self._enabled_plugins:
+            self._create_executable_module_file(plugin_info["target"], plugin_info["executable"])
 
     def _create_executable_module_file(self, target, executable):
         module_abs_path = os.path.join(self.package_folder, self._module_path)
@@ -314,6 +369,9 @@ class GrpcConan(ConanFile):
         def wsock32():
             return ["wsock32"] if self.settings.os == "Windows" else []
 
+        if self.options.plugins_only:
+            return {}
+
         targets = self.target_info['grpc_targets']
         components = {}
         for target in targets:
@@ -332,9 +390,13 @@ class GrpcConan(ConanFile):
 
     def package_info(self):
         self.cpp_info.set_property("cmake_file_name", "gRPC")
-        self.cpp_info.resdirs = ["res"]
-        ssl_roots_file_path = os.path.join(self.package_folder, "res", "grpc", "roots.pem")
-        self.runenv_info.define_path("GRPC_DEFAULT_SSL_ROOTS_FILE_PATH", ssl_roots_file_path)
+        if self.options.plugins_only:
+            self.cpp_info.includedirs = []
+            self.cpp_info.libdirs = []
+        else:
+            self.cpp_info.resdirs = ["res"]
+            ssl_roots_file_path = os.path.join(self.package_folder, "res", "grpc", "roots.pem")
+            self.runenv_info.define_path("GRPC_DEFAULT_SSL_ROOTS_FILE_PATH", ssl_roots_file_path)
 
         for component, values in self._grpc_components.items():
             target = values.get("lib")
@@ -354,18 +416,16 @@ class GrpcConan(ConanFile):
         # Executable imported targets are added through custom CMake module files,
         # since conan generators don't know how to emulate these kind of targets.
         grpc_modules = []
-        for plugin_info in self.target_info["grpc_plugins"]:
-            executable = plugin_info["executable"]
-            option_name = executable.replace("grpc_", "")
-            if self.options.get_safe(option_name):
-                grpc_module_filename = "{}.cmake".format(executable)
-                grpc_modules.append(os.path.join(self._module_path, grpc_module_filename))
+        for plugin_info in self._enabled_plugins:
+            grpc_module_filename = "{}.cmake".format(plugin_info["executable"])
+            grpc_modules.append(os.path.join(self._module_path, grpc_module_filename))
         self.cpp_info.set_property("cmake_build_modules", grpc_modules)
 
         # TODO: to remove once conan v1 not supported anymore
         self.cpp_info.names["cmake_find_package"] = "gRPC"
         self.cpp_info.names["cmake_find_package_multi"] = "gRPC"
-        self.env_info.GRPC_DEFAULT_SSL_ROOTS_FILE_PATH = ssl_roots_file_path
+        if not self.options.plugins_only:
+            self.env_info.GRPC_DEFAULT_SSL_ROOTS_FILE_PATH = ssl_roots_file_path
         if grpc_modules:
             self.cpp_info.components["grpc_execs"].build_modules["cmake_find_package"] = grpc_modules
             self.cpp_info.components["grpc_execs"].build_modules["cmake_find_package_multi"] = grpc_modules
@@ -1,10 +1,11 @@
 import glob
 import hashlib
+import mmap
 import os
 import shutil
 
 from conan import ConanFile
-from conan.errors import ConanInvalidConfiguration
+from conan.errors import ConanException, ConanInvalidConfiguration
 from conan.tools.apple import is_apple_os
 from conan.tools.build import cross_building, stdcpp_library, check_min_cppstd
 from conan.tools.env import Environment, VirtualBuildEnv
@@ -102,13 +103,55 @@ class ICUConan(ConanFile):
     def layout(self):
         basic_layout(self, src_folder="src")
 
-    @staticmethod
-    def _sha256sum(file_path):
-        m = hashlib.sha256()
-        with open(file_path, "rb") as fh:
-            for data in iter(lambda: fh.read(8192), b""):
-                m.update(data)
-        return m.hexdigest()
+    # sha256 of the dat package files, by (path, size, mtime): package_id() is computed for each
+    # node of the graph with icu, and the files are tens of MB
+    _cached_sha256sums = {}
+
+    @classmethod
+    def _sha256sum(cls, file_path):
+        file_path = os.path.abspath(file_path)
+        stat = os.stat(file_path)
+        key = (file_path, stat.st_size, stat.st_mtime_ns)
+        if key in cls._cached_sha256sums:
+            return cls._cached_sha256sums[key]
+
+        # Sidecar file next to the dat file, to share the digest between conan commands:
+        # "conan-icu-sha256 <sha256> <size> <mtime_ns>". A file of this name not written by the recipe
+        # is neither used nor overwritten
+        sidecar_path = file_path + ".conan-icu-sha256"
+        sidecar_owned = not os.path.exists(sidecar_path)
+        digest = None
+        try:
+            with open(sidecar_path, "r") as fh:
+                marker, sidecar_digest, size, mtime_ns = fh.read().split()
+            if marker == "conan-icu-sha256":
+                sidecar_owned = True
+                if (int(size), int(mtime_ns)) == key[1:]:
+                    digest = sidecar_digest
+        except (OSError, ValueError, UnicodeDecodeError):
+            pass
+
+        if digest is None:
+            m = hashlib.sha256()
+            with open(file_path, "rb") as fh:
+                if stat.st_size:
+                    with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                        m.update(data)
+            digest = m.hexdigest()
+            if sidecar_owned:
+                # Written aside then renamed, so that a concurrent build never reads a partial sidecar
+                tmp_path = f"{sidecar_path}.{os.getpid()}.tmp"
+                try:
+                    with open(tmp_path, "w") as fh:
+                        fh.write(f"conan-icu-sha256 {digest} {stat.st_size} {stat.st_mtime_ns}\n")
+                    os.replace(tmp_path, sidecar_path)
+                except OSError:
+                    # eg. read-only folder: only cached for this process
+                    if os.path.exists(tmp_path):
+                        os.remove(tmp_path)
+
+        cls._cached_sha256sums[key] = digest
+        return digest
 
     def package_id(self):
         if self.info.options.dat_package_file:
@@ -225,6 +268,9 @@ class ICUConan(ConanFile):
         if self.options.dat_package_file:
             dat_package_file = glob.glob(os.path.join(self.source_folder, "source", "data", "in", "*.dat"))
             if dat_package_file:
+                # The file could have changed since the package ID was computed (eg. with a lockfile)
+                if self._sha256sum(str(self.options.dat_package_file)) != str(self.info.options.dat_package_file):
+                    raise ConanException("dat_package_file changed since the package ID was computed")
                 shutil.copy(str(self.options.dat_package_file), dat_package_file[0])
 
         autotools = Autotools(self)
@@ -1,7 +1,7 @@
 from conan.errors import ConanInvalidConfiguration
 from conan import ConanFile
 from conan.tools.build import cross_building
-from conan.tools.files import apply_conandata_patches, chdir, collect_libs, get, load, rename, replace_in_file, rm, rmdir, save
+from conan.tools.files import apply_conandata_patches, collect_libs, get, rename, replace_in_file, rm, rmdir, save
 from conan.tools.scm import Version
 from conans import CMake
 from collections import defaultdict
@@ -13,6 +13,35 @@ import textwrap
 
 required_conan_version = ">=1.50.2" # Due to conan.tools.scm.Version
 
+# Statements of the graphs written by 'cmake --graphviz': one per line, node ids and labels quoted
+_DOT_STRING = re.compile(r'"((?:[^"\\]|\\.)*)"')
+_DOT_NODE = re.compile(r'^\s*"([^"]+)"\s*\[\s*label\s*=\s*"((?:[^"\\]|\\.)*)"')
+_DOT_EDGE = re.compile(r'^\s*"([^"]+)"\s*->\s*"([^"]+)"')
+
+
+def _read_graphviz(filename):
+    """Returns the dependencies of the targets of a graph written by 'cmake --graphviz', as a
+    dict of sets indexed by the name of the targets. The legend (a subgraph) is ignored"""
+    labels = {}
+    edges = []
+    depth = 0
+    with open(filename, 'r', encoding='utf-8') as dot_file:
+        for line in dot_file:
+            if depth == 1:
+                edge = _DOT_EDGE.match(line)
+                node = None if edge else _DOT_NODE.match(line)
+                if edge:
+                    edges.append(edge.groups())
+                elif node:
+                    labels[node.group(1)] = node.group(2).replace('\\"', '"')
+            unquoted = _DOT_STRING.sub('', line)
+            depth += unquoted.count('{') - unquoted.count('}')
+
+    graph = defaultdict(set)
+    for node, dep in edges:
+        graph[labels[node]].add(labels[dep])
+    return graph
+
 
 class LLVMCoreConan(ConanFile):
     name = 'llvm-core'
@@ -232,7 +261,8 @@ class LLVMCoreConan(ConanFile):
     def build(self):
         self._patch_build()
         cmake = self._configure_cmake()
-        cmake.configure()
+        # The graph of the targets models the components of static builds (see package())
+        cmake.configure(args=[] if self.options.shared else ['--graphviz=graph/llvm.dot'])
         cmake.build()
 
     @property
@@ -272,17 +302,8 @@ class LLVMCoreConan(ConanFile):
                 lib = '*LLVMTableGenGlobalISel{}'.format(ext)
                 self.copy(lib, dst='lib', src='lib')
 
-            CMake(self).configure(args=['--graphviz=graph/llvm.dot'], source_dir='.', build_dir='.')
-            with chdir(self, 'graph'):
-                dot_text = load(self, 'llvm.dot').replace('\r\n', '\n')
-
-            dep_regex = re.compile(r'//\s(.+)\s->\s(.+)$', re.MULTILINE)
-            deps = re.findall(dep_regex, dot_text)
-
-            dummy_targets = defaultdict(list)
-            for target, dep in deps:
-                if not target.startswith('LLVM'):
-                    dummy_targets[target].append(dep)
+            targets = _read_graphviz(os.path.join(self.build_folder, 'graph', 'llvm.dot'))
+            dummy_targets = {target: deps for target, deps in targets.items() if not target.startswith('LLVM')}
 
             cmake_targets = {
                 'libffi::libffi': 'ffi',
@@ -291,30 +312,28 @@ class LLVMCoreConan(ConanFile):
                 'LibXml2::LibXml2': 'xml2'
             }
 
-            components = defaultdict(list)
-            for lib, dep in deps:
-                if not lib.startswith('LLVM'):
-                    continue
-                elif dep.startswith('-delayload:'):
-                    continue
-                elif dep.startswith('LLVM'):
-                    components[dep]
-                elif dep in cmake_targets:
-                    dep = cmake_targets[dep]
-                elif os.path.exists(dep):
-                    dep = os.path.splitext(os.path.basename(dep))[0]
-                    dep = dep.replace('lib', '')
-                dep = dep.replace('-l', '')
-
-                if dep in dummy_targets.keys():
-                    components[lib].extend(dummy_targets[dep])
-                    components[lib] = list(set(components[lib]))
-                else:
-                    components[lib].append(dep)
+            components = defaultdict(set)
+            for lib in sorted(target for target in targets if target.startswith('LLVM')):
+                for dep in targets[lib]:
+                    if dep.startswith('-delayload:'):
+                        continue
+                    elif dep.startswith('LLVM'):
+                        components[dep]
+                    elif dep in cmake_targets:
+                        dep = cmake_targets[dep]
+                    elif os.path.exists(dep):
+                        dep = os.path.splitext(os.path.basename(dep))[0]
+                        dep = dep.replace('lib', '')
+                    dep = dep.replace('-l', '')
+
+                    if dep in dummy_targets:
+                        components[lib].update(dummy_targets[dep])
+                    else:
+                        components[lib].add(dep)
 
             alias_targets = {}
             old_alias_targets = {}
-            for component, _ in components.items():
+            for component in components:
                 alias_targets[component] = "LLVM::{}".format(component)
                 old_alias_targets["llvm-core::{}".format(component[4:].replace('LLVM', '').lower())] = "LLVM::{}".format(component)
 
@@ -354,12 +373,12 @@ class LLVMCoreConan(ConanFile):
 
         if not self.options.shared:
             if self.options.get_safe('with_zlib', False):
-                if not 'z' in components['LLVMSupport']:
-                    components['LLVMSupport'].append('z')
+                components['LLVMSupport'].add('z')
             components_path = \
                 os.path.join(self.package_folder, 'lib', 'components.json')
             with open(components_path, 'w') as components_file:
-                json.dump(components, components_file, indent=4)
+                json.dump({component: sorted(deps) for component, deps in sorted(components.items())},
+                          components_file, indent=4)
         else:
             suffixes = ['.dylib', '.so']
             for name in os.listdir(lib_path):
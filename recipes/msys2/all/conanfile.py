@@ -1,9 +1,10 @@
 from conan import ConanFile
 from conan.errors import ConanInvalidConfiguration, ConanException
-from conan.tools.files import chdir, get, replace_in_file, copy
+from conan.tools.files import chdir, get, replace_in_file
 from conan.tools.layout import basic_layout
 import fnmatch
 import os
+import re
 import shutil
 import subprocess
 import errno
@@ -139,8 +140,9 @@ class MSYS2Conan(ConanFile):
         self._update_pacman()
 
         with chdir(self, os.path.join(self._msys_dir, "usr", "bin")):
-            for package in packages:
-                self.run(f'bash -l -c "pacman -S {package} --noconfirm"')
+            # A single transaction (and login shell) for all the packages
+            if packages:
+                self.run(f'bash -l -c "pacman -S {" ".join(packages)} --noconfirm"')
             for package in ['pkgconf']:
                 self.run(f'bash -l -c "pacman -Rs -d -d $(pacman -Qsq {package}) --noconfirm"')
 
@@ -160,18 +162,42 @@ class MSYS2Conan(ConanFile):
         replace_in_file(self, os.path.join(self._msys_dir, "etc", "profile"),
                               'PKG_CONFIG_PATH="', 'PKG_CONFIG_PATH="${PKG_CONFIG_PATH:+${PKG_CONFIG_PATH}:}')
 
+    @staticmethod
+    def _stage_file(src, dst):
+        # Hardlink the file when the package folder is on the same filesystem, copy it otherwise
+        if os.path.islink(src):
+            os.symlink(os.readlink(src), dst, target_is_directory=os.path.isdir(src))
+            return
+        try:
+            os.link(src, dst)
+        except OSError:
+            shutil.copy2(src, dst)
+
     def package(self):
-        excludes = None
+        excludes = []
         if self.options.exclude_files:
-            excludes = tuple(str(self.options.exclude_files).split(","))
-        for exclude in excludes:
-            for root, _, filenames in os.walk(self._msys_dir):
-                for filename in filenames:
-                    fullname = os.path.join(root, filename)
-                    if fnmatch.fnmatch(fullname, exclude):
-                        os.unlink(fullname)
+            excludes = str(self.options.exclude_files).split(",")
+        # Same matching as fnmatch.fnmatch(), with all the patterns in a single regex
+        exclude_regex = re.compile("|".join(fnmatch.translate(os.path.normcase(it)) for it in excludes)) if excludes else None
+
         # See https://github.com/conan-io/conan-center-index/blob/master/docs/error_knowledge_base.md#kb-h013-default-package-layout
-        copy(self, "*", dst=os.path.join(self.package_folder, "bin", "msys64"), src=self._msys_dir, excludes=excludes)
+        # Single walk of the tree: excluded files are removed, the others are staged in the package folder
+        dst_root = os.path.join(self.package_folder, "bin", "msys64")
+        for root, dirnames, filenames in os.walk(self._msys_dir):
+            dst_dir = os.path.join(dst_root, os.path.relpath(root, self._msys_dir))
+            dst_dir_created = False
+            # os.walk() does not descend into the symlinks to directories: they are staged as symlinks,
+            # like copy() does
+            symlinked_dirs = [it for it in dirnames if os.path.islink(os.path.join(root, it))]
+            for filename in filenames + symlinked_dirs:
+                fullname = os.path.join(root, filename)
+                if exclude_regex and exclude_regex.match(os.path.normcase(fullname)):
+                    os.unlink(fullname)
+                    continue
+                if not dst_dir_created:
+                    os.makedirs(dst_dir, exist_ok=True)
+                    dst_dir_created = True
+                self._stage_file(fullname, os.path.join(dst_dir, filename))
         shutil.copytree(os.path.join(self._msys_dir, "usr", "share", "licenses"),
                         os.path.join(self.package_folder, "licenses"))
 
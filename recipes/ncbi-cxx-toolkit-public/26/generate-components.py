@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+
+"""
+Generate the components.json file loaded by conanfile.py from the CMake export files of
+builds of the NCBI C++ Toolkit.
+
+Each table of components.json describes the libraries of one kind of build, and a predicate
+("when") on the settings and options of the recipe (eg. os=Windows,shared=True). package_info()
+uses the first table whose predicate matches, so the table without a predicate comes last.
+
+The libraries and their dependencies are read from the files generated by CMake for the exported
+targets (set_target_properties(<target> PROPERTIES INTERFACE_LINK_LIBRARIES ...)) of a build
+configured with NCBI_PTBCFG_PACKAGING=TRUE.
+
+Example, to regenerate the file from a Windows shared build and a Linux static build:
+    generate-components.py --table os=Windows,shared=True win-shared/ncbi-cpp-toolkit.cmake \
+                           --table default linux-static/ncbi-cpp-toolkit.cmake
+"""
+
+import argparse
+import json
+import re
+from pathlib import Path
+from typing import Dict, List
+
+# Components of the recipe for the external packages (and system libraries) the toolkit libraries
+# can link with: they are kept in the requirements of the libraries
+EXTERNAL_COMPONENTS = {
+    "BZ2", "BerkeleyDB", "Boost", "CASSANDRA", "FASTCGI", "FASTCGIPP", "GIF", "GRPC", "JAEGER", "JPEG",
+    "LAPACK", "LMDB", "LZO", "MySQL", "NCBI_C", "NETWORKLIBS", "NGHTTP2", "ODBC", "PCRE", "PNG",
+    "PROTOBUF", "PYTHON", "SQLITE3", "SQLServer", "Sybase", "TIFF", "UV", "VDB", "XML", "XSLT", "Z",
+    "wxWidgets",
+}
+
+# Libraries which do not depend on other libraries of the toolkit require its base component
+BASE_COMPONENT = "ORIGLIBS"
+
+# Libraries whose component (and library) names cannot be the name of the exported target:
+# "general" is a keyword of target_link_libraries()
+RENAMED_LIBRARIES = {
+    "general": ("libgeneral", ["$<1:general>"]),
+    "generalasn": ("libgeneral", ["generalasn"]),
+}
+
+_TARGET_PROPERTIES = re.compile(r"set_target_properties\(\s*(\S+)\s+PROPERTIES(.*?)\n\s*\)", re.DOTALL)
+_LINK_LIBRARIES = re.compile(r'INTERFACE_LINK_LIBRARIES\s+"([^"]*)"')
+_LINK_ONLY = re.compile(r"^\$<LINK_ONLY:(.*)>$")
+
+
+def parse_export_file(path: Path, namespace: str = "") -> Dict[str, List[str]]:
+    """Returns the exported targets of a CMake export file, with the items they link with"""
+    targets = {}
+    for target, properties in _TARGET_PROPERTIES.findall(path.read_text(encoding="utf-8")):
+        match = _LINK_LIBRARIES.search(properties)
+        items = match.group(1).split(";") if match else []
+        items = [_LINK_ONLY.sub(r"\1", it) for it in items if it]
+        targets[target[len(namespace):] if target.startswith(namespace) else target] = [
+            it[len(namespace):] if it.startswith(namespace) else it for it in items
+        ]
+    return targets
+
+
+def build_table(targets: Dict[str, List[str]]) -> List[List]:
+    """Rows [exported target, component, libs, requires], sorted from the top of the dependency graph
+    to its bottom (the libraries without dependency in the toolkit)"""
+    def component_name(target):
+        return RENAMED_LIBRARIES.get(target, (target,))[0]
+
+    internal = {target: [it for it in items if it in targets] for target, items in targets.items()}
+    depths = {}
+
+    def depth(target):
+        if target not in depths:
+            depths[target] = 0  # guards against cycles
+            depths[target] = 1 + max((depth(it) for it in internal[target]), default=-1)
+        return depths[target]
+
+    rows = []
+    for target in sorted(targets, key=lambda it: (-depth(it), it)):
+        requires = []
+        for item in targets[target]:
+            name = component_name(item) if item in targets else item
+            if (item in targets or item in EXTERNAL_COMPONENTS) and name not in requires:
+                requires.append(name)
+        if not internal[target]:
+            requires.append(BASE_COMPONENT)
+        component, libs = RENAMED_LIBRARIES.get(target, (target, [target]))
+        rows.append([target, component, libs, requires])
+    return rows
+
+
+def parse_predicate(text: str) -> Dict:
+    if text == "default":
+        return {}
+    when = {}
+    for condition in text.split(","):
+        key, value = condition.split("=", 1)
+        when[key] = {"True": True, "False": False}.get(value, value)
+    return when
+
+
+def write_components_file(path: Path, tables: List[Dict]):
+    # One component per line, to keep the diffs of the file readable
+    lines = ['{', ' "tables": [']
+    for index, table in enumerate(tables):
+        lines.append(f'  {{"when": {json.dumps(table["when"])}, "components": [')
+        rows = [f'   {json.dumps(row)}' for row in table["components"]]
+        lines.append(",\n".join(rows))
+        lines.append('  ]}' + ("," if index < len(tables) - 1 else ""))
+    lines += [' ]', '}', '']
+    path.write_text("\n".join(lines), encoding="utf-8")
+
+
+def main(args=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--table", nargs=2, action="append", required=True, metavar=("WHEN", "EXPORT_FILE"),
+                        help="predicate (key=value[,key=value...] on 'os' and 'shared', or 'default') and CMake "
+                             "export file of a build. Tables are written in the order they are given")
+    parser.add_argument("--namespace", default="",
+                        help="namespace of the exported targets, removed from the names of the components")
+    parser.add_argument("-o", "--output", type=Path, default=Path(__file__).parent / "components.json",
+                        help="file to write (default: components.json next to this script)")
+    ns = parser.parse_args(args)
+
+    tables = []
+    for when, export_file in ns.table:
+        targets = parse_export_file(Path(export_file), ns.namespace)
+        tables.append({"when": parse_predicate(when), "components": build_table(targets)})
+    write_components_file(ns.output, tables)
+    return 0
+
+
+if __name__ == "__main__":
+    import sys
+    sys.exit(main())
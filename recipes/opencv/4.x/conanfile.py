@@ -219,6 +219,7 @@ class OpenCVConan(ConanFile):
     default_options.update({_name: False for _name in OPENCV_EXTRA_MODULES_OPTIONS})
 
     short_paths = True
+    _cached_opencv_modules_graph = None
 
     @property
     def _is_cl_like(self):
@@ -933,38 +934,67 @@ class OpenCVConan(ConanFile):
 
         return opencv_modules
 
-    def _get_mandatory_disabled_options(self, opencv_modules):
+    @property
+    def _opencv_modules_graph(self):
+        """
+        Part of _opencv_modules which doesn't depend on option values, computed once:
+        for each module, whether it has an option, and the transitive closure of its mandatory options
+        """
+        if self._cached_opencv_modules_graph is None:
+            mandatory_options = {}
+            has_option = {}
+            for module, values in self._opencv_modules.items():
+                mandatory_options[module] = values.get("mandatory_options", [])
+                has_option[module] = not values.get("no_option")
+
+            closure = {}
+            def collect_transitive_options(option):
+                if option not in closure:
+                    closure[option] = frozenset()  # guard against cycles
+                    options = set()
+                    for mandatory_option in mandatory_options.get(option, []):
+                        options.add(mandatory_option)
+                        options.update(collect_transitive_options(mandatory_option))
+                    closure[option] = frozenset(options)
+                return closure[option]
+
+            for module in mandatory_options:
+                collect_transitive_options(module)
+
+            self._cached_opencv_modules_graph = {
+                module: {
+                    "has_option": has_option[module],
+                    "mandatory_options": mandatory_options[module],
+                    "transitive_mandatory_options": closure[module],
+                }
+                for module in mandatory_options
+            }
+        return self._cached_opencv_modules_graph
+
+    def _get_mandatory_disabled_options(self):
         direct_options_to_enable = {}
         transitive_options_to_enable = {}
 
-        # Check which direct options have to be enabled
-        base_options = [option for option, values in opencv_modules.items()
-                        if not values.get("no_option") and self.options.get_safe(option)]
+        graph = self._opencv_modules_graph
+        base_options = [option for option, values in graph.items()
+                        if values["has_option"] and self.options.get_safe(option)]
         for base_option in base_options:
-            for mandatory_option in opencv_modules.get(base_option, {}).get("mandatory_options", []):
-                if not self.options.get_safe(mandatory_option):
+            direct_options = graph[base_option]["mandatory_options"]
+            for mandatory_option in graph[base_option]["transitive_mandatory_options"]:
+                if self.options.get_safe(mandatory_option):
+                    continue
+                if mandatory_option in direct_options:
                     direct_options_to_enable.setdefault(mandatory_option, set()).add(base_option)
-
-        # Now traverse the graph to check which transitive options have to be enabled
-        def collect_transitive_options(base_option, option):
-            for mandatory_option in opencv_modules.get(option, {}).get("mandatory_options", []):
-                if not self.options.get_safe(mandatory_option):
-                    if mandatory_option not in transitive_options_to_enable:
-                        transitive_options_to_enable[mandatory_option] = set()
-                        collect_transitive_options(base_option, mandatory_option)
-                    if base_option not in direct_options_to_enable.get(mandatory_option, set()):
-                        transitive_options_to_enable[mandatory_option].add(base_option)
-
-        for base_option in base_options:
-            collect_transitive_options(base_option, base_option)
+                else:
+                    transitive_options_to_enable.setdefault(mandatory_option, set()).add(base_option)
 
         return {
             "direct": direct_options_to_enable,
             "transitive": transitive_options_to_enable,
         }
 
-    def _solve_internal_dependency_graph(self, opencv_modules):
-        disabled_options = self._get_mandatory_disabled_options(opencv_modules)
+    def _solve_internal_dependency_graph(self):
+        disabled_options = self._get_mandatory_disabled_options()
         direct_options_to_enable = disabled_options["direct"]
         transitive_options_to_enable = disabled_options["transitive"]
 
@@ -1015,8 +1045,8 @@ class OpenCVConan(ConanFile):
                         "cudaarithm", "cudabgsegm", "cudacodec", "cudafeatures2d", "cudafilters", "cudaimgproc",
                         "cudalegacy", "cudaobjdetect", "cudaoptflow", "cudastereo", "cudawarping",
                     ])
-                for option, values in self._opencv_modules.items():
-                    if option not in filtered_options and not values.get("no_option"):
+                for option, values in self._opencv_modules_graph.items():
+                    if option not in filtered_options and values["has_option"]:
                         try:
                             if hasattr(self.options, option):
                                 setattr(self.options, option, True)
@@ -1039,7 +1069,7 @@ class OpenCVConan(ConanFile):
             self.options.gapi = self.options.with_ade
 
         # Call this first before any further manipulation of options based on other options
-        self._solve_internal_dependency_graph(self._opencv_modules)
+        self._solve_internal_dependency_graph()
 
         if not self.options.dnn:
             self.options.rm_safe("dnn_cuda")
@@ -1173,8 +1203,8 @@ class OpenCVConan(ConanFile):
         del self.info.options.contrib_sfm
         del self.info.options.with_ade
 
-    def _check_mandatory_options(self, opencv_modules):
-        disabled_options = self._get_mandatory_disabled_options(opencv_modules)
+    def _check_mandatory_options(self):
+        disabled_options = self._get_mandatory_disabled_options()
         direct_disabled_mandatory_options = disabled_options["direct"]
         transitive_disabled_mandatory_options = disabled_options["transitive"]
 
@@ -1198,7 +1228,7 @@ class OpenCVConan(ConanFile):
             raise ConanInvalidConfiguration(message)
 
     def validate(self):
-        self._check_mandatory_options(self._opencv_modules)
+        self._check_mandatory_options()
         if self.settings.compiler.get_safe("cppstd"):
             check_min_cppstd(self, 11)
         if self.options.shared and self._is_cl_like and self._is_cl_like_static_runtime:
@@ -1593,7 +1623,7 @@ class OpenCVConan(ConanFile):
         self._create_cmake_module_variables(os.path.join(self.package_folder, self._module_vars_rel_path))
 
         # TODO: to remove in conan v2 once cmake_find_package* generators removed
-        targets_mapping = {self._cmake_target(k): f"opencv::{self._cmake_target(k)}" for k in self._opencv_modules.keys()}
+        targets_mapping = {self._cmake_target(k): f"opencv::{self._cmake_target(k)}" for k in self._opencv_modules_graph.keys()}
         if self.options.world:
             targets_mapping.update({"opencv_world": "opencv::opencv_world"})
         self._create_cmake_module_alias_targets(
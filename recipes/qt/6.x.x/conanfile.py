@@ -1,5 +1,5 @@
-import configparser
 import glob
+import json
 import os
 import platform
 import textwrap
@@ -129,44 +129,39 @@ class QtConan(ConanFile):
 
     short_paths = True
 
-    _submodules_tree = None
+    _cached_module_index = None
 
     @property
     def _settings_build(self):
         return getattr(self, "settings_build", self.settings)
 
+    @property
+    def _module_index(self):
+        """
+        qtmodules<version>.json, generated from qtmodules<version>.conf by rebuild-module-index.py:
+        modules with an option (status, path, depends), transitive closure of their dependencies and its reverse
+        """
+        if self._cached_module_index:
+            return self._cached_module_index
+        index_path = os.path.join(self.recipe_folder, f"qtmodules{self.version}.json")
+        assert os.path.isfile(index_path), f"no qtmodules{self.version}.json file, run rebuild-module-index.py"
+        with open(index_path, encoding="utf-8") as f:
+            self._cached_module_index = json.load(f)
+        for modulename, module in self._cached_module_index["modules"].items():
+            if module["status"] not in self._module_statuses:
+                raise ConanException(f"module {modulename} has status {module['status']} which is not in self._module_statuses {self._module_statuses}")
+            assert modulename in self._submodules, f"module {modulename} not in self._submodules"
+        return self._cached_module_index
+
     @property
     def _get_module_tree(self):
-        if self._submodules_tree:
-            return self._submodules_tree
-        config = configparser.ConfigParser()
-        config.read(os.path.join(self.recipe_folder, f"qtmodules{self.version}.conf"))
-        self._submodules_tree = {}
-        assert config.sections(), f"no qtmodules.conf file for version {self.version}"
-        for s in config.sections():
-            section = str(s)
-            assert section.startswith("submodule ")
-            assert section.count('"') == 2
-            modulename = section[section.find('"') + 1: section.rfind('"')]
-            if modulename in ["qtbase", "qtqa", "qtrepotools"]:
-                continue
-            status = str(config.get(section, "status"))
-            if status not in ["obsolete", "ignore", "additionalLibrary"]:
-                if status not in self._module_statuses:
-                    raise ConanException(f"module {modulename} has status {status} which is not in self._module_statuses {self._module_statuses}")
-                assert modulename in self._submodules, f"module {modulename} not in self._submodules"
-                self._submodules_tree[modulename] = {"status": status,
-                                "path": str(config.get(section, "path")), "depends": []}
-                if config.has_option(section, "depends"):
-                    self._submodules_tree[modulename]["depends"] = [str(i) for i in config.get(section, "depends").split()]
-
-        return self._submodules_tree
+        return self._module_index["modules"]
 
     def export_sources(self):
         export_conandata_patches(self)
 
     def export(self):
-        copy(self, f"qtmodules{self.version}.conf", self.recipe_folder, self.export_folder)
+        copy(self, f"qtmodules{self.version}.json", self.recipe_folder, self.export_folder)
 
     def config_options(self):
         if self.settings.os not in ["Linux", "FreeBSD"]:
@@ -237,23 +232,24 @@ class QtConan(ConanFile):
 
         self.output.info(f"qt6: requested modules {list(requested_modules)}")
 
-        required_modules =  {}
+        # All the modules the requested ones depend on, directly or transitively
+        closure = self._module_index["closure"]
+        required_modules = set()
         for module in requested_modules:
-            deps = self._get_module_tree[module]["depends"]
-            for dep in deps:
-                required_modules.setdefault(dep,[]).append(module)
+            required_modules.update(closure[module])
 
-        required_but_disabled = [m for m in required_modules.keys() if self.options.get_safe(m) == False]
+        required_but_disabled = [m for m in required_modules if self.options.get_safe(m) == False]
         if required_modules:
-            self._debug_output(f"qt6: required_modules modules {list(required_modules.keys())}")
+            self._debug_output(f"qt6: required_modules modules {list(required_modules)}")
         if required_but_disabled:
+            reverse_closure = self._module_index["reverse_closure"]
             required_by = set()
             for m in required_but_disabled:
-                required_by.update(required_modules[m])
+                required_by.update(requested_modules.intersection(reverse_closure[m]))
             raise ConanInvalidConfiguration(f"Modules {required_but_disabled} are explicitly disabled, "
                                             f"but are required by {list(required_by)}, enabled by other options")
 
-        enabled_modules = requested_modules.union(set(required_modules.keys()))
+        enabled_modules = requested_modules.union(required_modules)
         enabled_modules.discard("qtbase")
 
         for module in list(enabled_modules):
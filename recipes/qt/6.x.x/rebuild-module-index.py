@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+
+"""
+Generate the qtmodules<version>.json index loaded by conanfile.py from the qtmodules<version>.conf files
+(copies of the .gitmodules file of qt5.git).
+
+The index contains the modules which can be enabled with an option of the recipe (with their status, path and
+direct dependencies), and the transitive closure of their dependencies and its reverse.
+
+Re-run this script after adding or updating a qtmodules<version>.conf file.
+"""
+
+import argparse
+import configparser
+import json
+from pathlib import Path
+from typing import Dict, List
+
+# Modules which are always built (qtbase) or never built: no option in the recipe
+IGNORED_MODULES = ("qtbase", "qtqa", "qtrepotools")
+IGNORED_STATUSES = ("obsolete", "ignore", "additionalLibrary")
+
+
+def parse_conf(path: Path) -> Dict[str, Dict]:
+    config = configparser.ConfigParser()
+    config.read(path)
+    if not config.sections():
+        raise Exception(f"{path} has no submodule")
+    modules = {}
+    for section in config.sections():
+        if not section.startswith("submodule ") or section.count('"') != 2:
+            raise Exception(f"{path}: unexpected section '{section}'")
+        name = section[section.find('"') + 1: section.rfind('"')]
+        modules[name] = {
+            "status": config.get(section, "status"),
+            "path": config.get(section, "path"),
+            "depends": config.get(section, "depends").split() if config.has_option(section, "depends") else [],
+        }
+    return modules
+
+
+def transitive_closure(graph: Dict[str, List[str]]) -> Dict[str, List[str]]:
+    closure = {}
+    for module in graph:
+        visited = set()
+        pending = list(graph[module])
+        while pending:
+            dependency = pending.pop()
+            if dependency not in visited:
+                visited.add(dependency)
+                pending.extend(graph.get(dependency, []))
+        visited.discard(module)
+        closure[module] = sorted(visited)
+    return closure
+
+
+def build_index(path: Path) -> Dict:
+    all_modules = parse_conf(path)
+    closure = transitive_closure({name: module["depends"] for name, module in all_modules.items()})
+
+    modules = {name: module for name, module in all_modules.items()
+               if name not in IGNORED_MODULES and module["status"] not in IGNORED_STATUSES}
+    reverse_closure = {}
+    for name in modules:
+        for dependency in closure[name]:
+            reverse_closure.setdefault(dependency, []).append(name)
+
+    return {
+        "modules": modules,
+        "closure": {name: closure[name] for name in modules},
+        "reverse_closure": {name: sorted(dependents) for name, dependents in sorted(reverse_closure.items())},
+    }
+
+
+def main(args=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("confs", nargs="*", type=Path,
+                        help="qtmodules<version>.conf files to convert (default: all of them, next to this script)")
+    ns = parser.parse_args(args)
+
+    confs = ns.confs or sorted(Path(__file__).parent.glob("qtmodules*.conf"))
+    for conf in confs:
+        output = conf.with_suffix(".json")
+        print(f"Creating {output}")
+        with output.open("w") as fout:
+            json.dump(build_index(conf), fout, indent=1, sort_keys=True)
+            fout.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    import sys
+    sys.exit(main())
@@ -0,0 +1,502 @@
+"""
+Build references of ConanCenterIndex in the configurations of .c3i/config_v2.yml, in the order
+given by the requirements of the recipes (from the catalogue of recipe_catalogue.py).
+
+Every reference is built once per configuration, after the references it requires (any version of
+them in the set being built), and the builds which do not depend on each other run concurrently
+within a CPU and memory budget. Each build takes the resources of its pod size (pod_size in
+config_v2.yml), its timeout comes from build_single_reference (large_timeout_references get the
+large one). The results are kept in a state file: the builds which succeeded are not run again, the
+builds depending on a failed one are skipped, and the recorded durations are used to estimate the
+critical path printed by --dry-run. A result is only reused for the same profiles and the same recipe
+(blob hashes of its conanfile.py and conandata.yml in the catalogue), so that the builds are run
+again after a compiler bump or a change of the recipe.
+
+Examples:
+    python3 tools/build_scheduler.py --dry-run zlib openssl/3.3.2
+    python3 tools/build_scheduler.py --all --configuration linux-gcc --cpus 32 --memory 64
+    git diff --name-only origin/master | python3 tools/recipe_catalogue.py affected | \\
+        python3 tools/build_scheduler.py --dry-run
+
+Conan does not support concurrent accesses to its cache: every build runs in its own Conan home
+(<work-dir>/<configuration>/conan_homes/<name>-<version>, with the remotes and configuration of the
+current Conan home). The packages of a successful build are saved to an archive (conan cache save),
+which is restored in the Conan home of the builds requiring it (conan cache restore).
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shlex
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, NamedTuple
+
+import yaml
+
+import recipe_catalogue
+
+C3I_CONFIG = os.path.join(recipe_catalogue.ROOT, ".c3i", "config_v2.yml")
+DEFAULT_WORK_DIR = os.path.join(recipe_catalogue.ROOT, ".build_scheduler")
+DEFAULT_COMMAND = "conan create {recipe_folder} --version {version} -pr:h {host_profile} -pr:b {build_profile} " \
+                  "--build=missing:{name}/{version} -c tools.build:jobs={cpus}"
+# Configuration of the current Conan home copied to the Conan home of each build
+CONAN_HOME_FILES = ("global.conf", "remotes.json", "settings_user.yml", "profiles", "extensions")
+
+# Estimate of the duration of a build never run before, in minutes (large_timeout_references take
+# longer, in the ratio of their timeouts)
+DEFAULT_MINUTES = 10
+
+
+class Resources(NamedTuple):
+    cpus: int
+    memory_gb: int
+
+
+# Resources of the pods of C3I, by pod size
+POD_SIZES = {
+    "regular": Resources(cpus=4, memory_gb=8),
+    "xlarge": Resources(cpus=8, memory_gb=32),
+}
+
+
+class Configuration(NamedTuple):
+    id: str
+    host: Dict[str, str]   # settings of the host profile
+    build: Dict[str, str]  # settings of the build profile
+
+
+class Build:
+    __slots__ = ("name", "version", "folder", "configuration", "fingerprint", "requires", "dependents", "pod",
+                 "timeout", "minutes", "priority", "status")
+
+    def __init__(self, name, version, folder, configuration, fingerprint, pod, timeout, minutes):
+        self.name = name
+        self.version = version
+        self.folder = folder
+        self.configuration = configuration
+        self.fingerprint = fingerprint  # {"profiles": hash, "recipe": hash}, a recorded success must match
+        self.requires = []
+        self.dependents = []
+        self.pod = pod
+        self.timeout = timeout
+        self.minutes = minutes
+        self.priority = 0.0  # estimated minutes from its start to the end of its longest chain of dependents
+        self.status = None
+
+    @property
+    def key(self):
+        return f"{self.name}/{self.version}@{self.configuration.id}"
+
+
+def _expand(settings):
+    """Combinations of the settings of a configuration of config_v2.yml: a value is a list of
+    alternatives, an alternative can be a mapping {value: subsettings} (eg. compiler: [{gcc: {...}}])"""
+    combinations = [{}]
+    for key, values in settings.items():
+        alternatives = []
+        for value in values if isinstance(values, list) else [values]:
+            if isinstance(value, dict):
+                for item, subsettings in value.items():
+                    alternatives.extend({key: str(item), **it} for it in _expand(subsettings or {}))
+            else:
+                alternatives.append({key: str(value)})
+        combinations = [{**combination, **alternative} for combination in combinations for alternative in alternatives]
+    return combinations
+
+
+def load_configurations(config):
+    configurations = []
+    for entry in config.get("configurations", []):
+        combinations = [it for content in entry.get("content", []) for it in _expand(content)]
+        varying = [key for key in combinations[0] if len({it.get(key) for it in combinations}) > 1] if combinations else []
+        for host in combinations:
+            suffix = "-".join(host[key] for key in varying)
+            build = dict(host, **{key: str(value) for key, value in (entry.get("build_profile") or {}).items()})
+            configurations.append(Configuration(f"{entry['id']}-{suffix}" if suffix else entry["id"], host, build))
+    return configurations
+
+
+def _pod_size(config, name, version):
+    pod = "regular"
+    for size, references in (config.get("pod_size") or {}).items():
+        if f"{name}/{version}" in references:
+            return size  # name/version takes preference
+        if name in references:
+            pod = size
+    return pod if pod in POD_SIZES else "regular"
+
+
+def _profile(settings):
+    return "[settings]\n" + "".join(f"{key}={value}\n" for key, value in settings.items())
+
+
+def _profiles_hash(configuration):
+    content = f"{_profile(configuration.host)}\n{_profile(configuration.build)}"
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+def _recipe_hashes(connection):
+    """{(recipe, folder): hash of the blob hashes of the files of the folder in the catalogue}"""
+    blobs = {}
+    for path, blob, recipe, folder in connection.execute(
+            "SELECT path, blob, recipe, folder FROM files WHERE folder IS NOT NULL ORDER BY path"):
+        blobs.setdefault((recipe, folder), []).append(f"{path} {blob}")
+    return {key: hashlib.sha256("\n".join(lines).encode()).hexdigest() for key, lines in blobs.items()}
+
+
+def write_profiles(work_dir, configurations):
+    """Writes the host and build profiles of the configurations, returns their paths by configuration id"""
+    profiles = {}
+    for configuration in configurations:
+        paths = profiles[configuration.id] = {}
+        for context in ("host", "build"):
+            paths[context] = os.path.join(work_dir, configuration.id, "profiles", context)
+            os.makedirs(os.path.dirname(paths[context]), exist_ok=True)
+            with open(f"{paths[context]}.tmp", "w") as f:
+                f.write(_profile(getattr(configuration, context)))
+            os.replace(f"{paths[context]}.tmp", paths[context])
+    return profiles
+
+
+def plan(connection, config, references, configurations, state):
+    """Returns the builds of the references (list of (name, version)) in each configuration, with
+    their requirements among them, in a topological order (requirements first)"""
+    tasks = config.get("tasks", {}).get("build_single_reference", {})
+    timeout = tasks.get("timeout_minutes", 600)
+    large_timeout = tasks.get("large_timeout_minutes", timeout)
+    large_references = set(tasks.get("large_timeout_references") or [])
+
+    folders = dict(((recipe, version), folder) for recipe, version, folder in
+                   connection.execute("SELECT recipe, version, folder FROM versions"))
+    recipe_hashes = _recipe_hashes(connection)
+    graph = recipe_catalogue.requirement_graph(connection)
+    versions = {}
+    for name, version in references:
+        versions.setdefault(name, []).append(version)
+
+    order = []
+    for configuration in configurations:
+        profiles_hash = _profiles_hash(configuration)
+        builds = {}
+        for name, version in references:
+            folder = folders[(name, version)]
+            fingerprint = {"profiles": profiles_hash, "recipe": recipe_hashes.get((name, folder))}
+            build_timeout = large_timeout if name in large_references else timeout
+            build = Build(name, version, folder, configuration, fingerprint, _pod_size(config, name, version),
+                          build_timeout, DEFAULT_MINUTES * build_timeout / timeout)
+            recorded = state.get(build.key, {})
+            build.minutes = recorded.get("minutes", build.minutes)
+            if recorded.get("status") == "success" and \
+                    all(recorded.get(field) == value for field, value in fingerprint.items()):
+                build.status = "reused"
+            builds[name, version] = build
+        for (name, _), build in builds.items():
+            for requirement in sorted(graph.get(name, ())):
+                for version in versions.get(requirement, []):
+                    build.requires.append(builds[requirement, version])
+                    builds[requirement, version].dependents.append(build)
+        order.extend(_topological_order(list(builds.values())))
+
+    for build in reversed(order):
+        build.priority = build.minutes + max((it.priority for it in build.dependents), default=0)
+    return order
+
+
+def _topological_order(builds):
+    """Kahn's algorithm. The statically extracted requirements can have cycles (eg. between conditional
+    requirements): they are broken at the build with the fewest pending requirements"""
+    pending = {build: len(build.requires) for build in builds}
+    ready = [build for build, count in pending.items() if not count]
+    order = []
+    while pending:
+        if not ready:
+            build = min(pending, key=lambda it: (pending[it], it.key))
+            print(f"warning: cycle in the requirements of {build.key}, built before "
+                  f"{', '.join(it.key for it in build.requires if it in pending)}", file=sys.stderr)
+            ready.append(build)
+        build = ready.pop()
+        if build not in pending:
+            continue
+        del pending[build]
+        order.append(build)
+        for dependent in build.dependents:
+            if dependent in pending:
+                pending[dependent] -= 1
+                if not pending[dependent]:
+                    ready.append(dependent)
+    return order
+
+
+def critical_path(order):
+    """Longest chain of builds (by estimated duration) of a plan"""
+    finish = {}
+    previous = {}
+    for build in order:
+        start = 0.0
+        for requirement in build.requires:
+            if finish.get(requirement, 0.0) > start:
+                start, previous[build] = finish[requirement], requirement
+        finish[build] = start + (0.0 if build.status == "reused" else build.minutes)
+    if not finish:
+        return [], 0.0
+    build = max(order, key=lambda it: finish[it])
+    total = finish[build]
+    path = [build]
+    while path[-1] in previous:
+        path.append(previous[path[-1]])
+    return list(reversed(path)), total
+
+
+def _fits(build, used, budget):
+    # A build larger than the whole budget runs alone
+    size = POD_SIZES[build.pod]
+    if not used.cpus and not used.memory_gb:
+        return True
+    return used.cpus + size.cpus <= budget.cpus and used.memory_gb + size.memory_gb <= budget.memory_gb
+
+
+def _add(used, build, sign=1):
+    size = POD_SIZES[build.pod]
+    return Resources(used.cpus + sign * size.cpus, used.memory_gb + sign * size.memory_gb)
+
+
+def schedule(order, budget, max_jobs, run):
+    """Run the builds of a plan with 'run(build) -> status' ('success' or 'failed'), concurrently
+    within the budget, the ready builds with the longest chain of dependents first. The cycles of
+    requirements are broken as in _topological_order()"""
+    waiting = {build: sum(1 for it in build.requires if it.status != "reused") for build in order
+               if build.status != "reused"}
+    ready = [build for build, count in waiting.items() if not count]
+    for build in ready:
+        del waiting[build]
+    running = {}
+    used = Resources(0, 0)
+
+    def finished(build):
+        for dependent in build.dependents:
+            if dependent in waiting:
+                waiting[dependent] -= 1
+                if not waiting[dependent]:
+                    del waiting[dependent]
+                    ready.append(dependent)
+
+    with ThreadPoolExecutor(max_workers=max_jobs or len(order) or 1) as executor:
+        while ready or running or waiting:
+            if not ready and not running:
+                build = min(waiting, key=lambda it: (waiting[it], it.key))
+                del waiting[build]
+                ready.append(build)
+            ready.sort(key=lambda it: (it.priority, it.key))
+            for build in reversed(list(ready)):
+                if any(it.status in ("failed", "skipped") for it in build.requires):
+                    ready.remove(build)
+                    build.status = "skipped"
+                    finished(build)
+                elif (max_jobs is None or len(running) < max_jobs) and _fits(build, used, budget):
+                    ready.remove(build)
+                    used = _add(used, build)
+                    running[executor.submit(run, build)] = build
+            if not running:
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                build = running.pop(future)
+                used = _add(used, build, -1)
+                build.status = future.result()
+                finished(build)
+
+
+def _upstream(build):
+    """The builds of the plan required by a build, transitively"""
+    upstream = {}
+    pending = list(build.requires)
+    while pending:
+        requirement = pending.pop()
+        if requirement.key not in upstream:
+            upstream[requirement.key] = requirement
+            pending.extend(requirement.requires)
+    return sorted(upstream.values(), key=lambda it: it.key)
+
+
+def _init_conan_home(home):
+    """Empty Conan home with the configuration of the current one"""
+    shutil.rmtree(home, ignore_errors=True)
+    os.makedirs(home)
+    current = os.environ.get("CONAN_HOME") or os.path.join(os.path.expanduser("~"), ".conan2")
+    for name in CONAN_HOME_FILES:
+        source = os.path.join(current, name)
+        if os.path.isdir(source):
+            shutil.copytree(source, os.path.join(home, name))
+        elif os.path.isfile(source):
+            shutil.copy2(source, home)
+
+
+def _runner(ns, profiles, state, state_lock):
+    def archive(build):
+        return os.path.join(ns.work_dir, build.configuration.id, "packages", f"{build.name}-{build.version}.tgz")
+
+    def run(build):
+        folder = os.path.join(ns.work_dir, build.configuration.id)
+        paths = profiles[build.configuration.id]
+        home = os.path.join(folder, "conan_homes", f"{build.name}-{build.version}")
+        _init_conan_home(home)
+        # The upstream archives are complete: they are renamed once saved, before their dependents start
+        commands = [f"conan cache restore {shlex.quote(archive(it))}" for it in _upstream(build)
+                    if os.path.isfile(archive(it))]
+        commands.append(ns.command.format(
+            recipe_folder=shlex.quote(os.path.join(recipe_catalogue.ROOT, "recipes", build.name, build.folder)),
+            name=build.name, version=build.version, host_profile=shlex.quote(paths["host"]),
+            build_profile=shlex.quote(paths["build"]), cpus=POD_SIZES[build.pod].cpus))
+        os.makedirs(os.path.dirname(archive(build)), exist_ok=True)
+        commands.append(f"conan cache save {shlex.quote(f'{build.name}/{build.version}:*')} "
+                        f"--file {shlex.quote(archive(build) + '.tmp')}")
+        log = os.path.join(folder, "logs", f"{build.name}-{build.version}.log")
+        os.makedirs(os.path.dirname(log), exist_ok=True)
+        env = dict(os.environ, CONAN_HOME=home)
+
+        print(f"[start] {build.key}", flush=True)
+        start = time.monotonic()
+        status = "success"
+        with open(log, "w") as output:
+            for command in commands:
+                output.write(f"$ {command}\n")
+                output.flush()
+                try:
+                    process = subprocess.run(command, shell=True, stdout=output, stderr=subprocess.STDOUT, env=env,
+                                             timeout=max(build.timeout * 60 - (time.monotonic() - start), 1))
+                except subprocess.TimeoutExpired:
+                    output.write(f"Timeout of {build.timeout} min expired\n")
+                    status = "failed"
+                    break
+                if process.returncode != 0:
+                    status = "failed"
+                    break
+        if status == "success":
+            os.replace(archive(build) + ".tmp", archive(build))
+            shutil.rmtree(home, ignore_errors=True)  # its packages are in the archive
+        minutes = (time.monotonic() - start) / 60
+        print(f"[{status}] {build.key} ({minutes:.1f} min, log: {log})", flush=True)
+
+        with state_lock:
+            state[build.key] = dict(build.fingerprint, status=status, minutes=round(minutes, 2))
+            _save_state(ns.state, state)
+        return status
+    return run
+
+
+def _save_state(path, state):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(f"{path}.tmp", "w") as f:
+        json.dump(state, f, indent=1, sort_keys=True)
+    os.replace(f"{path}.tmp", path)
+
+
+def _memory_gb():
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") // 2 ** 30
+    except (AttributeError, ValueError, OSError):
+        return 16
+
+
+def _references(connection, arguments, all_references):
+    """(name, version) of the arguments: 'name/version', or 'name' for all its versions"""
+    query = "SELECT recipe, version FROM versions"
+    if all_references:
+        return sorted(connection.execute(query))
+    references = []
+    for argument in arguments:
+        name, _, version = argument.strip().partition("/")
+        if version:
+            references.append((name, version))
+        else:
+            references.extend(connection.execute(query + " WHERE recipe = ? ORDER BY version", (name,)))
+    return sorted(set(references))
+
+
+def main(args=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("references", nargs="*",
+                        help="references (name/version, or name for all the versions) to build. "
+                             "If none is given, they are read from stdin")
+    parser.add_argument("--all", action="store_true", help="build all the references of the index")
+    parser.add_argument("--configuration", action="append",
+                        help="only build in this configuration of the C3I config (eg. linux-gcc, default: all)")
+    parser.add_argument("--c3i-config", default=C3I_CONFIG, help=f"C3I configuration (default: {C3I_CONFIG})")
+    parser.add_argument("--dry-run", action="store_true", help="print the plan and its critical path, build nothing")
+    parser.add_argument("--cpus", type=int, default=os.cpu_count() or 1, help="CPUs available for the builds")
+    parser.add_argument("--memory", type=int, default=_memory_gb(), help="memory available for the builds, in GB")
+    parser.add_argument("--work-dir", default=DEFAULT_WORK_DIR,
+                        help="profiles, logs, Conan homes and package archives of the builds")
+    parser.add_argument("--state", help="results of the previous runs (default: <work-dir>/state.json)")
+    parser.add_argument("--command", default=DEFAULT_COMMAND,
+                        help="command running a build in its Conan home, with {recipe_folder}, {name}, {version}, "
+                             "{host_profile}, {build_profile} and {cpus} placeholders")
+    parser.add_argument("--database", default=recipe_catalogue.DEFAULT_DATABASE, help="recipes catalogue")
+    ns = parser.parse_args(args)
+    ns.state = ns.state or os.path.join(ns.work_dir, "state.json")
+
+    with open(ns.c3i_config) as f:
+        config = yaml.safe_load(f)
+    configurations = load_configurations(config)
+    if ns.configuration:
+        configurations = [it for it in configurations
+                          if it.id in ns.configuration or it.id.rsplit("-", 1)[0] in ns.configuration]
+        if not configurations:
+            parser.error(f"no configuration {', '.join(ns.configuration)} in {ns.c3i_config}")
+
+    try:
+        connection = recipe_catalogue.connect(ns.database)
+    except ValueError as error:
+        parser.error(str(error))
+    recipe_catalogue.update(connection)
+    arguments = ns.references or ([] if ns.all else sys.stdin.read().split())
+    references = _references(connection, arguments, ns.all)
+    unknown = [f"{name}/{version}" for name, version in references if not connection.execute(
+        "SELECT 1 FROM versions WHERE recipe = ? AND version = ?", (name, version)).fetchone()]
+    if unknown:
+        parser.error(f"unknown references: {', '.join(unknown)}")
+
+    try:
+        with open(ns.state) as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        state = {}
+    order = plan(connection, config, references, configurations, state)
+    connection.close()
+
+    parallel = config.get("tasks", {}).get("build_single_reference", {}).get("parallel_strategy", "unlimited")
+    max_jobs = None if parallel == "unlimited" else int(parallel)
+    budget = Resources(ns.cpus, ns.memory)
+
+    if ns.dry_run:
+        path, total = critical_path(order)
+        reused = sum(1 for it in order if it.status == "reused")
+        print(f"{len(order)} builds ({len(references)} references x {len(configurations)} configurations), "
+              f"{reused} reused from {ns.state}")
+        print(f"Critical path, estimated {total:.0f} min:")
+        for build in path:
+            minutes = "reused" if build.status == "reused" else f"{build.minutes:.0f} min"
+            print(f"  {build.key:60} {minutes:>8}  {build.pod}")
+        print("Order:")
+        for build in order:
+            requires = ", ".join(f"{it.name}/{it.version}" for it in build.requires)
+            print(f"  {build.key:60} {build.status or '':6} {f'requires {requires}' if requires else ''}")
+        return 0
+
+    profiles = write_profiles(ns.work_dir, configurations)
+    run = _runner(ns, profiles, state, threading.Lock())
+    schedule(order, budget, max_jobs, run)
+    failed = [it for it in order if it.status not in ("success", "reused")]
+    for build in failed:
+        print(f"{build.status or 'not built'}: {build.key}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,251 @@
+"""
+Static extraction of the requirements of a recipe: the references given to self.requires(),
+self.tool_requires(), self.build_requires() and self.test_requires() in requirements() and
+build_requirements() (and the methods they call), and the class attributes of the same names, and
+python_requires.
+
+The conanfile.py is parsed, not executed: the requirements declared in a branch (if/else, loop,
+conditional expression, exception handler) are reported with the condition of this branch, and the
+references built at runtime (eg. f"grpc/{self.version}") are reported as written, with the name of the
+required recipe when it is a literal. The references returned by a method of the recipe (eg.
+self._require("glslang")) and the values of a mapping of the class (eg. self.conan_requires[key]) are
+followed.
+"""
+
+import ast
+from typing import List, NamedTuple, Optional
+
+KINDS = ("requires", "tool_requires", "build_requires", "test_requires", "python_requires")
+ENTRY_POINTS = ("requirements", "build_requirements")
+
+
+class Requirement(NamedTuple):
+    kind: str                 # requires, tool_requires, build_requires, test_requires or python_requires
+    name: Optional[str]       # name of the required recipe, None if it cannot be known statically
+    version: Optional[str]    # version or version range, as written
+    reference: str            # the reference, as written
+    context: str              # method where it is declared ('class' for the attributes)
+    condition: Optional[str]  # conditions of the branches where it is declared, None if unconditional
+
+
+def split_reference(reference):
+    """'name/version@user/channel#revision' -> (name, version); None for the parts which are not literal"""
+    name, separator, version = reference.partition("/")
+    if not separator or not name or "{" in name:
+        return None, None
+    for end in "@#":
+        version = version.partition(end)[0]
+    return name, version or None
+
+
+def _and(*conditions):
+    conditions = [it for it in conditions if it]
+    if not conditions:
+        return None
+    if len(conditions) == 1:
+        return conditions[0]
+    return " and ".join(f"({it})" if " or " in it else it for it in conditions)
+
+
+def _leaves(statements):
+    """Whether a block always leaves the method (its last statement returns or raises)"""
+    if not statements:
+        return False
+    last = statements[-1]
+    if isinstance(last, ast.If):
+        return _leaves(last.body) and _leaves(last.orelse)
+    return isinstance(last, (ast.Return, ast.Raise))
+
+
+def _conditions_after(node):
+    """Conditions of the statements following an 'if' whose branches may leave the method"""
+    test = ast.unparse(node.test)
+    if _leaves(node.body):
+        if len(node.orelse) == 1 and isinstance(node.orelse[0], ast.If):
+            return [f"not ({test})"] + _conditions_after(node.orelse[0])
+        return [f"not ({test})"]
+    if _leaves(node.orelse):
+        return [test]
+    return []
+
+
+def _template(node, recipe, env):
+    """Text of an f-string, with its replacement fields as '{expression}' ('{self.name}' is replaced
+    by the name of the recipe, when known, and the local variables holding one string by their value)"""
+    text = ""
+    for value in node.values:
+        if isinstance(value, ast.Constant):
+            text += str(value.value)
+            continue
+        expression = ast.unparse(value.value)
+        values = env.get(expression, []) if isinstance(value.value, ast.Name) else []
+        if recipe and expression == "self.name":
+            text += recipe
+        elif len(values) == 1 and isinstance(values[0][0], ast.Constant) and isinstance(values[0][0].value, str):
+            text += values[0][0].value
+        else:
+            text += "{" + expression + "}"
+    return text
+
+
+class _Extractor:
+    def __init__(self, methods, attributes, recipe):
+        self.methods = methods
+        self.attributes = attributes  # class attributes: {name: value}
+        self.recipe = recipe
+        self.requirements = []
+        self.depths = {}    # number of conditions at the entry of the methods being visited
+        self.returning = set()  # methods whose return values are being followed
+
+    def references(self, node, env):
+        """Returns the (reference, is_literal, condition) an expression can evaluate to"""
+        if isinstance(node, ast.Constant) and isinstance(node.value, str):
+            return [(node.value, True, None)]
+        if isinstance(node, ast.JoinedStr):
+            return [(_template(node, self.recipe, env), True, None)]
+        if self.recipe and ast.unparse(node) in ("self.ref", "str(self.ref)"):
+            # The recipe itself, eg. a tool_requires when cross-building
+            return [(f"{self.recipe}/{{self.version}}", True, None)]
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute) and node.func.attr == "format" and \
+                isinstance(node.func.value, ast.Constant) and isinstance(node.func.value.value, str) and \
+                "/" in node.func.value.value.partition("{")[0]:
+            # "zlib/{}".format(version): the name is literal
+            return [(node.func.value.value, True, None)]
+        if isinstance(node, ast.IfExp):
+            test = ast.unparse(node.test)
+            return [(reference, literal, _and(test, condition))
+                    for reference, literal, condition in self.references(node.body, env)] + \
+                   [(reference, literal, _and(f"not ({test})", condition))
+                    for reference, literal, condition in self.references(node.orelse, env)]
+        if isinstance(node, ast.Name) and node.id in env:
+            return [it for value, condition in env[node.id]
+                    for reference, literal, value_condition in self.references(value, env)
+                    for it in [(reference, literal, _and(condition, value_condition))]]
+        if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Add) and \
+                isinstance(node.left, ast.Constant) and isinstance(node.left.value, str):
+            # "zlib/" + version
+            return [(node.left.value + "{" + ast.unparse(node.right) + "}", True, None)]
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute) and \
+                isinstance(node.func.value, ast.Name) and node.func.value.id == "self" and \
+                node.func.attr in self.methods and node.func.attr not in self.returning:
+            return self.returned(self.methods[node.func.attr], node, env) or [(ast.unparse(node), False, None)]
+        if isinstance(node, ast.Subscript) and isinstance(node.value, ast.Attribute) and \
+                isinstance(node.value.value, ast.Name) and node.value.value.id == "self" and \
+                isinstance(self.attributes.get(node.value.attr), ast.Dict):
+            # self.conan_requires[key]: any value of the mapping
+            condition = f"{ast.unparse(node.slice)} in {ast.unparse(node.value)}"
+            return [(reference, literal, _and(condition, value_condition))
+                    for value in self.attributes[node.value.attr].values
+                    for reference, literal, value_condition in self.references(value, env)]
+        return [(ast.unparse(node), False, None)]
+
+    def returned(self, method, call, env):
+        """References returned by a method of the recipe, its parameters bound to the arguments of the call"""
+        parameters = [it.arg for it in method.args.args[1:]]
+        method_env = {}
+        for parameter, argument in zip(parameters, call.args):
+            method_env[parameter] = env[argument.id] if isinstance(argument, ast.Name) and argument.id in env \
+                else [(argument, None)]
+        self.returning.add(method.name)
+        try:
+            return [it for statement in ast.walk(method)
+                    if isinstance(statement, ast.Return) and statement.value is not None and
+                    not (isinstance(statement.value, ast.Constant) and statement.value.value is None)
+                    for it in self.references(statement.value, method_env)]
+        finally:
+            self.returning.discard(method.name)
+
+    def add(self, kind, node, context, conditions, env):
+        for reference, literal, condition in self.references(node, env):
+            name, version = split_reference(reference) if literal else (None, None)
+            self.requirements.append(Requirement(kind, name, version, reference, context, _and(*conditions, condition)))
+
+    def visit_method(self, name, conditions, stack):
+        if name in stack:
+            return
+        self.depths[name] = len(conditions)
+        self.visit_body(self.methods[name].body, name, conditions, {}, stack + (name,))
+
+    def visit_body(self, statements, context, conditions, env, stack):
+        """Visits a block: the statements after an 'if' whose branch leaves the method are under the
+        condition of the other branch"""
+        for statement in statements:
+            self.visit(statement, context, conditions, env, stack)
+            if isinstance(statement, ast.If):
+                conditions = conditions + _conditions_after(statement)
+
+    def visit(self, node, context, conditions, env, stack):
+        if isinstance(node, ast.If):
+            test = ast.unparse(node.test)
+            self.visit_body(node.body, context, conditions + [test], env, stack)
+            self.visit_body(node.orelse, context, conditions + [f"not ({test})"], env, stack)
+            return
+        if isinstance(node, (ast.For, ast.AsyncFor)):
+            condition = f"for {ast.unparse(node.target)} in {ast.unparse(node.iter)}"
+            env = dict(env)
+            if isinstance(node.target, ast.Name) and isinstance(node.iter, (ast.List, ast.Tuple, ast.Set)):
+                env[node.target.id] = [(it, None) for it in node.iter.elts]
+            self.visit_body(node.body, context, conditions + [condition], env, stack)
+            self.visit_body(node.orelse, context, conditions + [condition], env, stack)
+            return
+        if isinstance(node, ast.While):
+            condition = f"while {ast.unparse(node.test)}"
+            self.visit_body(node.body, context, conditions + [condition], env, stack)
+            self.visit_body(node.orelse, context, conditions + [condition], env, stack)
+            return
+        if isinstance(node, ast.Try):
+            self.visit_body(node.body + node.orelse, context, conditions, env, stack)
+            for handler in node.handlers:
+                condition = f"except {ast.unparse(handler.type)}" if handler.type else "except"
+                self.visit_body(handler.body, context, conditions + [condition], env, stack)
+            self.visit_body(node.finalbody, context, conditions, env, stack)
+            return
+        if isinstance(node, ast.Assign) and len(node.targets) == 1 and isinstance(node.targets[0], ast.Name):
+            # Local variables holding references: 'ref = "zlib/1.3"'. An assignment in a branch of the
+            # method adds an alternative, with its condition, any other one replaces the previous values
+            name = node.targets[0].id
+            alternatives = env.get(name, []) if len(conditions) > self.depths.get(context, 0) else []
+            env[name] = alternatives + [(node.value, _and(*conditions))]
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef, ast.Lambda)):
+            return
+
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute) and \
+                isinstance(node.func.value, ast.Name) and node.func.value.id == "self":
+            method = node.func.attr
+            if method in KINDS and node.args:
+                self.add(method, node.args[0], f"{context}()", conditions, env)
+            elif method in self.methods:
+                self.visit_method(method, conditions, stack)
+        for child in ast.iter_child_nodes(node):
+            self.visit(child, context, conditions, env, stack)
+
+
+def _conanfile_classes(tree):
+    classes = [it for it in tree.body if isinstance(it, ast.ClassDef)]
+    recipes = [it for it in classes
+               if any((isinstance(base, ast.Name) and base.id == "ConanFile") or
+                      (isinstance(base, ast.Attribute) and base.attr == "ConanFile") for base in it.bases)]
+    return recipes or classes
+
+
+def extract_requirements(source: str, recipe: Optional[str] = None) -> List[Requirement]:
+    """Requirements declared by the recipe(s) of a conanfile.py. 'recipe' is the name of the recipe,
+    to resolve the references to itself (eg. str(self.ref)). Raises SyntaxError"""
+    tree = ast.parse(source)
+    requirements = []
+    for conanfile_class in _conanfile_classes(tree):
+        methods = {it.name: it for it in conanfile_class.body if isinstance(it, (ast.FunctionDef, ast.AsyncFunctionDef))}
+        attributes = {it.targets[0].id: it.value for it in conanfile_class.body
+                      if isinstance(it, ast.Assign) and len(it.targets) == 1 and isinstance(it.targets[0], ast.Name)}
+        extractor = _Extractor(methods, attributes, recipe)
+        for statement in conanfile_class.body:
+            if isinstance(statement, ast.Assign) and len(statement.targets) == 1 and \
+                    isinstance(statement.targets[0], ast.Name) and statement.targets[0].id in KINDS:
+                values = statement.value.elts if isinstance(statement.value, (ast.List, ast.Tuple)) else [statement.value]
+                for value in values:
+                    extractor.add(statement.targets[0].id, value, "class", [], {})
+        for method in ENTRY_POINTS:
+            if method in methods:
+                extractor.visit_method(method, [], ())
+        requirements.extend(extractor.requirements)
+    return requirements
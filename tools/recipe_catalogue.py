@@ -0,0 +1,447 @@
+"""
+Catalogue of the recipes of ConanCenterIndex in an SQLite database: versions and folders (config.yml),
+sources and patches (conandata.yml), and requirements (conanfile.py, extracted statically by
+conanfile_requirements.py) with the reverse-dependency index they give.
+
+The database is updated incrementally: the files are keyed by their git blob hash, and only the files
+which changed since the previous update are parsed again. Every query updates it first (unless
+--no-update is given), which costs a 'git ls-files' when nothing changed.
+
+Examples:
+    python3 tools/recipe_catalogue.py update
+    python3 tools/recipe_catalogue.py versions zlib
+    python3 tools/recipe_catalogue.py with-version 1.3.1
+    python3 tools/recipe_catalogue.py sources --host github.com
+    python3 tools/recipe_catalogue.py patches openssl
+    python3 tools/recipe_catalogue.py dependents zlib --direct
+    git diff --name-only origin/master | python3 tools/recipe_catalogue.py affected
+    python3 tools/recipe_catalogue.py sql "SELECT recipe, COUNT(*) FROM patches GROUP BY recipe ORDER BY 2 DESC LIMIT 10"
+"""
+
+import argparse
+import hashlib
+import os
+import sqlite3
+import subprocess
+import sys
+from urllib.parse import urlparse
+
+from conanfile_requirements import KINDS, extract_requirements
+
+try:
+    import yaml
+    from yaml import CSafeLoader as _Loader
+except ImportError:  # PyYAML built without libyaml
+    import yaml
+    from yaml import SafeLoader as _Loader
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_DATABASE = os.path.join(ROOT, ".recipe_catalogue", "catalogue.sqlite3")
+
+# Bump when the schema or the way the files are parsed changes: the database is rebuilt
+SCHEMA_VERSION = "5"
+
+FILE_PATTERNS = ("recipes/*/config.yml", "recipes/*/*/conandata.yml", "recipes/*/*/conanfile.py")
+
+_SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE files (
+    path TEXT PRIMARY KEY,
+    blob TEXT NOT NULL,
+    recipe TEXT NOT NULL,
+    folder TEXT,
+    error TEXT
+);
+CREATE TABLE versions (
+    path TEXT NOT NULL REFERENCES files(path) ON DELETE CASCADE,
+    recipe TEXT NOT NULL,
+    version TEXT NOT NULL,
+    folder TEXT NOT NULL
+);
+CREATE TABLE sources (
+    path TEXT NOT NULL REFERENCES files(path) ON DELETE CASCADE,
+    recipe TEXT NOT NULL,
+    folder TEXT NOT NULL,
+    version TEXT NOT NULL,
+    variant TEXT NOT NULL,
+    url TEXT,
+    host TEXT,
+    sha256 TEXT
+);
+CREATE TABLE patches (
+    path TEXT NOT NULL REFERENCES files(path) ON DELETE CASCADE,
+    recipe TEXT NOT NULL,
+    folder TEXT NOT NULL,
+    version TEXT NOT NULL,
+    patch_file TEXT,
+    patch_description TEXT,
+    patch_type TEXT,
+    patch_source TEXT
+);
+CREATE TABLE requirements (
+    path TEXT NOT NULL REFERENCES files(path) ON DELETE CASCADE,
+    recipe TEXT NOT NULL,
+    folder TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    requirement TEXT,
+    version TEXT,
+    reference TEXT NOT NULL,
+    context TEXT NOT NULL,
+    condition TEXT
+);
+CREATE INDEX versions_recipe ON versions(recipe);
+CREATE INDEX versions_version ON versions(version);
+CREATE INDEX sources_recipe ON sources(recipe);
+CREATE INDEX sources_host ON sources(host);
+CREATE INDEX patches_recipe ON patches(recipe);
+CREATE INDEX versions_path ON versions(path);
+CREATE INDEX sources_path ON sources(path);
+CREATE INDEX patches_path ON patches(path);
+CREATE INDEX requirements_recipe ON requirements(recipe);
+CREATE INDEX requirements_requirement ON requirements(requirement);
+CREATE INDEX requirements_path ON requirements(path);
+"""
+
+
+def _git(root, *args):
+    return subprocess.run(["git", *args], cwd=root, check=True, capture_output=True).stdout.decode("utf-8")
+
+
+def _matches(path):
+    parts = path.split("/")
+    return (len(parts) == 3 and parts[0] == "recipes" and parts[2] == "config.yml") or \
+           (len(parts) == 4 and parts[0] == "recipes" and parts[3] in ("conandata.yml", "conanfile.py"))
+
+
+def _blob_hash(filename):
+    """Hash of the content of a file as git computes it for a blob (without filters)"""
+    with open(filename, "rb") as f:
+        content = f.read()
+    return hashlib.sha1(b"blob %d\0" % len(content) + content).hexdigest()
+
+
+def current_files(root):
+    """Returns {path: blob hash} of the catalogued files of the working tree (paths relative to 'root',
+    with forward slashes). The hashes of the files committed or staged come from the git index, the
+    other ones (modified, untracked) are computed"""
+    pathspecs = [f":(glob){it}" for it in FILE_PATTERNS]
+    try:
+        staged = _git(root, "ls-files", "--stage", "-z", "--", *pathspecs)
+        modified = _git(root, "ls-files", "--modified", "--others", "--exclude-standard", "-z", "--", *pathspecs)
+    except (OSError, subprocess.CalledProcessError):
+        # Not a git repository (eg. an archive of the sources)
+        import glob
+        paths = [os.path.relpath(it, root).replace("\\", "/")
+                 for pattern in FILE_PATTERNS for it in glob.glob(os.path.join(root, pattern))]
+        return {path: _blob_hash(os.path.join(root, path)) for path in paths}
+
+    files = {}
+    for entry in filter(None, staged.split("\0")):
+        info, path = entry.split("\t", 1)
+        files[path] = info.split()[1]
+    for path in set(filter(None, modified.split("\0"))):
+        if os.path.isfile(os.path.join(root, path)):
+            files[path] = _blob_hash(os.path.join(root, path))
+        else:  # deleted from the working tree
+            files.pop(path, None)
+    return {path: blob for path, blob in files.items() if _matches(path)}
+
+
+def _text(value):
+    """Values are stored as text; lists (eg. several patch sources) one item per line"""
+    if value is None:
+        return None
+    if isinstance(value, list):
+        return "\n".join(str(it) for it in value)
+    return str(value)
+
+
+def _sources(sources, variant=()):
+    """Yields (variant, url, sha256) for the 'sources' of a version: a mapping with an url (or a list
+    of urls), nested mappings for each os/arch/... (eg. binary packages), or a list of them (eg. the
+    main and contrib archives of opencv, their index is the variant)"""
+    if isinstance(sources, list):
+        for index, value in enumerate(sources):
+            value = value if isinstance(value, dict) else {"url": value}
+            yield from _sources(value, variant + (str(index),))
+        return
+    if not isinstance(sources, dict):
+        return
+    if "url" in sources:
+        urls = sources["url"] if isinstance(sources["url"], list) else [sources["url"]]
+        for url in urls:
+            yield "/".join(variant), str(url), _text(sources.get("sha256"))
+        return
+    for key, value in sources.items():
+        yield from _sources(value, variant + (str(key),))
+
+
+def parse_file(root, path):
+    """Returns the rows of a catalogued file: {table: [row, ...]}, or an error message"""
+    parts = path.split("/")
+    recipe = parts[1]
+    if parts[-1] == "conanfile.py":
+        return _parse_conanfile(root, path)
+    try:
+        with open(os.path.join(root, path), encoding="utf-8") as f:
+            data = yaml.load(f, Loader=_Loader) or {}
+    except (OSError, UnicodeDecodeError, yaml.YAMLError) as error:
+        return {}, str(error).splitlines()[0]
+
+    rows = {"versions": [], "sources": [], "patches": []}
+    if parts[-1] == "config.yml":
+        for version, info in (data.get("versions") or {}).items():
+            if isinstance(info, dict) and "folder" in info:
+                rows["versions"].append((path, recipe, str(version), str(info["folder"])))
+        return rows, None
+
+    folder = parts[2]
+    without_sources = []
+    for version, sources in (data.get("sources") or {}).items():
+        count = len(rows["sources"])
+        for variant, url, sha256 in _sources(sources):
+            rows["sources"].append((path, recipe, folder, str(version), variant, url, urlparse(url).hostname, sha256))
+        if len(rows["sources"]) == count:
+            without_sources.append(str(version))
+    for version, patches in (data.get("patches") or {}).items():
+        for patch in patches or []:
+            if not isinstance(patch, dict):
+                patch = {"patch_file": str(patch)}
+            rows["patches"].append((path, recipe, folder, str(version), _text(patch.get("patch_file")),
+                                    _text(patch.get("patch_description")), _text(patch.get("patch_type")),
+                                    _text(patch.get("patch_source"))))
+    if without_sources:
+        # The rows are kept, the versions the catalogue cannot read the sources of are reported
+        return rows, f"no url found in the sources of {', '.join(without_sources)}"
+    return rows, None
+
+
+def _parse_conanfile(root, path):
+    recipe, folder = path.split("/")[1:3]
+    try:
+        with open(os.path.join(root, path), encoding="utf-8") as f:
+            requirements = extract_requirements(f.read(), recipe)
+    except (OSError, UnicodeDecodeError, SyntaxError, ValueError) as error:
+        return {}, str(error).splitlines()[0]
+    return {"requirements": [(path, recipe, folder, *it) for it in requirements]}, None
+
+
+def _parse_files(root, paths, jobs=None):
+    if jobs == 1 or len(paths) < 64:
+        return [parse_file(root, path) for path in paths]
+
+    from concurrent.futures import ProcessPoolExecutor
+    from functools import partial
+
+    workers = jobs or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(partial(parse_file, root), paths, chunksize=max(1, len(paths) // (4 * workers))))
+
+
+def connect(database):
+    """Open the catalogue, creating it (or recreating it after a change of schema). Raises
+    ValueError if the file exists and is not a catalogue: it is never overwritten"""
+    os.makedirs(os.path.dirname(os.path.abspath(database)), exist_ok=True)
+    exists = os.path.isfile(database) and os.path.getsize(database) > 0
+    connection = sqlite3.connect(database)
+    connection.execute("PRAGMA foreign_keys = ON")
+    schema_version = None
+    if exists:
+        try:
+            schema_version = connection.execute("SELECT value FROM meta WHERE key = 'schema'").fetchone()
+        except sqlite3.DatabaseError:
+            pass
+        if schema_version is None:
+            connection.close()
+            raise ValueError(f"{database} exists and is not a recipes catalogue")
+    if schema_version != (SCHEMA_VERSION,):
+        connection.close()
+        if exists:
+            os.remove(database)
+        connection = sqlite3.connect(database)
+        connection.execute("PRAGMA foreign_keys = ON")
+        with connection:
+            connection.executescript(_SCHEMA)
+            connection.execute("INSERT INTO meta VALUES ('schema', ?)", (SCHEMA_VERSION,))
+    return connection
+
+
+def update(connection, root=ROOT, jobs=None):
+    """Parse the files added or changed since the previous update. Returns (parsed, removed) counts"""
+    files = current_files(root)
+    known = dict(connection.execute("SELECT path, blob FROM files"))
+    removed = [path for path in known if path not in files]
+    changed = sorted(path for path, blob in files.items() if known.get(path) != blob)
+
+    results = _parse_files(root, changed, jobs)
+    with connection:
+        connection.executemany("DELETE FROM files WHERE path = ?", [(path,) for path in removed + changed])
+        for path, (rows, error) in zip(changed, results):
+            parts = path.split("/")
+            connection.execute("INSERT INTO files VALUES (?, ?, ?, ?, ?)",
+                               (path, files[path], parts[1], parts[2] if len(parts) == 4 else None, error))
+            connection.executemany("INSERT INTO versions VALUES (?, ?, ?, ?)", rows.get("versions", []))
+            connection.executemany("INSERT INTO sources VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows.get("sources", []))
+            connection.executemany("INSERT INTO patches VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows.get("patches", []))
+            connection.executemany("INSERT INTO requirements VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                                   rows.get("requirements", []))
+    return len(changed), len(removed)
+
+
+def requirement_graph(connection, kinds=KINDS, unconditional=False):
+    """Returns {recipe: set of the recipes it requires}, any version and folder. References to the
+    recipe itself (eg. a tool_requires when cross-building) are left out"""
+    query = f"SELECT DISTINCT recipe, requirement FROM requirements WHERE requirement IS NOT NULL " \
+            f"AND requirement != recipe AND kind IN ({', '.join('?' * len(kinds))})"
+    if unconditional:
+        query += " AND condition IS NULL"
+    graph = {}
+    for recipe, requirement in connection.execute(query, kinds):
+        graph.setdefault(recipe, set()).add(requirement)
+    return graph
+
+
+def unresolved_recipes(connection, kinds=KINDS):
+    """Recipes with requirements whose name cannot be known statically: they are not in the graph
+    returned by requirement_graph(), and could depend on any recipe"""
+    query = f"SELECT DISTINCT recipe FROM requirements WHERE requirement IS NULL " \
+            f"AND kind IN ({', '.join('?' * len(kinds))})"
+    return {recipe for recipe, in connection.execute(query, kinds)}
+
+
+def dependents(graph, recipes, direct=False):
+    """Recipes which require (directly or transitively) one of 'recipes', in a graph returned by
+    requirement_graph()"""
+    reverse = {}
+    for recipe, requirements in graph.items():
+        for requirement in requirements:
+            reverse.setdefault(requirement, set()).add(recipe)
+    found = set()
+    pending = list(recipes)
+    while pending:
+        for dependent in reverse.get(pending.pop(), ()):
+            if dependent not in found:
+                found.add(dependent)
+                if not direct:
+                    pending.append(dependent)
+    return found - set(recipes) if direct else found
+
+
+def changed_recipes(paths):
+    """Names of the recipes of the given paths (eg. the output of 'git diff --name-only')"""
+    recipes = set()
+    for path in paths:
+        parts = path.strip().replace("\\", "/").split("/")
+        if len(parts) > 2 and parts[0] == "recipes":
+            recipes.add(parts[1])
+    return recipes
+
+
+def _print_rows(cursor):
+    for row in cursor:
+        print("\t".join("" if it is None else str(it) for it in row))
+
+
+def main(args=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database", default=DEFAULT_DATABASE, help=f"SQLite database (default: {DEFAULT_DATABASE})")
+    parser.add_argument("--no-update", action="store_true", help="query the database without updating it first")
+    parser.add_argument("-j", "--jobs", type=int, default=None,
+                        help="number of processes used to parse files (defaults to the number of CPUs)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("update", help="update the database")
+    command = commands.add_parser("versions", help="versions of a recipe, with their folder")
+    command.add_argument("recipe")
+    command = commands.add_parser("with-version", help="recipes which have a given version")
+    command.add_argument("version")
+    command = commands.add_parser("sources", help="source urls and sha256 of the versions")
+    command.add_argument("--recipe", help="only the sources of this recipe")
+    command.add_argument("--host", help="only the urls of this host (or of its subdomains)")
+    command = commands.add_parser("patches", help="patches of a recipe, by version")
+    command.add_argument("recipe")
+    command = commands.add_parser("requirements", help="requirements of a recipe, by folder")
+    command.add_argument("recipe")
+    for name, description in [("dependents", "recipes which require a recipe"),
+                       ("affected", "recipes changed by a diff, and the recipes which require them")]:
+        command = commands.add_parser(name, help=description)
+        if name == "dependents":
+            command.add_argument("recipe")
+        else:
+            command.add_argument("paths", nargs="*",
+                                 help="changed files (default: read from stdin, eg. from 'git diff --name-only')")
+            command.add_argument("--base", help="list the files changed since this git commit instead")
+        command.add_argument("--direct", action="store_true", help="only the recipes requiring them directly")
+        command.add_argument("--kind", action="append", choices=KINDS,
+                             help="only follow these kinds of requirements (default: all)")
+        command.add_argument("--unconditional", action="store_true",
+                             help="only follow the requirements declared outside of any branch")
+    command = commands.add_parser("sql", help="run an SQL query (tables: files, versions, sources, patches, requirements)")
+    command.add_argument("query")
+    ns = parser.parse_args(args)
+
+    try:
+        connection = connect(ns.database)
+    except ValueError as error:
+        parser.error(str(error))
+    if ns.command == "update" or not ns.no_update:
+        parsed, removed = update(connection, jobs=ns.jobs)
+        if ns.command == "update":
+            print(f"{parsed} files parsed, {removed} files removed")
+            for path, error in connection.execute("SELECT path, error FROM files WHERE error IS NOT NULL ORDER BY path"):
+                print(f"{path}: {error}", file=sys.stderr)
+
+    if ns.command == "versions":
+        _print_rows(connection.execute("SELECT version, folder FROM versions WHERE recipe = ? ORDER BY version",
+                                       (ns.recipe,)))
+    elif ns.command == "with-version":
+        _print_rows(connection.execute("SELECT recipe, folder FROM versions WHERE version = ? ORDER BY recipe",
+                                       (ns.version,)))
+    elif ns.command == "sources":
+        query = "SELECT recipe, version, variant, url, sha256 FROM sources WHERE 1"
+        parameters = []
+        if ns.recipe:
+            query += " AND recipe = ?"
+            parameters.append(ns.recipe)
+        if ns.host:
+            query += " AND (host = ? OR host LIKE ?)"
+            parameters += [ns.host, f"%.{ns.host}"]
+        _print_rows(connection.execute(query + " ORDER BY recipe, version, variant", parameters))
+    elif ns.command == "patches":
+        _print_rows(connection.execute(
+            "SELECT version, patch_file, patch_type, patch_source FROM patches WHERE recipe = ? ORDER BY version, rowid",
+            (ns.recipe,)))
+    elif ns.command == "requirements":
+        _print_rows(connection.execute(
+            "SELECT folder, kind, reference, condition FROM requirements WHERE recipe = ? ORDER BY folder, rowid",
+            (ns.recipe,)))
+    elif ns.command in ("dependents", "affected"):
+        graph = requirement_graph(connection, tuple(ns.kind or KINDS), ns.unconditional)
+        if ns.command == "dependents":
+            recipes = {ns.recipe}
+        else:
+            if ns.base:
+                paths = subprocess.run(["git", "diff", "--name-only", ns.base], cwd=ROOT, check=True,
+                                       capture_output=True).stdout.decode("utf-8").splitlines()
+            else:
+                paths = ns.paths or sys.stdin.read().splitlines()
+            recipes = changed_recipes(paths)
+        found = dependents(graph, recipes, ns.direct)
+        if ns.command == "affected":
+            found |= recipes
+        for recipe in sorted(found):
+            print(recipe)
+        unresolved = unresolved_recipes(connection, tuple(ns.kind or KINDS)) - found
+        if unresolved:
+            print(f"warning: the requirements of {', '.join(sorted(unresolved))} cannot all be resolved statically, "
+                  f"they may be affected too (see the requirements subcommand)", file=sys.stderr)
+    elif ns.command == "sql":
+        try:
+            _print_rows(connection.execute(ns.query))
+        except sqlite3.Error as error:
+            parser.error(str(error))
+    connection.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())